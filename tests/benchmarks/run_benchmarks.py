@@ -0,0 +1,429 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ******************************************************************************
+# ZYNTHIAN PROJECT: Zynthian GUI
+#
+# Headless benchmarks for hot paths of the ui, using stubbed Zynthbox, jack and
+# zyncoder modules (and the other bindings only the device has), so they can be
+# run off the device
+#
+# Copyright (C) 2026 Zynthbox contributors
+#
+# ******************************************************************************
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of
+# the License, or any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For a full copy of the GNU General Public License see the LICENSE.txt file.
+#
+# ******************************************************************************
+#
+# Usage:
+#   python3 tests/benchmarks/run_benchmarks.py [--iterations N] [--output results.json]
+#                                              [--baseline previous.json] [--threshold 1.2]
+#                                              [benchmark names...]
+#
+# Importing the ui modules needs the python packages they use, which are:
+#   pip install PySide2 "numpy<2" psutil pyliblo3 pytaglib mutagen soundfile ujson oyaml pexpect requests websocket-client
+# The bindings which only come with the device's system packages (lilv, Jucy and python-apt) are
+# stubbed, see SYSTEM_MODULES in stubs.py.
+#
+# The results are written as json (to stdout, or the given output file), holding the
+# minimum, median, mean and maximum time of each benchmark in seconds. A benchmark which
+# fails gets an error entry instead, and makes the exit code 1. When given a baseline (the
+# output of an earlier run), the medians are compared, and the exit code is 1 if any
+# benchmark got slower than baseline * threshold.
+#
+import argparse
+import json
+import logging
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+import types
+
+from collections import OrderedDict
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import stubs
+stubs.install()
+
+from PySide2.QtCore import QCoreApplication, QObject, Signal
+from PySide2.QtGui import QColor
+
+RESULTS_VERSION = 1
+BENCHMARKS = OrderedDict()
+
+
+def benchmark(name):
+    """
+    Registers a benchmark. The decorated function does any setup work, and returns the
+    function to be timed, which gets called once per iteration.
+    """
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+class StubQObject(QObject):
+    """A QObject which hands out StubObjects for any attribute it doesn't have"""
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = stubs.StubObject(name)
+        setattr(self, name, value)
+        return value
+
+
+class FakeLayerScreen(QObject):
+    """Enough of the layer screen for the sketchpad and autoconnect code: its layer lists and the signals they connect to"""
+    def __init__(self, layers):
+        super(FakeLayerScreen, self).__init__()
+        self.layer_midi_map = {}
+        self.layers = layers
+
+    layer_deleted = Signal(int)
+
+
+class FakeLayer(object):
+    """Enough of a zynthian_layer for generate_snapshot and the autoconnect logic"""
+    def __init__(self, track_index, slot_index, slot_type, midi_chan):
+        self.track_index = track_index
+        self.slot_index = slot_index
+        self.midi_chan = midi_chan
+        self.jackname = f"synth-{track_index}-{slot_index}"
+        self.slot_type = slot_type
+
+    def get_jackname(self):
+        return self.jackname
+
+    def get_audio_out(self):
+        return [f"TrackPassthrough:Channel{self.track_index + 1}-lane{self.slot_index + 1}"]
+
+    def get_audio_in(self):
+        return ["system:capture_1", "system:capture_2"]
+
+    def get_midi_out(self):
+        return []
+
+    def get_snapshot(self):
+        return {
+            "engine_name": "Jalv/Synth",
+            "engine_nick": "JV/Synth",
+            "midi_chan": self.midi_chan,
+            "track_index": self.track_index,
+            "slot_index": self.slot_index,
+            "slot_type": self.slot_type,
+            "bank_info": ["bank", 0, "Bank", None],
+            "preset_info": ["preset", 0, "Preset", None],
+            "controllers_dict": {f"ctrl{index}": {"value": index / 10} for index in range(64)},
+        }
+
+
+def make_fake_gui(context):
+    gui = StubQObject()
+    gui.isBootingComplete = True
+    gui.isShuttingDown = False
+    gui.sketchpad = StubQObject()
+    gui.sketchpad.sketchpadLoadingInProgress = False
+    gui.theme_chooser = types.SimpleNamespace(trackColors=[QColor.fromHsv(index * 36, 200, 200) for index in range(stubs.TRACK_COUNT)])
+    engine = stubs.StubObject("global_fx")
+    engine.jackname = "GlobalFX"
+    gui.global_fx_engines = [(engine, None, stubs.StubObject("global_fx_layer")), (engine, None, stubs.StubObject("global_fx_layer"))]
+    gui.screens = {
+        "sketchpad": gui.sketchpad,
+        "snapshot": stubs.StubObject("snapshot"),
+        "engine": types.SimpleNamespace(zyngines=OrderedDict()),
+        "layer": FakeLayerScreen(context["layers"]),
+    }
+    return gui
+
+
+def make_layers(track_count):
+    layers = []
+    slot_types = ("TracksBar_synthslot", "TracksBar_fxslot", "TracksBar_sketchfxslot")
+    for track_index in range(track_count):
+        for slot_index in range(stubs.SLOT_COUNT):
+            slot_type = slot_types[(track_index + slot_index) % len(slot_types)]
+            layers.append(FakeLayer(track_index, slot_index, slot_type, (track_index * stubs.SLOT_COUNT + slot_index) % 16))
+    return layers
+
+
+def make_song(context):
+    from zynqtgui.sketchpad.sketchpad_song import sketchpad_song
+    folder = tempfile.mkdtemp(prefix="sketchpad-benchmark-", dir=context["tempdir"])
+    return sketchpad_song(folder + "/", "Benchmark", context["parent"], load_autosave=False)
+
+
+#------------------------------------------------------------------------------
+# Benchmarks
+#------------------------------------------------------------------------------
+
+@benchmark("sketchpad_song.__init__")
+def bench_song_init(context):
+    return lambda: make_song(context)
+
+
+@benchmark("sketchpad_song.serialize")
+def bench_song_serialize(context):
+    song = make_song(context)
+    return song.serialize
+
+
+@benchmark("sketchpad_song.restore")
+def bench_song_restore(context):
+    song = make_song(context)
+    with open(Path(song.sketchpad_folder) / "Benchmark.sketchpad.json", "w") as f:
+        json.dump(song.serialize(), f)
+    return lambda: song.restore(False)
+
+
+@benchmark("zynthian_gui_layer.generate_snapshot")
+def bench_generate_snapshot(context):
+    from zynqtgui.zynthian_gui_layer import zynthian_gui_layer
+    host = types.SimpleNamespace(index=0, layers=context["layers"], zynqtgui=context["gui"])
+    # Use the real implementations of everything generate_snapshot calls on the layer screen
+    for name in ("generate_snapshot", "get_audio_capture", "get_audio_routing", "get_midi_routing", "get_extended_config", "get_midi_profile_state"):
+        setattr(host, name, types.MethodType(getattr(zynthian_gui_layer, name), host))
+    return host.generate_snapshot
+
+
+@benchmark("zynautoconnect.audio_autoconnect")
+def bench_audio_autoconnect(context):
+    import zynautoconnect
+    from zynautoconnect import zynthian_autoconnect
+    context["gui"].screens["sketchpad"].song = make_song(context)
+    zynthian_autoconnect.jclient = sys.modules["jack"].Client("Zynthian_autoconnect")
+    zynthian_autoconnect.lock = __import__("threading").Lock()
+    return lambda: zynautoconnect.audio_autoconnect(True)
+
+
+@benchmark("selector_list_model.set_entries")
+def bench_set_entries(context):
+    from zynqtgui.zynthian_gui_selector import selector_list_model
+    model = selector_list_model()
+    entry_lists = [
+        [(f"action{index}", index, f"Entry {index}") for index in range(count)]
+        for count in (200, 180, 200, 220)
+    ]
+    metadata_lists = [[{} for _ in entries] for entries in entry_lists]
+    state = {"index": 0}
+    def run():
+        index = state["index"] % len(entry_lists)
+        model.set_entries(entry_lists[index], metadata_lists[index])
+        state["index"] += 1
+    return run
+
+
+def make_song_with_scenes(context):
+    """A song where each scene has a different half of the clips of the selected sketchpad song enabled"""
+    song = make_song(context)
+    scenes = song.scenesModel
+    for scene_index in range(scenes.count):
+        scenes.selectedSceneIndex = scene_index
+        for track_index in range(stubs.TRACK_COUNT):
+            for clip_id in range(stubs.SLOT_COUNT):
+                clip = song.getClipById(track_index, scenes.selectedSketchpadSongIndex, clip_id)
+                if clip is not None:
+                    clip.enabled = (track_index + clip_id + scene_index) % 2 == 0
+    return song
+
+
+@benchmark("sketchpad_scenes_model.selectedSceneIndex")
+def bench_switch_scene(context):
+    scenes = make_song_with_scenes(context).scenesModel
+    state = {"index": 0}
+    def run():
+        state["index"] = (state["index"] + 1) % scenes.count
+        scenes.selectedSceneIndex = state["index"]
+    return run
+
+
+@benchmark("sketchpad_scenes_model.isClipInScene")
+def bench_is_clip_in_scene(context):
+    song = make_song_with_scenes(context)
+    scenes = song.scenesModel
+    clips = [song.getClipById(track_index, 0, clip_id) for track_index in range(stubs.TRACK_COUNT) for clip_id in range(stubs.SLOT_COUNT)]
+    def run():
+        for scene_index in range(scenes.count):
+            for clip in clips:
+                scenes.isClipInScene(clip, scene_index)
+    return run
+
+
+def make_midi_filter_script(variant):
+    """A large midi filter script, touching every channel, with rules overriding each other"""
+    rules = []
+    for channel in range(16):
+        target = (channel + 1 + variant) % 16
+        rules.append(f"MAP CH#{channel} CC#0:63 => CH#{target} CC#64:127")
+        rules.append(f"MAP CH#{channel} CC#64:127 => CH#{target} CC#{(channel + variant) % 128}")
+        rules.append(f"IGNORE CH#{channel} KP")
+        rules.append(f"MAP CH#{channel} NON#{36 + variant}:96 => CH#{target} NON#{24 + variant}:84")
+        rules.append(f"CLEAN CH#{channel} CC#{channel * 4}:{channel * 4 + 3}")
+        if channel % 4 == variant % 4:
+            rules.append(f"MAP CH#{channel} => CH#{target}")
+    return rules
+
+
+@benchmark("MidiFilterRule.set_rules")
+def bench_midi_filter_set_rules(context):
+    from zyngine.zynthian_midi_filter import MidiFilterRule
+    rules = [MidiFilterRule(rule, False) for rule in make_midi_filter_script(0)]
+    def run():
+        for rule in rules:
+            rule.set_rules()
+    return run
+
+
+@benchmark("MidiFilterScript.parse_script")
+def bench_midi_filter_parse_script(context):
+    from zyngine.zynthian_midi_filter import MidiFilterScript
+    script = make_midi_filter_script(0)
+    return lambda: MidiFilterScript(script)
+
+
+@benchmark("MidiFilterScript.update")
+def bench_midi_filter_update(context):
+    from zyngine.zynthian_midi_filter import MidiFilterScript
+    scripts = [make_midi_filter_script(0), make_midi_filter_script(1)]
+    filter_script = MidiFilterScript(scripts[0])
+    state = {"index": 0}
+    def run():
+        state["index"] += 1
+        filter_script.update(scripts[state["index"] % len(scripts)])
+    return run
+
+
+@benchmark("MidiFilterScript.clean")
+def bench_midi_filter_clean(context):
+    from zyngine.zynthian_midi_filter import MidiFilterScript
+    filter_script = MidiFilterScript(make_midi_filter_script(0))
+    return filter_script.clean
+
+
+#------------------------------------------------------------------------------
+# Runner
+#------------------------------------------------------------------------------
+
+def run_benchmark(name, setup, context, iterations):
+    try:
+        function = setup(context)
+        # One untimed run, so imports and first-use caches don't skew the numbers
+        function()
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+        return OrderedDict([
+            ("name", name),
+            ("iterations", iterations),
+            ("min", min(timings)),
+            ("median", statistics.median(timings)),
+            ("mean", statistics.mean(timings)),
+            ("max", max(timings)),
+        ])
+    except Exception as e:
+        logging.debug(traceback.format_exc())
+        return OrderedDict([
+            ("name", name),
+            ("error", f"{type(e).__name__}: {e}"),
+        ])
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=REPO_DIR, stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    baseline_medians = {entry["name"]: entry["median"] for entry in baseline.get("results", []) if "median" in entry}
+    for entry in results:
+        if "median" in entry and entry["name"] in baseline_medians and baseline_medians[entry["name"]] > 0:
+            ratio = entry["median"] / baseline_medians[entry["name"]]
+            entry["baseline_ratio"] = ratio
+            if ratio > threshold:
+                regressions.append(entry["name"])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the headless ui benchmarks")
+    parser.add_argument("benchmarks", nargs="*", help=f"Which benchmarks to run (default: all of {', '.join(BENCHMARKS.keys())})")
+    parser.add_argument("--iterations", type=int, default=20, help="How many timed runs to do for each benchmark")
+    parser.add_argument("--tracks", type=int, default=stubs.TRACK_COUNT, help="How many tracks the synthetic sketchpads have layers on")
+    parser.add_argument("--output", help="File to write the json results to (default: stdout)")
+    parser.add_argument("--baseline", help="Results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Slowdown relative to the baseline which counts as a regression")
+    parser.add_argument("--verbose", action="store_true", help="Log the ui's own output, and tracebacks for failed benchmarks")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.CRITICAL)
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if len(unknown) > 0:
+        parser.error(f"Unknown benchmarks: {', '.join(unknown)}")
+
+    QCoreApplication.instance() or QCoreApplication(sys.argv)
+    from zynqtgui import zynthian_gui_config
+
+    with tempfile.TemporaryDirectory(prefix="zynthbox-benchmarks-") as tempdir:
+        context = {"tempdir": tempdir, "layers": make_layers(args.tracks)}
+        context["gui"] = make_fake_gui(context)
+        context["parent"] = StubQObject()
+        zynthian_gui_config.zynqtgui = context["gui"]
+
+        results = []
+        for name in (args.benchmarks if len(args.benchmarks) > 0 else BENCHMARKS.keys()):
+            results.append(run_benchmark(name, BENCHMARKS[name], context, args.iterations))
+
+    report = OrderedDict([
+        ("version", RESULTS_VERSION),
+        ("timestamp", time.strftime("%Y-%m-%dT%H:%M:%S%z")),
+        ("git_commit", git_commit()),
+        ("python", sys.version.split()[0]),
+        ("parameters", {"iterations": args.iterations, "tracks": args.tracks}),
+        ("results", results),
+    ])
+
+    errors = [entry["name"] for entry in results if "error" in entry]
+    for entry in results:
+        if "error" in entry:
+            print(f"Benchmark {entry['name']} failed: {entry['error']}", file=sys.stderr)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        report["regressions"] = regressions
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    return 1 if len(errors) > 0 or len(regressions) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
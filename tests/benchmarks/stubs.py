@@ -0,0 +1,464 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ******************************************************************************
+# ZYNTHIAN PROJECT: Zynthian GUI
+#
+# Benchmark stubs: Stand-ins for the Zynthbox, jack and zyncoder modules, so
+# the python side of the ui can be exercised without the device
+#
+# Copyright (C) 2026 Zynthbox contributors
+#
+# ******************************************************************************
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of
+# the License, or any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For a full copy of the GNU General Public License see the LICENSE.txt file.
+#
+# ******************************************************************************
+import re
+import sys
+import types
+import numpy as np
+
+TRACK_COUNT = 10
+SLOT_COUNT = 5
+SONG_COUNT = 1
+
+
+class StubObject(object):
+    """
+    An object which pretends to be anything: every attribute is another StubObject (the same
+    one each time it is looked up), calling it returns a StubObject, it can be indexed, and
+    it is falsy, zero and empty when used as a number, string or sequence. Anything in the
+    stubbed modules which isn't explicitly implemented below ends up being one of these.
+    """
+    def __init__(self, name="stub"):
+        object.__setattr__(self, "_stub_name", name)
+        object.__setattr__(self, "_stub_attributes", {})
+        object.__setattr__(self, "_stub_items", {})
+
+    def __getattr__(self, name):
+        if name.startswith("__") and name.endswith("__"):
+            raise AttributeError(name)
+        attributes = object.__getattribute__(self, "_stub_attributes")
+        if name not in attributes:
+            attributes[name] = StubObject(f"{self._stub_name}.{name}")
+        return attributes[name]
+
+    def __setattr__(self, name, value):
+        self._stub_attributes[name] = value
+
+    def __call__(self, *args, **kwargs):
+        return self.__getattr__("_returned")
+
+    def __getitem__(self, key):
+        if key not in self._stub_items:
+            self._stub_items[key] = StubObject(f"{self._stub_name}[{key}]")
+        return self._stub_items[key]
+
+    def __setitem__(self, key, value):
+        self._stub_items[key] = value
+
+    def __iter__(self):
+        return iter([])
+
+    def __len__(self):
+        return 0
+
+    def __bool__(self):
+        return False
+
+    def __int__(self):
+        return 0
+
+    def __index__(self):
+        return 0
+
+    def __float__(self):
+        return 0.0
+
+    def __str__(self):
+        return ""
+
+    def __repr__(self):
+        return f"<StubObject {self._stub_name}>"
+
+    def __hash__(self):
+        return id(self)
+
+    def __eq__(self, other):
+        return self is other
+
+    def __lt__(self, other):
+        return False
+
+    def __gt__(self, other):
+        return False
+
+    def __add__(self, other):
+        return other
+
+    __radd__ = __add__
+    __sub__ = __add__
+    __mul__ = __add__
+
+
+class StubSingleton(StubObject):
+    __stub_instance__ = None
+
+    @classmethod
+    def instance(cls):
+        if cls.__dict__.get("__stub_instance__") is None:
+            cls.__stub_instance__ = cls()
+        return cls.__stub_instance__
+
+
+#------------------------------------------------------------------------------
+# Zynthbox
+#------------------------------------------------------------------------------
+
+class JackPassthroughFilter(StubObject):
+    class FilterTypeValues(dict):
+        def __missing__(self, key):
+            return 0
+
+    class FilterType(object):
+        values = None
+
+    class FilterTypeValue(object):
+        name = b"Zynthbox.JackPassthroughFilter.FilterType.PeakType"
+
+    def __init__(self):
+        super().__init__("JackPassthroughFilter")
+        self.__dict__["values"] = {"filterType": 2, "frequency": 1000.0, "quality": 0.7, "soloed": False, "gain": 1.0, "active": False}
+
+    def filterType(self): return JackPassthroughFilter.FilterTypeValue()
+    def frequency(self): return self.__dict__["values"]["frequency"]
+    def quality(self): return self.__dict__["values"]["quality"]
+    def soloed(self): return self.__dict__["values"]["soloed"]
+    def gain(self): return self.__dict__["values"]["gain"]
+    def active(self): return self.__dict__["values"]["active"]
+    def setFilterType(self, value): pass
+    def setFrequency(self, value): self.__dict__["values"]["frequency"] = value
+    def setQuality(self, value): self.__dict__["values"]["quality"] = value
+    def setSoloed(self, value): self.__dict__["values"]["soloed"] = value
+    def setGain(self, value): self.__dict__["values"]["gain"] = value
+    def setActive(self, value): self.__dict__["values"]["active"] = value
+    def setDefaults(self): pass
+
+
+JackPassthroughFilter.FilterType.values = JackPassthroughFilter.FilterTypeValues(HighPassType=0, LowShelfType=1, PeakType=2, HighShelfType=3, LowPassType=4)
+
+
+class JackCompressorSettings(StubObject):
+    def __init__(self):
+        super().__init__("JackCompressorSettings")
+
+    def thresholdDB(self): return -10.0
+    def makeUpGainDB(self): return 0.0
+    def kneeWidthDB(self): return 0.0
+    def release(self): return 80.0
+    def attack(self): return 30.0
+    def ratio(self): return 4.0
+
+
+class GainHandler(StubObject):
+    def __init__(self):
+        super().__init__("GainHandler")
+        self.__dict__["gain_db"] = 0.0
+
+    def gainDb(self): return self.__dict__["gain_db"]
+    def setGainDb(self, value): self.__dict__["gain_db"] = value
+
+
+class JackPassthroughClient(StubObject):
+    def __init__(self):
+        super().__init__("JackPassthroughClient")
+        self.__dict__["filters"] = [JackPassthroughFilter() for _ in range(6)]
+        self.__dict__["compressor"] = JackCompressorSettings()
+        self.__dict__["gain_handler"] = GainHandler()
+
+    def gainHandler(self): return self.__dict__["gain_handler"]
+
+    def equaliserSettings(self): return self.__dict__["filters"]
+    def compressorSettings(self): return self.__dict__["compressor"]
+    def equaliserEnabled(self): return False
+    def compressorEnabled(self): return False
+    def compressorSidechannelLeft(self): return ""
+    def compressorSidechannelRight(self): return ""
+    def panAmount(self): return 0.0
+    def dryWetMixAmount(self): return 1.0
+
+
+class Plugin(StubSingleton):
+    def __init__(self):
+        super().__init__("Plugin")
+        self.__dict__["global_playback_client"] = JackPassthroughClient()
+        self.__dict__["synth_clients"] = [JackPassthroughClient() for _ in range(16)]
+        self.__dict__["fx_clients"] = [[JackPassthroughClient() for _ in range(SLOT_COUNT)] for _ in range(TRACK_COUNT)]
+        self.__dict__["sketch_fx_clients"] = [[JackPassthroughClient() for _ in range(SLOT_COUNT)] for _ in range(TRACK_COUNT)]
+        self.__dict__["track_clients"] = [[[JackPassthroughClient() for _ in range(SLOT_COUNT)] for _ in range(2)] for _ in range(TRACK_COUNT)]
+
+    def sketchpadTrackCount(self): return TRACK_COUNT
+    def sketchpadSlotCount(self): return SLOT_COUNT
+    def sketchpadSongCount(self): return SONG_COUNT
+    def trackPassthroughClient(self, trackIndex, slotType, laneIndex): return self.__dict__["track_clients"][trackIndex][slotType][laneIndex]
+    def globalPlaybackClient(self): return self.__dict__["global_playback_client"]
+    def synthPassthroughClients(self): return self.__dict__["synth_clients"]
+    def fxPassthroughClients(self): return self.__dict__["fx_clients"]
+    def sketchFxPassthroughClients(self): return self.__dict__["sketch_fx_clients"]
+
+
+class AudioLevels(StubSingleton):
+    def __init__(self):
+        super().__init__("AudioLevels")
+        self.__dict__["track_clients"] = [JackPassthroughClient() for _ in range(TRACK_COUNT)]
+
+    def tracks(self): return self.__dict__["track_clients"]
+
+
+class SyncTimer(StubSingleton):
+    def __init__(self):
+        super().__init__("SyncTimer")
+        self.__dict__["bpm"] = 120
+
+    def getBpm(self): return self.__dict__["bpm"]
+    def setBpm(self, bpm): self.__dict__["bpm"] = bpm
+    def timerRunning(self): return False
+
+
+class MidiRouter(StubSingleton):
+    def __init__(self):
+        super().__init__("MidiRouter")
+
+
+class ClipAudioSource(StubObject):
+    def __init__(self, path="", *args):
+        super().__init__("ClipAudioSource")
+        self.__dict__["path"] = path
+
+    def getFilePath(self): return self.__dict__["path"]
+    def getDuration(self): return 1.0
+
+
+class ProcessWrapper(StubObject):
+    class ProcessState(object):
+        NotRunningState = 0
+        StartingState = 1
+        RunningState = 2
+
+    class WaitForOutputResult(object):
+        WaitForOutputSuccess = 0
+        WaitForOutputFailure = 1
+        WaitForOutputTimeout = 2
+
+    def __init__(self, parent=None):
+        super().__init__("ProcessWrapper")
+
+    def state(self): return ProcessWrapper.ProcessState.RunningState
+    def awaitedOutput(self): return ""
+    def standardOutput(self): return ""
+
+
+class JackConnectionHandler(StubSingleton):
+    """Keeps track of the connections in memory, and counts what commit would have done"""
+    def __init__(self):
+        super().__init__("JackConnectionHandler")
+        self.__dict__["connections"] = {}
+        self.__dict__["pending"] = []
+        self.__dict__["commits"] = 0
+        self.__dict__["changes"] = 0
+
+    def getAllConnections(self, port_name):
+        return list(self.__dict__["connections"].get(port_name, []))
+
+    def connectPorts(self, port_a, port_b):
+        self.__dict__["pending"].append((port_a, port_b, True))
+
+    def disconnectPorts(self, port_a, port_b):
+        self.__dict__["pending"].append((port_a, port_b, False))
+
+    def clear(self):
+        self.__dict__["pending"].clear()
+
+    def commit(self):
+        connections = self.__dict__["connections"]
+        for port_a, port_b, connect in self.__dict__["pending"]:
+            for a, b in ((port_a, port_b), (port_b, port_a)):
+                connected = connections.setdefault(a, [])
+                if connect and b not in connected:
+                    connected.append(b)
+                elif not connect and b in connected:
+                    connected.remove(b)
+            self.__dict__["changes"] += 1
+        self.__dict__["pending"].clear()
+        self.__dict__["commits"] += 1
+        return True
+
+
+#------------------------------------------------------------------------------
+# jack
+#------------------------------------------------------------------------------
+
+class JackPort(object):
+    def __init__(self, name, is_audio=True, is_input=False):
+        self.name = name
+        self.shortname = name.split(":", 1)[-1]
+        self.aliases = []
+        self.is_audio = is_audio
+        self.is_midi = not is_audio
+        self.is_input = is_input
+        self.is_output = not is_input
+        self.is_physical = name.startswith("system:")
+
+
+class JackClient(object):
+    """
+    A jack client with a synthetic port graph, matching ports by regular expression and
+    flags the way python-jack does
+    """
+    ports = []
+
+    def __init__(self, name="stub", *args, **kwargs):
+        self.name = name
+
+    def get_ports(self, name_pattern="", is_audio=False, is_midi=False, is_input=False, is_output=False, is_physical=False, **kwargs):
+        pattern = re.compile(name_pattern) if name_pattern else None
+        result = []
+        for port in JackClient.ports:
+            if pattern is not None and pattern.search(port.name) is None:
+                continue
+            if (is_audio and not port.is_audio) or (is_midi and not port.is_midi):
+                continue
+            if (is_input and not port.is_input) or (is_output and not port.is_output):
+                continue
+            if is_physical and not port.is_physical:
+                continue
+            result.append(port)
+        return result
+
+    def get_all_connections(self, port):
+        name = port if isinstance(port, str) else port.name
+        return [JackPort(connected) for connected in JackConnectionHandler.instance().getAllConnections(name)]
+
+    def __getattr__(self, name):
+        # All the callback setters, activate, deactivate, close and so on
+        return lambda *args, **kwargs: None
+
+
+def build_jack_graph(track_count=TRACK_COUNT, slot_count=SLOT_COUNT):
+    """Populates the synthetic jack graph with roughly the ports a running device has"""
+    ports = []
+    def stereo(client, prefix, is_input):
+        for side in ("left", "right"):
+            ports.append(JackPort(f"{client}:{prefix}{side}", True, is_input))
+    for index in (1, 2):
+        ports.append(JackPort(f"system:playback_{index}", True, True))
+        ports.append(JackPort(f"system:capture_{index}", True, False))
+    stereo("GlobalPlayback", "input", True)
+    stereo("GlobalPlayback", "dryOut", False)
+    stereo("GlobalFXPassthrough", "input", True)
+    stereo("GlobalFXPassthrough", "dryOut", False)
+    stereo("AudioLevels", "SystemPlayback-", True)
+    for track in range(track_count):
+        stereo(f"TrackPassthrough:Channel{track + 1}", "input", True)
+        stereo(f"TrackPassthrough:Channel{track + 1}", "dryOut", False)
+        for lane in range(slot_count):
+            stereo(f"FXPassthrough-lane{lane + 1}:Channel{track + 1}", "input", True)
+            stereo(f"FXPassthrough-lane{lane + 1}:Channel{track + 1}", "dryOut", False)
+            stereo(f"FXPassthrough-lane{lane + 1}:Channel{track + 1}", "wetOutFx1", False)
+            stereo(f"SamplerSynth:channel_{track + 1}-lane{lane + 1}", "", False)
+    for laneType in ("sample", "sketch"):
+        for index in (1, 2):
+            stereo(f"SamplerSynth:global-{laneType}{index}", "-", False)
+    for index in range(16):
+        ports.append(JackPort(f"ZLRouter:Zynthian-Channel{index}", False, False))
+    JackClient.ports = ports
+    return ports
+
+
+#------------------------------------------------------------------------------
+# zyncoder
+#------------------------------------------------------------------------------
+
+class LibZyncoder(object):
+    """The midi filter and encoder functions of lib_zyncoder, backed by plain python state"""
+    def __init__(self):
+        self.clone = np.zeros((16, 16), dtype=bool)
+        self.clone_cc = np.zeros((16, 16, 128), dtype=np.uint8)
+        self.note_low = [0] * 16
+        self.note_high = [127] * 16
+        self.octave_trans = [0] * 16
+        self.halftone_trans = [0] * 16
+
+    def get_midi_filter_clone(self, i, j): return bool(self.clone[i][j])
+    def set_midi_filter_clone(self, i, j, value): self.clone[i][j] = value
+    def get_midi_filter_clone_cc(self, i, j): return self.clone_cc[i][j]
+    def get_midi_filter_note_low(self, i): return self.note_low[i]
+    def get_midi_filter_note_high(self, i): return self.note_high[i]
+    def get_midi_filter_octave_trans(self, i): return self.octave_trans[i]
+    def get_midi_filter_halftone_trans(self, i): return self.halftone_trans[i]
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: 0
+
+
+#------------------------------------------------------------------------------
+# Installation
+#------------------------------------------------------------------------------
+
+class StubModule(types.ModuleType):
+    """A module which hands out StubObjects for anything it doesn't explicitly define"""
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = StubObject(f"{self.__name__}.{name}")
+        setattr(self, name, value)
+        return value
+
+
+# Bindings to libraries which only come with the device's system packages (rather than from pip), and which
+# nothing being benchmarked calls into, so the ui modules importing them only need them to exist
+SYSTEM_MODULES = ["lilv", "Jucy", "apt", "apt_pkg"]
+
+
+def install():
+    """
+    Registers the stub modules in sys.modules, so subsequent imports of Zynthbox, jack, zyncoder and the
+    SYSTEM_MODULES get them
+    """
+    for name in SYSTEM_MODULES:
+        sys.modules[name] = StubModule(name)
+
+    zynthbox = StubModule("Zynthbox")
+    for cls in (Plugin, AudioLevels, SyncTimer, MidiRouter, ClipAudioSource, ProcessWrapper, JackConnectionHandler, JackPassthroughFilter):
+        setattr(zynthbox, cls.__name__, cls)
+    sys.modules["Zynthbox"] = zynthbox
+
+    jack = StubModule("jack")
+    jack.Client = JackClient
+    jack.Port = JackPort
+    jack.MidiPort = JackPort
+    jack.JackError = Exception
+    sys.modules["jack"] = jack
+    build_jack_graph()
+
+    lib_zyncoder = LibZyncoder()
+    zyncoder_zyncoder = StubModule("zyncoder.zyncoder")
+    zyncoder_zyncoder.lib_zyncoder = lib_zyncoder
+    zyncoder_zyncoder.lib_zyncoder_init = lambda *args, **kwargs: lib_zyncoder
+    zyncoder = StubModule("zyncoder")
+    zyncoder.__path__ = []
+    zyncoder.__all__ = ["zyncoder"]
+    zyncoder.zyncoder = zyncoder_zyncoder
+    zyncoder.lib_zyncoder = lib_zyncoder
+    sys.modules["zyncoder"] = zyncoder
+    sys.modules["zyncoder.zyncoder"] = zyncoder_zyncoder
@@ -29,7 +29,7 @@ import copy
 import logging
 import traceback
 from time import sleep
-from threading  import Thread, Lock
+from threading  import Thread, Lock, Event
 from collections import OrderedDict
 from itertools import cycle
 from queue import SimpleQueue
@@ -58,9 +58,13 @@ logger.setLevel(log_level)
 #-------------------------------------------------------------------------------
 
 refresh_time = 2
+# Time given to a burst of jack graph notifications (e.g. an engine registering all its ports) to settle before reacting
+settle_time = 0.1
 jclient: jack.Client = None
 thread = None
 exit_flag = False
+# Set whenever something happened which may require the autoconnect thread to run (jack graph changes or explicit requests)
+autoconnect_event = Event()
 force_next_autoconnect = False
 xrun_count = 0
 
@@ -98,6 +102,7 @@ def callAfterMidiAutoconnect(callback):
     redoAutoconnectMidi = True
     force_next_autoconnect = True
     postMidiConnectCallbacks.put(callback)
+    autoconnect_event.set()
 
 # Pass a callback to be run after autoconnecting audio next time and schedules a run of the audio autoconnect
 # If one is ongoing, autoconnect will check first and ensure that it re-runs before attempting
@@ -109,6 +114,7 @@ def callAfterAudioAutoconnect(callback):
     redoAutoconnectAudio = True
     force_next_autoconnect = True
     postAudioConnectCallbacks.put(callback)
+    autoconnect_event.set()
 
 # This will be done immediately prior to attempting to perform the enqueued callbacks
 # If we are asked to redo the autoconnect, we will do precisely that (recursively,
@@ -162,6 +168,59 @@ def runCallbacksAfterAudioAutoconnect():
                 else:
                     logging.error(f"We have been asked to perform a callback which is not callable: {callback}")
 
+#------------------------------------------------------------------------------
+# Connection plan (computes the desired connection graph and applies only the difference to the current one)
+#------------------------------------------------------------------------------
+
+# Wraps the JackConnectionHandler, exposing the same api used by the autoconnect passes
+# Rather than queueing every (dis)connection request on the handler, the requests are
+# collected as a desired state for each port pair (with the last request for a pair winning),
+# and on commit only the pairs whose desired state differs from the current jack graph are
+# passed on to the handler. This means that the pattern used below of clearing out all
+# connections on a port and then connecting the ones we want results in no actual graph
+# changes at all when nothing has changed, rather than a full disconnect/reconnect cycle.
+class ConnectionPlan(object):
+    def __init__(self, handler):
+        self.handler = handler
+        # Keyed by the (sorted) pair of port names, value is (port_a, port_b, should_be_connected)
+        self.desired = OrderedDict()
+        # Cache of the current connections of each port we have asked about during this pass
+        self.current = {}
+
+    # Returns the connections of the given port as they are in the jack graph, not including pending changes
+    def getAllConnections(self, port_name):
+        if port_name not in self.current:
+            self.current[port_name] = list(self.handler.getAllConnections(port_name))
+        return self.current[port_name]
+
+    def connectPorts(self, port_a, port_b):
+        self.desired[tuple(sorted((port_a, port_b)))] = (port_a, port_b, True)
+
+    def disconnectPorts(self, port_a, port_b):
+        self.desired[tuple(sorted((port_a, port_b)))] = (port_a, port_b, False)
+
+    def clear(self):
+        self.desired.clear()
+        self.current.clear()
+        self.handler.clear()
+
+    def commit(self):
+        changes = 0
+        for port_a, port_b, should_be_connected in self.desired.values():
+            if (port_b in self.getAllConnections(port_a)) == should_be_connected:
+                continue
+            if should_be_connected:
+                self.handler.connectPorts(port_a, port_b)
+            else:
+                self.handler.disconnectPorts(port_a, port_b)
+            changes += 1
+        logger.debug(f"ZynAutoConnect: Applying {changes} of {len(self.desired)} requested connection states")
+        self.desired.clear()
+        self.current.clear()
+        if changes == 0:
+            return True
+        return self.handler.commit()
+
 #------------------------------------------------------------------------------
 
 def get_port_alias_id(midi_port):
@@ -198,7 +257,7 @@ def midi_autoconnect(force=False):
 
     logger.info("ZynAutoConnect: MIDI ...")
 
-    zbjack = Zynthbox.JackConnectionHandler.instance()
+    zbjack = ConnectionPlan(Zynthbox.JackConnectionHandler.instance())
 
     #------------------------------------
     # Get Input/Output MIDI Ports:
@@ -578,7 +637,7 @@ def audio_autoconnect(force=False):
     #Get Mutex Lock
     acquire_lock()
 
-    zbjack = Zynthbox.JackConnectionHandler.instance()
+    zbjack = ConnectionPlan(Zynthbox.JackConnectionHandler.instance())
 
     logger.info("ZynAutoConnect: Audio ...")
 
@@ -1349,11 +1408,21 @@ def autoconnect(force=False):
 
 def autoconnect_thread():
     while not exit_flag:
+        # Sleep until something changes in the jack graph (or someone asks for a pass). If the
+        # previous pass failed and asked to be forced, retry after refresh_time even if nothing
+        # happened in the meantime
+        if force_next_autoconnect:
+            autoconnect_event.wait(refresh_time)
+        else:
+            autoconnect_event.wait()
+        if exit_flag:
+            break
+        sleep(settle_time)
+        autoconnect_event.clear()
         try:
             autoconnect(force_next_autoconnect)
         except Exception as err:
             logger.error("ZynAutoConnect ERROR: {}".format(err))
-        sleep(refresh_time)
 
 
 def acquire_lock():
@@ -1380,6 +1449,8 @@ def start(rt=2):
     try:
         jclient=jack.Client("Zynthian_autoconnect")
         jclient.set_xrun_callback(cb_jack_xrun)
+        jclient.set_port_registration_callback(cb_jack_port_registration)
+        jclient.set_client_registration_callback(cb_jack_client_registration)
         jclient.activate()
     except Exception as e:
         logger.error("ZynAutoConnect ERROR: Can't connect with Jack Audio Server ({})".format(e))
@@ -1398,6 +1469,7 @@ def start(rt=2):
 def stop():
     global exit_flag
     exit_flag=True
+    autoconnect_event.set()
     acquire_lock()
     audio_disconnect_sysout()
     release_lock()
@@ -1415,6 +1487,15 @@ def cb_jack_xrun(delayed_usecs: float):
     zynthian_gui_config.zynqtgui.status_info['xrun'] = True
 
 
+# NOTE These are called from jack's notification thread, so they must not call into jack themselves
+def cb_jack_port_registration(port, register: bool):
+    autoconnect_event.set()
+
+
+def cb_jack_client_registration(name: str, register: bool):
+    autoconnect_event.set()
+
+
 def get_jackd_cpu_load():
     return jclient.cpu_load()
 
@@ -2,9 +2,13 @@
 __all__ = [
     "zynthian_zcmidi",
     "zynthian_midi_filter",
+    "zynthian_midi_filter_state",
     "zynthian_controller",
     "zynthian_layer",
     "zynthian_lv2",
+    "zynthian_sf2",
+    "zynthian_dir_cache",
+    "zynthian_preset_catalogue",
     "zynthian_engine",
     "zynthian_engine_zynaddsubfx",
     "zynthian_engine_linuxsampler",
@@ -23,9 +27,13 @@ __all__ = [
 #from zyngine.zynthian_midi import *
 from zyngine.zynthian_zcmidi import *
 from zyngine.zynthian_midi_filter import *
+from zyngine.zynthian_midi_filter_state import *
 from zyngine.zynthian_controller import *
 from zyngine.zynthian_layer import *
 from zyngine.zynthian_lv2 import *
+from zyngine.zynthian_sf2 import *
+from zyngine.zynthian_dir_cache import *
+from zyngine.zynthian_preset_catalogue import *
 from zyngine.zynthian_engine import *
 from zyngine.zynthian_engine_zynaddsubfx import *
 from zyngine.zynthian_engine_linuxsampler import *
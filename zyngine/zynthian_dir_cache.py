@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+#******************************************************************************
+# ZYNTHIAN PROJECT: Zynthian Engine (zynthian_dir_cache)
+#
+# Directory listing cache, invalidated by inotify
+#
+# Copyright (C) 2026 Zynthbox contributors
+#
+#******************************************************************************
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of
+# the License, or any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For a full copy of the GNU General Public License see the LICENSE.txt file.
+#
+#******************************************************************************
+
+import os
+import errno
+import ctypes
+import ctypes.util
+import struct
+import logging
+import threading
+from contextlib import contextmanager
+
+#------------------------------------------------------------------------------
+# Directory Listing Cache Class
+#
+# Listing the bank and preset directories of the engines (and checking what
+# each entry is) causes a lot of file IO, which starves the jack thread and
+# causes xruns. The cache keeps the listing of each directory in memory, and
+# puts an inotify watch on it, so the listing is dropped (and its version
+# bumped) as soon as anything is created, deleted or moved in the directory.
+# Where inotify is unavailable (or out of watches), a listing is checked
+# against the directory's modification time instead, which costs one stat.
+#
+# Anything derived from listings (like the bank and preset lists of a layer)
+# can be kept for as long as the listings it was made from are unchanged: run
+# the code producing it inside track(), which collects the version of each
+# directory listed, and check is_current() with those before using it.
+#------------------------------------------------------------------------------
+
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+WATCH_MASK = IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class zynthian_dir_cache:
+
+    __instance = None
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        # Cached listings by directory path, as {'entries', 'wd', 'mtime'}
+        self.listings = {}
+        # Version of each directory's listing, bumped whenever it changes
+        self.versions = {}
+        # Directory path of each inotify watch descriptor
+        self.watches = {}
+        self.trackers = threading.local()
+        self.libc = None
+        self.inotify_fd = -1
+        self.start_inotify()
+
+    @staticmethod
+    def instance():
+        if zynthian_dir_cache.__instance is None:
+            zynthian_dir_cache.__instance = zynthian_dir_cache()
+        return zynthian_dir_cache.__instance
+
+    def start_inotify(self):
+        try:
+            self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            self.inotify_fd = self.libc.inotify_init1(os.O_CLOEXEC)
+            if self.inotify_fd < 0:
+                raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        except Exception as e:
+            logging.warning(f"inotify is unavailable, directory listings will be checked against their modification time: {e}")
+            self.inotify_fd = -1
+            return
+        threading.Thread(target=self.inotify_loop, name="directory listing cache", daemon=True).start()
+
+    def add_watch(self, path):
+        if self.inotify_fd < 0:
+            return None
+        wd = self.libc.inotify_add_watch(self.inotify_fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                logging.warning(f"Out of inotify watches, the listing of {path} will be checked against its modification time")
+            return None
+        if self.watches.get(wd, path) != path:
+            # The same directory through another path (a symlink), which already has this watch
+            return None
+        self.watches[wd] = path
+        return wd
+
+    def inotify_loop(self):
+        while True:
+            try:
+                data = os.read(self.inotify_fd, 64 * 1024)
+            except InterruptedError:
+                continue
+            except OSError as e:
+                logging.error(f"Reading inotify events failed, stopping the directory listing watches: {e}")
+                with self.lock:
+                    self.inotify_fd = -1
+                    for path in list(self.listings):
+                        self.invalidate(path)
+                return
+            offset = 0
+            with self.lock:
+                while offset + EVENT_HEADER.size <= len(data):
+                    wd, mask, _, name_length = EVENT_HEADER.unpack_from(data, offset)
+                    name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + name_length].split(b"\0", 1)[0]
+                    offset += EVENT_HEADER.size + name_length
+                    if mask & IN_Q_OVERFLOW:
+                        # Events were lost, so nothing cached can be trusted
+                        for path in list(self.listings):
+                            self.invalidate(path)
+                        continue
+                    path = self.watches.get(wd)
+                    if path is None:
+                        continue
+                    if mask & IN_IGNORED:
+                        # The watch is gone (the directory was deleted, or the watch removed)
+                        self.watches.pop(wd, None)
+                    self.invalidate(path)
+                    if name:
+                        # A (previously missing) subdirectory which was listed may have appeared or gone
+                        self.invalidate(os.path.join(path, os.fsdecode(name)))
+
+    # Drop the cached listing of the given directory, marking everything derived from it as outdated
+    def invalidate(self, path):
+        with self.lock:
+            listing = self.listings.pop(path, None)
+            if listing is None:
+                return
+            self.versions[path] = self.versions.get(path, 0) + 1
+            if listing['wd'] is not None and self.watches.get(listing['wd']) == path:
+                self.watches.pop(listing['wd'])
+                self.libc.inotify_rm_watch(self.inotify_fd, listing['wd'])
+
+    def get_mtime(self, path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def get_listing(self, path):
+        with self.lock:
+            listing = self.listings.get(path)
+            if listing is not None and listing['wd'] is None and self.get_mtime(path) != listing['mtime']:
+                self.invalidate(path)
+                listing = None
+            if listing is None:
+                # Watch first, so changes made while listing aren't missed
+                wd = self.add_watch(path)
+                mtime = self.get_mtime(path)
+                entries = []
+                try:
+                    with os.scandir(path) as it:
+                        for entry in it:
+                            try:
+                                entries.append((entry.name, entry.is_dir(), entry.is_file()))
+                            except OSError:
+                                pass
+                except OSError:
+                    pass
+                entries.sort()
+                listing = {'entries': entries, 'wd': wd, 'mtime': mtime}
+                self.listings[path] = listing
+            for tracker in getattr(self.trackers, 'stack', []):
+                tracker[path] = self.versions.get(path, 0)
+            return listing
+
+    # Returns the entries of the given directory as a sorted list of (name, is_dir, is_file) tuples
+    # (which follow symlinks), or an empty list if it doesn't exist or can't be read
+    def scandir(self, path):
+        return self.get_listing(os.path.abspath(path))['entries']
+
+    def listdir(self, path):
+        return [name for name, _, _ in self.scandir(path)]
+
+    def isdir(self, path):
+        path = os.path.abspath(path)
+        name = os.path.basename(path)
+        for entry in self.scandir(os.path.dirname(path)):
+            if entry[0] == name:
+                return entry[1]
+        return False
+
+    # The modification time the given directory had when its (cached) listing was made
+    def get_listing_mtime(self, path):
+        return self.get_listing(os.path.abspath(path))['mtime']
+
+    # Returns the paths of the files in the given directory (and its subdirectories, up to maxdepth levels, like find does),
+    # of which the name ends with any of the given (lower case) extensions
+    def find_files(self, path, extensions, maxdepth=1):
+        res = []
+        for name, is_dir, is_file in self.scandir(path):
+            fpath = os.path.join(path, name)
+            if is_file and name.lower().endswith(extensions):
+                res.append(fpath)
+            elif is_dir and maxdepth > 1:
+                res += self.find_files(fpath, extensions, maxdepth - 1)
+        return res
+
+    # Collects the versions of all directories listed inside the with block, by path, into the yielded dictionary
+    @contextmanager
+    def track(self):
+        if not hasattr(self.trackers, 'stack'):
+            self.trackers.stack = []
+        tracker = {}
+        self.trackers.stack.append(tracker)
+        try:
+            yield tracker
+        finally:
+            self.trackers.stack.remove(tracker)
+
+    # Whether all directory listings collected by track() are unchanged
+    def is_current(self, tracked):
+        if tracked is None:
+            return False
+        for path, version in tracked.items():
+            # Looking the listing up checks it against the modification time where it isn't watched
+            self.get_listing(path)
+            if self.versions.get(path, 0) != version:
+                return False
+        return True
+
+#------------------------------------------------------------------------------
@@ -36,13 +36,14 @@ try:
     import liblo
 except ImportError:
     import pyliblo3 as liblo
-from os.path import isfile, isdir, join, splitext
+from os.path import join, splitext
 from os import scandir
 from string import Template
 from collections import OrderedDict
 from PySide2.QtCore import Property, QObject, Signal, Slot
 
 from . import zynthian_controller
+from .zynthian_dir_cache import zynthian_dir_cache
 
 #--------------------------------------------------------------------------------
 # Basic Engine Class: Spawn a proccess & manage IPC communication using pexpect
@@ -63,7 +64,10 @@ class zynthian_basic_engine(QObject):
     # Initialization
     # ---------------------------------------------------------------------------
 
-    def __init__(self, name=None, command=None, prompt=None, zynqtgui=None):
+    # If defer_start_wait is set, the first start() will launch the engine process without waiting for it to be
+    # ready, and the wait will instead happen in wait_for_start() (which is also called implicitly before talking
+    # to the process). This allows starting a number of engines concurrently.
+    def __init__(self, name=None, command=None, prompt=None, zynqtgui=None, defer_start_wait=False):
         super(zynthian_basic_engine, self).__init__(zynqtgui)
         self.zynqtgui = zynqtgui
         self.name = name
@@ -74,8 +78,11 @@ class zynthian_basic_engine(QObject):
         self.command_env = os.environ.copy()
         self.command_prompt = prompt
         self.is_running = False
+        self.defer_start_wait = defer_start_wait
         # A flag to detect if process has crashed has been restarted in handleStateChanged
         self.has_restarted = False
+        # The start transaction of the process, if we have not yet waited for it to complete
+        self.start_transaction = None
 
     def __del__(self):
         # If this fails, it is likely that the engine was already stopped and the process object deleted, so let's just not worry too much
@@ -110,6 +117,10 @@ class zynthian_basic_engine(QObject):
             logging.info(f"Starting Engine {self.name}")
             logging.debug(f"Engine start command : {self.command}")
             startTransaction = self.proc.start(command, command_args, self.command_env)
+            if self.command_prompt and self.defer_start_wait:
+                self.defer_start_wait = False
+                self.start_transaction = startTransaction
+                return output
             # logging.debug("Waiting for start command to complete...")
             if self.command_prompt:
                 startTransaction.waitForState()
@@ -118,7 +129,21 @@ class zynthian_basic_engine(QObject):
             startTransaction.release()
         return output
 
+    """
+    Wait for a start which was deferred (see defer_start_wait) to complete, and return its output
+    """
+    def wait_for_start(self):
+        output = ""
+        if self.start_transaction is not None:
+            startTransaction = self.start_transaction
+            self.start_transaction = None
+            startTransaction.waitForState()
+            output = startTransaction.standardOutput()
+            startTransaction.release()
+        return output
+
     def stop(self):
+        self.wait_for_start()
         if self.proc.state() == Zynthbox.ProcessWrapper.ProcessState.RunningState:
             try:
                 logging.info("Stoping Engine " + self.name)
@@ -133,6 +158,7 @@ class zynthian_basic_engine(QObject):
     # NOTE This function will also return an empty string when wait_for_output is set to True but the call fails for whatever reason
     def proc_cmd(self, cmd:str, wait_for_output=False):
         out = ""
+        self.wait_for_start()
         if self.proc is not None and self.proc.state() == Zynthbox.ProcessWrapper.ProcessState.RunningState:
             # logging.debug(f"{self.name} proc command: {cmd} - blocking? {wait_for_output}")
             if wait_for_output:
@@ -154,6 +180,7 @@ class zynthian_basic_engine(QObject):
     # common case).
     # NOTE Remember to release the returned transaction when it is no longer needed
     def proc_transact(self, cmd:str, wait_for_output=False):
+        self.wait_for_start()
         if wait_for_output:
             return self.proc.call(cmd)
         else:
@@ -199,8 +226,8 @@ class zynthian_engine(zynthian_basic_engine):
     # Initialization
     # ---------------------------------------------------------------------------
 
-    def __init__(self, version_info, zynqtgui=None):
-        super().__init__(zynqtgui=zynqtgui)
+    def __init__(self, version_info, zynqtgui=None, defer_start_wait=False):
+        super().__init__(zynqtgui=zynqtgui, defer_start_wait=defer_start_wait)
 
         self.version_info = version_info
         self.zynqtgui=zynqtgui
@@ -351,23 +378,18 @@ class zynthian_engine(zynthian_basic_engine):
         fext='.'+fext
         xlen=len(fext)
         i=start_index
+        dir_cache=zynthian_dir_cache.instance()
         for dpd in dpath:
             dp=dpd[1]
             dn=dpd[0]
-            try:
-                if sort:
-                    files = sorted(os.listdir(dp))
-                else:
-                    files = os.listdir(dp)
-                for f in files:
-                    if not f.startswith('.') and isfile(join(dp,f)) and f[-xlen:].lower()==fext:
-                        title=str.replace(f[:-xlen], '_', ' ')
-                        if dn!='_': title=dn+'/'+title
-                        #print("filelist => "+title)
-                        res.append([join(dp,f),i,title,dn,f,"music-note-16th"])
-                        i=i+1
-            except:
-                pass
+            # Listings are sorted by the directory cache
+            for f, is_dir, is_file in dir_cache.scandir(dp):
+                if not f.startswith('.') and is_file and f[-xlen:].lower()==fext:
+                    title=str.replace(f[:-xlen], '_', ' ')
+                    if dn!='_': title=dn+'/'+title
+                    #print("filelist => "+title)
+                    res.append([join(dp,f),i,title,dn,f,"music-note-16th"])
+                    i=i+1
 
         return res
 
@@ -376,26 +398,24 @@ class zynthian_engine(zynthian_basic_engine):
         res=[]
         if isinstance(dpath, str): dpath=[dpath]
         i=start_index
+        fexts=fext.split(",")
+        dir_cache=zynthian_dir_cache.instance()
 
-        for dp in dpath:            
+        for dp in dpath:
             logging.info("SOUNDFONTS DIR IMP {}".format(dp))
-            try:               
-                if(sort): 
-                    files = sorted(os.scandir(dp), key=lambda entry: (not entry.is_dir(), entry.name)) 
-                else:
-                    files = os.scandir(dp)
-
-                for f in files:                    
-                    if not f.name.startswith('.'):
-                        suffix = splitext(f.name)[1][1:]
-
-                        if(f.is_dir() or suffix in fext.split(",")):
-                            title=f.name
-                            icon= "folder" if f.is_dir() else "music-note-16th"                       
-                            res.append([f.path,i,title,"",f.name,icon])
-                            i=i+1
-            except:
-                pass
+            files = dir_cache.scandir(dp)
+            if(sort):
+                files = sorted(files, key=lambda entry: (not entry[1], entry[0]))
+
+            for f, is_dir, is_file in files:
+                if not f.startswith('.'):
+                    suffix = splitext(f)[1][1:]
+
+                    if(is_dir or suffix in fexts):
+                        title=f
+                        icon= "folder" if is_dir else "music-note-16th"
+                        res.append([join(dp,f),i,title,"",f,icon])
+                        i=i+1
 
         return res
 
@@ -405,26 +425,20 @@ class zynthian_engine(zynthian_basic_engine):
         res=[]
         if isinstance(dpath, str): dpath=[('_', dpath)]
         i=start_index
+        dir_cache=zynthian_dir_cache.instance()
         for dpd in dpath:
             dp=dpd[1]
             dn=dpd[0]
-            try:
-                if sort:
-                    files = sorted(os.listdir(dp))
-                else:
-                    files = os.listdir(dp)
-                for f in files:
-                    if exclude_empty and next(os.scandir(join(dp,f)), None) is None:
+            for f, is_dir, is_file in dir_cache.scandir(dp):
+                if not f.startswith('.') and is_dir:
+                    if exclude_empty and len(dir_cache.scandir(join(dp,f)))==0:
                         continue
-                    if not f.startswith('.') and isdir(join(dp,f)):
-                        title,ext=os.path.splitext(f)
-                        title=str.replace(title, '_', ' ')
-                        if dn!='_': title=dn+'/'+title
-                        #print("dirlist => "+title)
-                        res.append([join(dp,f),i,title,dn,f])
-                        i=i+1
-            except:
-                pass
+                    title,ext=os.path.splitext(f)
+                    title=str.replace(title, '_', ' ')
+                    if dn!='_': title=dn+'/'+title
+                    #print("dirlist => "+title)
+                    res.append([join(dp,f),i,title,dn,f])
+                    i=i+1
 
         return res
 
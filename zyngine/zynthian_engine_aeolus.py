@@ -169,8 +169,8 @@ class zynthian_engine_aeolus(zynthian_engine):
     # Initialization
     #----------------------------------------------------------------------------
 
-    def __init__(self, version_info, zynqtgui=None):
-        super().__init__(version_info, zynqtgui)
+    def __init__(self, version_info, zynqtgui=None, defer_start_wait=False):
+        super().__init__(version_info, zynqtgui, defer_start_wait)
         self.name = "Aeolus"
         self.nickname = "AE"
         self.jackname = self.get_next_jackname("aeolus")
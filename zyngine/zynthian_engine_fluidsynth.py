@@ -30,6 +30,7 @@ import logging
 from pathlib import Path
 from subprocess import check_output
 from . import zynthian_engine
+from . import zynthian_sf2
 from os.path import isdir
 
 #------------------------------------------------------------------------------
@@ -85,8 +86,8 @@ class zynthian_engine_fluidsynth(zynthian_engine):
     # Initialization
     # ---------------------------------------------------------------------------
 
-    def __init__(self, version_info, zynqtgui=None):
-        super().__init__(version_info, zynqtgui)
+    def __init__(self, version_info, zynqtgui=None, defer_start_wait=False):
+        super().__init__(version_info, zynqtgui, defer_start_wait)
         self.__most_recent_preset_transaction__ = None
 
         self.name = "FluidSynth"
@@ -223,6 +224,12 @@ class zynthian_engine_fluidsynth(zynthian_engine):
         if(isdir(bank[0])):
             return preset_list
 
+        # Read the presets straight from the soundfont (or the preset index), so we don't need to
+        # load the soundfont into fluidsynth just to list its presets
+        preset_list = self.get_soundfont_preset_list(bank)
+        if len(preset_list) > 0:
+            return preset_list
+
         if bank[0] in self.soundfont_index:
             sfi = self.soundfont_index[bank[0]]
         else:
@@ -268,6 +275,20 @@ class zynthian_engine_fluidsynth(zynthian_engine):
         return preset_list
 
 
+    # Get the preset list of a bank from the soundfont file itself, in the same form as listed by fluidsynth
+    @staticmethod
+    def get_soundfont_preset_list(bank):
+        preset_list=[]
+        presets = zynthian_sf2.get_sf2_presets(bank[0])
+        if presets:
+            for midi_bank, prg, name in presets:
+                # Match fluidsynth's "inst" output, which the preset ids have always been made from
+                line = "{:03d}-{:03d} {}".format(midi_bank, prg, name)
+                title=str.replace(line[8:].rstrip(), '_', ' ')
+                preset_list.append([bank[0] + '/' + line.strip(),[midi_bank%128,int(midi_bank/128),prg],title,bank[0]])
+        return preset_list
+
+
     def set_preset(self, layer, preset, preload=False, force_immediate=False):
         if preset[3] in self.soundfont_index:
             sfi = self.soundfont_index[preset[3]]
@@ -425,7 +446,16 @@ class zynthian_engine_fluidsynth(zynthian_engine):
 
     @classmethod
     def zynapi_get_presets(cls, bank):
-        return []
+        presets=[]
+        for p in cls.get_soundfont_preset_list(bank['raw']):
+            presets.append({
+                'text': p[2],
+                'name': p[2],
+                'fullpath': p[0],
+                'raw': p,
+                'readonly': True
+            })
+        return presets
 
 
     @classmethod
@@ -132,8 +132,8 @@ class zynthian_engine_jalv(zynthian_engine):
     # Initialization
     #----------------------------------------------------------------------------
 
-    def __init__(self, version_info, zynqtgui=None, dryrun=False):
-        super().__init__(version_info, zynqtgui)
+    def __init__(self, version_info, zynqtgui=None, dryrun=False, defer_start_wait=False):
+        super().__init__(version_info, zynqtgui, defer_start_wait)
 
         self.type = version_info.plugin_info.type
         self.name = "Jalv/" + version_info.pluginName
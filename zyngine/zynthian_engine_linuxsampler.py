@@ -34,6 +34,7 @@ from subprocess import check_output
 from collections import OrderedDict
 
 from . import zynthian_engine
+from .zynthian_dir_cache import zynthian_dir_cache
 from . import zynthian_controller
 
 #------------------------------------------------------------------------------
@@ -269,11 +270,9 @@ class zynthian_engine_linuxsampler(zynthian_engine):
         preset_dpath=bank[0]
         if os.path.isdir(preset_dpath):
             exclude_sfz = re.compile(r"[MOPRSTV][1-9]?l?\.sfz")
-            cmd="find '"+preset_dpath+"' -maxdepth 3 -type f -name '*.sfz'"
-            output=check_output(cmd, shell=True).decode('utf8')
-            cmd="find '"+preset_dpath+"' -maxdepth 2 -type f -name '*.gig'"
-            output=output+"\n"+check_output(cmd, shell=True).decode('utf8')
-            lines=output.split('\n')
+            dir_cache=zynthian_dir_cache.instance()
+            lines=dir_cache.find_files(preset_dpath, (".sfz",), maxdepth=3)
+            lines+=dir_cache.find_files(preset_dpath, (".gig",), maxdepth=2)
             for f in lines:
                 if f:
                     filehead,filetail=os.path.split(f)
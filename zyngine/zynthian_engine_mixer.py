@@ -24,6 +24,7 @@
 
 import os
 import re
+import math
 import copy
 import shlex
 import logging
@@ -32,6 +33,11 @@ from time import sleep
 from subprocess import check_output
 from collections import OrderedDict
 
+try:
+    import alsaaudio
+except ImportError:
+    alsaaudio = None
+
 from . import zynthian_engine
 from . import zynthian_controller
 from zyncoder import *
@@ -56,6 +62,11 @@ class zynthian_engine_mixer(zynthian_engine):
 
     chan_names = ["Left", "Right"]
 
+    # Values changed within this period after a write are coalesced into the next write (one per mixer element)
+    sender_period = 0.05
+    # Interval for checking for values changed without going through send_controller_value
+    sender_sweep_interval = 1.0
+
     #----------------------------------------------------------------------------
     # ZynAPI variables
     #----------------------------------------------------------------------------
@@ -66,8 +77,8 @@ class zynthian_engine_mixer(zynthian_engine):
     # Initialization
     #----------------------------------------------------------------------------
 
-    def __init__(self, plugin_info, zynqtgui=None):
-        super().__init__(plugin_info, zynqtgui)
+    def __init__(self, plugin_info, zynqtgui=None, defer_start_wait=False):
+        super().__init__(plugin_info, zynqtgui, defer_start_wait)
 
         self.type = "Mixer"
         self.name = "Audio Levels"
@@ -84,6 +95,10 @@ class zynthian_engine_mixer(zynthian_engine):
 
         self.zctrls = None
         self.sender_poll_enabled = False
+        self.sender_event = threading.Event()
+        self.sender_thread = None
+        # alsaaudio.Mixer objects, keyed by (device name, element name)
+        self.alsa_mixers = {}
 
         self.get_soundcard_config()
 
@@ -353,24 +368,120 @@ class zynthian_engine_mixer(zynthian_engine):
 
 
     def send_controller_value(self, zctrl):
-        pass
+        # The actual write happens in the sender thread, so quickly changing values only get written once per period
+        self.sender_event.set()
+
+
+    def get_mixer_device_name(self, zctrl):
+        if zctrl.symbol=="Headphone" and self.allow_headphones() and self.zynqtgui and self.zynqtgui.get_zynthian_config("rbpi_headphones"):
+            return self.rbpi_device_name
+        else:
+            return self.device_name
+
+
+    # Returns the key of the mixer element the given zctrl writes to (several zctrls share
+    # an element when it has more than one channel)
+    def get_mixer_element_key(self, zctrl):
+        if callable(zctrl.graph_path):
+            return zctrl.graph_path
+        return (self.get_mixer_device_name(zctrl), zctrl.graph_path[0])
+
+
+    def get_alsa_mixer(self, device_name, element_name):
+        key = (device_name, element_name)
+        if key not in self.alsa_mixers:
+            try:
+                self.alsa_mixers[key] = alsaaudio.Mixer(control=element_name, device="hw:{}".format(device_name))
+            except Exception as err:
+                logging.warning("Can't open ALSA mixer element '{}' on hw:{}, using amixer for it: {}".format(element_name, device_name, err))
+                self.alsa_mixers[key] = None
+        return self.alsa_mixers[key]
+
+
+    # Sets the volume of a mixer channel (or of all of them, for MIXER_CHANNEL_ALL), using the same mapping from
+    # percentage as amixer -M does (linear in dB for elements with a large range, and linear in raw values for
+    # elements without dB information), so the values match what get_mixer_zctrls reads
+    def set_alsa_mixer_volume(self, mixer, percent, channel, pcmtype):
+        if not hasattr(alsaaudio, "VOLUME_UNITS_DB"):
+            # Without volume units (pyalsaaudio before 0.9) there is no telling the dB range, so leave the element to amixer
+            raise NotImplementedError("pyalsaaudio without volume units can't map volumes like amixer -M")
+        volume = percent / 100.0
+        try:
+            min_db, max_db = mixer.getrange(pcmtype, alsaaudio.VOLUME_UNITS_DB)
+        except:
+            min_db = max_db = None
+        if min_db is None or max_db<=min_db:
+            min_raw, max_raw = mixer.getrange(pcmtype, alsaaudio.VOLUME_UNITS_RAW)
+            mixer.setvolume(round(volume * (max_raw - min_raw)) + min_raw, channel, pcmtype, alsaaudio.VOLUME_UNITS_RAW)
+            return
+        if max_db - min_db <= 2400:
+            value = round(volume * (max_db - min_db)) + min_db
+        else:
+            min_norm = pow(10, (min_db - max_db) / 6000.0)
+            volume = volume * (1 - min_norm) + min_norm
+            value = round(6000.0 * math.log10(volume)) + max_db
+        mixer.setvolume(value, channel, pcmtype, alsaaudio.VOLUME_UNITS_DB)
+
+
+    # Writes the value of the given zctrl to its mixer element in-process, returning False if
+    # that isn't possible (in which case the caller should fall back to using amixer)
+    def _send_controller_value_alsa(self, zctrl):
+        if alsaaudio is None:
+            return False
+        devname = self.get_mixer_device_name(zctrl)
+        mixer = self.get_alsa_mixer(devname, zctrl.graph_path[0])
+        if mixer is None:
+            return False
+        try:
+            if zctrl.labels:
+                if zctrl.graph_path[1]=="VToggle":
+                    self.set_alsa_mixer_volume(mixer, zctrl.value, alsaaudio.MIXER_CHANNEL_ALL, alsaaudio.PCM_PLAYBACK)
+                elif zctrl.graph_path[1]=="Toggle":
+                    switchcap = mixer.switchcap()
+                    if "Playback Mute" in switchcap or "Joined Playback Mute" in switchcap:
+                        mixer.setmute(0 if zctrl.get_value2label()=="on" else 1)
+                    else:
+                        mixer.setrec(1 if zctrl.get_value2label()=="on" else 0)
+                else:
+                    mixer.setenum(zctrl.labels.index(zctrl.get_value2label()))
+            else:
+                pcmtype = alsaaudio.PCM_CAPTURE if zctrl.graph_path[1]=="Capture" else alsaaudio.PCM_PLAYBACK
+                if len(zctrl.graph_path)>2:
+                    nchans = zctrl.graph_path[3]
+                    symbol_prefix = zctrl.symbol[:-1]
+                    for i in range(0, nchans):
+                        symbol_i = symbol_prefix + str(i)
+                        value = self.zctrls[symbol_i].value if symbol_i in self.zctrls else 0
+                        self.set_alsa_mixer_volume(mixer, value, i, pcmtype)
+                else:
+                    self.set_alsa_mixer_volume(mixer, zctrl.value, alsaaudio.MIXER_CHANNEL_ALL, pcmtype)
+                # Unmute, as amixer's "unmute" did (not all elements have a switch)
+                try:
+                    if pcmtype==alsaaudio.PCM_PLAYBACK:
+                        mixer.setmute(0)
+                    else:
+                        mixer.setrec(1)
+                except alsaaudio.ALSAAudioError:
+                    pass
+            return True
+        except Exception as err:
+            logging.warning("Can't set ALSA mixer element '{}' on hw:{} in-process, using amixer for it: {}".format(zctrl.graph_path[0], devname, err))
+            self.alsa_mixers[(devname, zctrl.graph_path[0])] = None
+            return False
 
 
     def _send_controller_value(self, zctrl):
         try:
             if callable(zctrl.graph_path):
                 zctrl.graph_path(zctrl.value)
-            else:
+            elif not self._send_controller_value_alsa(zctrl):
                 if zctrl.labels:
                     if zctrl.graph_path[1]=="VToggle":
                         amixer_command = "amixer -M -c {} set '{}' '{}%'".format(self.device_name, zctrl.graph_path[0], zctrl.value)
                     else:
                         amixer_command = "amixer -M -c {} set '{}' '{}'".format(self.device_name, zctrl.graph_path[0], zctrl.get_value2label())
                 else:
-                    if zctrl.symbol=="Headphone" and self.allow_headphones() and self.zynqtgui and self.zynqtgui.get_zynthian_config("rbpi_headphones"):
-                        devname = self.rbpi_device_name
-                    else:
-                        devname = self.device_name
+                    devname = self.get_mixer_device_name(zctrl)
 
                     values=[]
                     if len(zctrl.graph_path)>2:
@@ -389,7 +500,6 @@ class zynthian_engine_mixer(zynthian_engine):
 
                     logging.debug(amixer_command)
                     check_output(shlex.split(amixer_command))
-                    sleep(0.05)
 
         except Exception as err:
             logging.error(err)
@@ -400,24 +510,39 @@ class zynthian_engine_mixer(zynthian_engine):
         def runInThread():
             sleep(0.1)
             while self.sender_poll_enabled:
-                counter = 0
+                # Wait for send_controller_value to tell us something changed, but every now and then
+                # check anyway, in case a value was changed without going through it
+                self.sender_event.wait(self.sender_sweep_interval)
+                self.sender_event.clear()
+                if not self.sender_poll_enabled:
+                    break
+                # Only write each mixer element once, even if several of its channels changed
+                elements = OrderedDict()
                 if self.zctrls:
-                    for sym, zctrl in self.zctrls.items():
+                    for sym, zctrl in list(self.zctrls.items()):
                         if zctrl.last_value_sent != zctrl.value:
                             zctrl.last_value_sent = zctrl.value
-                            self._send_controller_value(zctrl)
-                            counter += 1
+                            elements[self.get_mixer_element_key(zctrl)] = zctrl
+
+                for zctrl in elements.values():
+                    self._send_controller_value(zctrl)
 
-                if counter==0:
-                    sleep(0.05)
+                if len(elements)>0:
+                    # Let further changes (e.g. from a knob being turned) accumulate before the next write
+                    sleep(self.sender_period)
 
         self.sender_poll_enabled = True
-        thread = threading.Thread(target=runInThread, daemon=True)
-        thread.start()
+        self.sender_event.clear()
+        self.sender_thread = threading.Thread(target=runInThread, daemon=True)
+        self.sender_thread.start()
 
 
     def stop_sender_poll(self):
         self.sender_poll_enabled = False
+        self.sender_event.set()
+        if self.sender_thread is not None and self.sender_thread is not threading.current_thread():
+            self.sender_thread.join()
+        self.sender_thread = None
 
 
     #----------------------------------------------------------------------------
@@ -179,8 +179,8 @@ class zynthian_engine_setbfree(zynthian_engine):
     # Initialization
     #----------------------------------------------------------------------------
 
-    def __init__(self, version_info, zynqtgui=None):
-        super().__init__(version_info, zynqtgui)
+    def __init__(self, version_info, zynqtgui=None, defer_start_wait=False):
+        super().__init__(version_info, zynqtgui, defer_start_wait)
         self.name = "setBfree"
         self.nickname = "BF"
         jackname_count = self.zynqtgui.layer.get_jackname_count('setBfree')
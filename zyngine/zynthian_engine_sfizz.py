@@ -31,6 +31,7 @@ from pathlib import Path
 from subprocess import check_output
 
 from . import zynthian_engine
+from .zynthian_dir_cache import zynthian_dir_cache
 
 #------------------------------------------------------------------------------
 # Sfizz Engine Class
@@ -72,8 +73,8 @@ class zynthian_engine_sfizz(zynthian_engine):
     # Initialization
     # ---------------------------------------------------------------------------
 
-    def __init__(self, version_info, zynqtgui=None):
-        super().__init__(version_info, zynqtgui)
+    def __init__(self, version_info, zynqtgui=None, defer_start_wait=False):
+        super().__init__(version_info, zynqtgui, defer_start_wait)
         self.name = "Sfizz"
         self.nickname = "SF"
         self.jackname = self.get_next_jackname("sfizz")
@@ -140,9 +141,7 @@ class zynthian_engine_sfizz(zynthian_engine):
         preset_dpath = bank[0]
         if os.path.isdir(preset_dpath):
             exclude_sfz = re.compile(r"[MOPRSTV][1-9]?l?\.sfz")
-            cmd = "find '"+preset_dpath+"' -maxdepth 3 -type f -name '*.sfz'"
-            output = check_output(cmd, shell=True).decode('utf8')
-            lines = output.split('\n')
+            lines = zynthian_dir_cache.instance().find_files(preset_dpath, (".sfz",), maxdepth=3)
             for f in lines:
                 if f:
                     filehead,filetail = os.path.split(f)
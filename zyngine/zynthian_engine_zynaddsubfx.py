@@ -32,9 +32,10 @@ try:
 except ImportError:
     import pyliblo3 as liblo
 from time import sleep
-from os.path import isfile, join
+from os.path import join
 from subprocess import check_output
 from . import zynthian_engine
+from .zynthian_dir_cache import zynthian_dir_cache
 
 #------------------------------------------------------------------------------
 # ZynAddSubFX Engine Class
@@ -107,8 +108,8 @@ class zynthian_engine_zynaddsubfx(zynthian_engine):
     # Initialization
     #----------------------------------------------------------------------------
 
-    def __init__(self, version_info, zynqtgui=None):
-        super().__init__(version_info, zynqtgui)
+    def __init__(self, version_info, zynqtgui=None, defer_start_wait=False):
+        super().__init__(version_info, zynqtgui, defer_start_wait)
         self.name = "ZynAddSubFX"
         self.nickname = "ZY"
         self.jackname = self.get_next_jackname("zynaddsubfx").replace("zynaddsubfx-", "zynaddsubfx_")
@@ -149,6 +150,8 @@ class zynthian_engine_zynaddsubfx(zynthian_engine):
         # For startup, we want to look for the "command prompt" and its carriage return and newline, and then once we have that, reset it to just a newline
         self.proc.setCommandPrompt(self.command_prompt + "\r\n")
         self.start()
+        # The startup prompt has to be seen before switching over to the regular one
+        self.wait_for_start()
         self.proc.setCommandPrompt("\n")
         self.osc_init()
         self.reset()
@@ -202,10 +205,10 @@ class zynthian_engine_zynaddsubfx(zynthian_engine):
         preset_dir=bank[0]
         index=0
         logging.info("Getting Preset List for %s" % bank[2])
-        for f in sorted(os.listdir(preset_dir)):
+        for f, is_dir, is_file in zynthian_dir_cache.instance().scandir(preset_dir):
             preset_fpath=join(preset_dir,f)
             ext=f[-3:].lower()
-            if (isfile(preset_fpath) and (ext=='xiz' or ext=='xmz' or ext=='xsz' or ext=='xlz')):
+            if (is_file and (ext=='xiz' or ext=='xmz' or ext=='xsz' or ext=='xlz')):
                 try:
                     index=int(f[0:4])-1
                     title=str.replace(f[5:-4], '_', ' ')
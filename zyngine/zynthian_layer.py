@@ -33,6 +33,8 @@ from pathlib import Path
 from zyncoder import *
 from PySide2.QtCore import QObject, Signal, Property
 
+from .zynthian_preset_catalogue import zynthian_preset_catalogue
+
 class zynthian_layer(QObject):
 
     # ---------------------------------------------------------------------------
@@ -68,9 +70,6 @@ class zynthian_layer(QObject):
         self.preset_info = None
         self.preset_bank_index = None
 
-        self.bank_list_cache = []
-        # Preset list is cached per bank name
-        self.preset_list_cache = {}
 
         self.preload_index = None
         self.preload_name = None
@@ -214,36 +213,25 @@ class zynthian_layer(QObject):
 
 
     def load_bank_list(self, force=False):
-        caching_failed = False
+        try:
+            # Calling self.engine.get_bank_list() causes quite some file reads.
+            # Too much file IO causes jackd thread to be not scheduled which causes XRUNS which in turn causes glitchiness during playback
+            # Instead of reading files every run, use the list from the catalogue, which is shared by all layers of the engine
+            bank_list = zynthian_preset_catalogue.instance().get_bank_list(self.engine, self, force)
 
-        if self.engine.nickname == "BF":
-            # Disable caching for setBfree engine
-            caching_failed = True
-        else:
-            try:
-                # Calling self.engine.get_bank_list() causes quite some file reads.
-                # Too much file IO causes jackd thread to be not scheduled which causes XRUNS which in turn causes glitchiness during playback
-                # Instead of reading files every run, cache the list data.
-                # Since bank data of a synth should not change while the application is running, it should be fairly safe to cache the data
-                if len(self.bank_list_cache) == 0 or force:
-                    self.bank_list_cache = self.engine.get_bank_list(self)
-
-                # Disable FAVS entry in bank list. Favorites are now toggled via a button on qml side
-                # if len(self.engine.get_preset_favs(self)) > 0:
-                #     self.bank_list = [["*FAVS*",0,"Favorites (%d)" % len(self.engine.get_preset_favs(self))]] + self.bank_list_cache.copy()
-                # else:
-                #     self.bank_list = self.bank_list_cache.copy()
-
-                # Explicitly call get_preset_favs to generate preset fav list. Otherwise *BOOM*
-                self.engine.get_preset_favs(self)
-                self.bank_list = self.bank_list_cache.copy()
-                self.bankCountChanged.emit()
-                # logging.debug("BANK LIST => \n%s" % str(self.bank_list))
-            except Exception as e:
-                logging.exception(f"Error generating bank list from cache. Forcing call to engine.get_bank_list : {str(e)}")
-                caching_failed = True
+            # Disable FAVS entry in bank list. Favorites are now toggled via a button on qml side
+            # if len(self.engine.get_preset_favs(self)) > 0:
+            #     self.bank_list = [["*FAVS*",0,"Favorites (%d)" % len(self.engine.get_preset_favs(self))]] + bank_list.copy()
+            # else:
+            #     self.bank_list = bank_list.copy()
 
-        if caching_failed:
+            # Explicitly call get_preset_favs to generate preset fav list. Otherwise *BOOM*
+            self.engine.get_preset_favs(self)
+            self.bank_list = bank_list.copy()
+            self.bankCountChanged.emit()
+            # logging.debug("BANK LIST => \n%s" % str(self.bank_list))
+        except Exception as e:
+            logging.exception(f"Error generating bank list from the catalogue. Forcing call to engine.get_bank_list : {str(e)}")
             # Explicitly call get_preset_favs to generate preset fav list. Otherwise *BOOM*
             self.engine.get_preset_favs(self)
             self.bank_list = self.engine.get_bank_list(self)
@@ -256,9 +244,6 @@ class zynthian_layer(QObject):
         self.bank_info=None
         self.bankChanged.emit()
 
-    def reset_bank_cache(self):
-        self.bank_list_cache = []
-
     def can_navigate(self):
         if self.engine.can_navigate:
             return self.bank_dir != self.engine.get_bank_root_dir()
@@ -392,27 +377,13 @@ class zynthian_layer(QObject):
                 preset_list.append(v[1])
 
         elif self.bank_info:
-            caching_failed = False
-
-            if self.engine.nickname == "BF":
-                # Disable caching for setBfree engine
-                caching_failed = True
-            else:
-                try:
-                    bank_name = self.bank_info[2]
-
-                    # Calling self.engine.get_preset_list() causes quite some file reads.
-                    # Too much file IO causes jackd thread to be not scheduled which causes XRUNS which in turn causes glitchiness during playback
-                    # Instead of reading files every run, cache the list data.
-                    # Since preset data of a synth should not change while the application is running, it should be fairly safe to cache the data
-                    if bank_name not in self.preset_list_cache or force:
-                        self.preset_list_cache[bank_name] = self.engine.get_preset_list(self.bank_info)
-                    preset_list = preset_list + self.preset_list_cache[bank_name].copy()
-                except Exception as e:
-                    logging.exception(f"Error generating preset list from cache. Forcing call to engine.get_preset_list : {str(e)}")
-                    caching_failed = True
-
-            if caching_failed:
+            try:
+                # Calling self.engine.get_preset_list() causes quite some file reads.
+                # Too much file IO causes jackd thread to be not scheduled which causes XRUNS which in turn causes glitchiness during playback
+                # Instead of reading files every run, use the list from the catalogue, which is shared by all layers of the engine
+                preset_list = preset_list + zynthian_preset_catalogue.instance().get_preset_list(self.engine, self.bank_info, force).copy()
+            except Exception as e:
+                logging.exception(f"Error generating preset list from the catalogue. Forcing call to engine.get_preset_list : {str(e)}")
                 preset_list = preset_list + self.engine.get_preset_list(self.bank_info)
         else:
             return
@@ -429,9 +400,6 @@ class zynthian_layer(QObject):
         self.preset_info=None
         self.presetChanged.emit()
 
-    def reset_preset_cache(self):
-        self.preset_list_cache = {}
-
 
     def set_preset(self, i, set_engine=True, force_immediate=False):
         if i < len(self.preset_list):
@@ -750,10 +718,10 @@ class zynthian_layer(QObject):
             self.active_screen_index=snapshot['active_screen_index']
 
 
-    def restore_snapshot_2(self, snapshot):
+    def restore_snapshot_2(self, snapshot, wait_for_preset=True):
 
-        # Wait a little bit if a preset has been loaded 
-        if self.preset_loaded:
+        # Wait a little bit if a preset has been loaded (unless the caller already did so)
+        if self.preset_loaded and wait_for_preset:
             sleep(0.2)
 
         self.wait_stop_loading()
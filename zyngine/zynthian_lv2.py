@@ -34,13 +34,18 @@ import re
 import urllib.parse
 
 from enum import Enum
+from threading import RLock
 from collections import OrderedDict
 
 #------------------------------------------------------------------------------
 
+world = None
+
 def init_lilv():
     global world
 
+    if world is None:
+        world = lilv.World()
     world.load_all()
 
     world.ns.ev = lilv.Namespace(world, "http://lv2plug.in/ns/ext/event#")
@@ -49,6 +54,19 @@ def init_lilv():
     world.ns.portgroups = lilv.Namespace(world, "http://lv2plug.in/ns/ext/port-groups#")
 
 
+# The lilv world is expensive to load (it parses every installed bundle), so only do that
+# when something actually needs it (that is, when the on-disk caches are missing or stale)
+def get_world():
+    global world
+
+    if world is None:
+        start = int(round(time.time() * 1000))
+        init_lilv()
+        end = int(round(time.time() * 1000))
+        logging.info('Loading the lilv world took {}ms'.format(end-start))
+    return world
+
+
 #------------------------------------------------------------------------------
 # LV2 Plugin management
 #------------------------------------------------------------------------------
@@ -143,7 +161,7 @@ def generate_plugins_config_file(refresh=True):
         if refresh:
             init_lilv()
 
-        for plugin in world.get_all_plugins():
+        for plugin in get_world().get_all_plugins():
             name = str(plugin.get_name())
             logging.info("Plugin '{}'".format(name))
             if name in custom_plugin_class:
@@ -220,7 +238,7 @@ def convert_from_all_plugins():
 
 
 def get_plugin_type(plugin):
-    global world
+    world = get_world()
     lv2_plugin_classes = {
         "MIDI_SYNTH" : ("Instrument"),
 
@@ -284,28 +302,24 @@ def get_plugin_type(plugin):
 #------------------------------------------------------------------------------
 
 def generate_all_presets_cache(refresh=True):
-    global world
-
     if refresh:
         init_lilv()
 
-    plugins = world.get_all_plugins()
+    plugins = get_world().get_all_plugins()
     for plugin in plugins:
         _generate_plugin_presets_cache(plugin)
 
 
 def generate_plugin_presets_cache(plugin_url, refresh=True):
-    global world
-
     if refresh:
         init_lilv()
 
-    plugins = world.get_all_plugins()
+    plugins = get_world().get_all_plugins()
     return _generate_plugin_presets_cache(plugins[plugin_url])
 
 
 def _generate_plugin_presets_cache(plugin):
-    global world
+    world = get_world()
 
     plugin_name = str(plugin.get_name())
     plugin_url = str(plugin.get_uri())
@@ -383,14 +397,18 @@ def _generate_plugin_presets_cache(plugin):
 
 
 def get_plugin_presets(plugin_name):
+    global plugins
     fpath_cache = "{}/jalv/presets_{}.json".format(os.environ.get('ZYNTHIAN_CONFIG_DIR'), sanitize_fname(plugin_name))
     try:
+        # Treat the cache as missing if the plugin's bundle changed after the cache was written
+        bundle_mtime = get_bundle_mtime(plugins[plugin_name]['BUNDLE_URI']) if plugin_name in plugins else None
+        if bundle_mtime is not None and bundle_mtime > os.stat(fpath_cache).st_mtime:
+            raise Exception("Presets cache is older than the plugin bundle")
         with open(fpath_cache) as f:
             presets_info = json.load(f, object_pairs_hook=OrderedDict)
     except Exception as e:
         logging.error("Can't load presets cache file '{}': {}".format(fpath_cache, e))
         try:
-            global plugins
             return generate_plugin_presets_cache(plugins[plugin_name]['URL'])
         except Exception as e:
             logging.error("Error generating presets cache for '{}': {}".format(plugin_name, e))
@@ -417,14 +435,113 @@ def sanitize_fname(s):
 
 
 #------------------------------------------------------------------------------
-# LV2 Port management
+# LV2 Plugin index
+#
+# An on-disk index of the control ports (including scale points) of each plugin,
+# which allows creating jalv engines without loading the lilv world at all. Each
+# entry is keyed by the plugin's URI, and is considered valid for as long as the
+# modification time of the plugin's bundle is unchanged.
 #------------------------------------------------------------------------------
 
-def get_plugin_ports(plugin_url):
-    global world
+LV2_INDEX_FILE = "{}/jalv/lv2_index.json".format(os.environ.get('ZYNTHIAN_CONFIG_DIR'))
+# Bump this whenever the format of the index entries changes, to force a regeneration
+LV2_INDEX_VERSION = 1
+
+lv2_index = None
+lv2_index_lock = RLock()
+
+
+def get_bundle_mtime(bundle_uri):
+    try:
+        bundle_path = urllib.parse.unquote(bundle_uri[7:])
+        # Bundles are usually replaced wholesale, but take the ttl files into account
+        # as well, to catch plugins which were updated in place
+        mtime = os.stat(bundle_path).st_mtime
+        with os.scandir(bundle_path) as entries:
+            for entry in entries:
+                if entry.name.endswith(".ttl"):
+                    mtime = max(mtime, entry.stat().st_mtime)
+        return mtime
+    except Exception as e:
+        logging.debug("Unable to get modification time for bundle <{}>: {}".format(bundle_uri, e))
+        return None
+
+
+def get_lv2_index():
+    global lv2_index
+
+    with lv2_index_lock:
+        if lv2_index is None:
+            lv2_index = load_lv2_index()
+        return lv2_index
+
+
+def load_lv2_index():
+    try:
+        with open(LV2_INDEX_FILE) as f:
+            index = json.load(f)
+        if index.get('version') == LV2_INDEX_VERSION:
+            return index
+        logging.info("LV2 index has version {}, expected {}. Regenerating.".format(index.get('version'), LV2_INDEX_VERSION))
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.warning("Loading LV2 index failed: {}".format(e))
+
+    return {
+        'version': LV2_INDEX_VERSION,
+        'plugins': {}
+    }
+
+
+def save_lv2_index():
+    with lv2_index_lock:
+        try:
+            # Write to a temporary file first, so a crash while writing doesn't leave a broken index behind
+            tmp_file = LV2_INDEX_FILE + ".tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(get_lv2_index(), f)
+            os.replace(tmp_file, LV2_INDEX_FILE)
+        except Exception as e:
+            logging.error("Saving LV2 index failed: {}".format(e))
+
+
+def _update_lv2_index_entry(plugin, ports_info):
+    bundle_uri = str(plugin.get_bundle_uri())
+    get_lv2_index()['plugins'][str(plugin.get_uri())] = {
+        'bundle_uri': bundle_uri,
+        'bundle_mtime': get_bundle_mtime(bundle_uri),
+        'ports': list(ports_info.values())
+    }
+
+
+def generate_lv2_index(refresh=True):
+    global lv2_index
+
+    if refresh:
+        init_lilv()
+
+    start = int(round(time.time() * 1000))
+    with lv2_index_lock:
+        lv2_index = {
+            'version': LV2_INDEX_VERSION,
+            'plugins': {}
+        }
+        for plugin in get_world().get_all_plugins():
+            try:
+                _update_lv2_index_entry(plugin, _get_plugin_ports_from_lilv(plugin))
+            except Exception as e:
+                logging.error("Failed to index plugin <{}>: {}".format(plugin.get_uri(), e))
+        save_lv2_index()
+    end = int(round(time.time() * 1000))
+    logging.info('LV2 index generation took {}ms'.format(end-start))
+
+#------------------------------------------------------------------------------
+# LV2 Port management
+#------------------------------------------------------------------------------
 
-    plugins = world.get_all_plugins()
-    plugin = plugins[plugin_url]
+def _get_plugin_ports_from_lilv(plugin):
+    world = get_world()
 
     ports_info = OrderedDict()
     for i in range(plugin.get_num_ports()):
@@ -504,6 +621,23 @@ def get_plugin_ports(plugin_url):
     return ports_info
 
 
+# Returns the control input ports of the given plugin, served from the on-disk index when
+# that is up to date with the plugin's bundle, and otherwise asking lilv (and updating the index)
+def get_plugin_ports(plugin_url):
+    with lv2_index_lock:
+        index = get_lv2_index()
+        entry = index['plugins'].get(plugin_url)
+        if entry is not None and entry['bundle_mtime'] is not None and entry['bundle_mtime'] == get_bundle_mtime(entry['bundle_uri']):
+            return OrderedDict((info['index'], info) for info in entry['ports'])
+
+        logging.info("LV2 index is stale for <{}>, querying lilv".format(plugin_url))
+        plugin = get_world().get_all_plugins()[plugin_url]
+        ports_info = _get_plugin_ports_from_lilv(plugin)
+        _update_lv2_index_entry(plugin, ports_info)
+        save_lv2_index()
+        return ports_info
+
+
 def get_node_value(node):
     if node.is_int():
         return int(node)
@@ -514,8 +648,6 @@ def get_node_value(node):
 
 #------------------------------------------------------------------------------
 
-world = lilv.World()
-init_lilv()
 load_plugins()
 
 if __name__ == '__main__':
@@ -525,8 +657,10 @@ if __name__ == '__main__':
     logging.basicConfig(format='%(levelname)s:%(module)s: %(message)s', stream=sys.stderr, level=log_level)
     logging.getLogger().setLevel(level=log_level)
 
+    init_lilv()
     generate_plugins_config_file(False)
     generate_all_presets_cache(False)
+    generate_lv2_index(False)
 
     #get_plugin_ports("https://github.com/dcoredump/dexed.lv2")
     #get_plugin_ports("http://code.google.com/p/amsynth/amsynth")
@@ -208,9 +208,11 @@ class MidiFilterRule:
             self.set_rules()
 
 
-    def set_rules(self, set_rules=True):
-        n_rules=0
+    # Iterate over the events affected by the rule, as (event type, channel, event number, action) tuples,
+    # where action is one of the MidiFilterTable actions
+    def iter_events(self):
         if self.rule_type in ("IGNORE", "CLEAN"):
+            action = MidiFilterTable.IGNORE if self.rule_type=="IGNORE" else MidiFilterTable.CLEAN
             if self.args[0].ev_type:
                 ev_types = [MidiFilterArgs.EVENT_TYPE_CODES[self.args[0].ev_type]]
             else:
@@ -227,13 +229,7 @@ class MidiFilterRule:
                         ev_list = self.args[0].ev_list
 
                     for ev_num in ev_list:
-                        n_rules += 1
-                        logging.debug("%s CH#%s %s#%s" % (self.rule_type,ch,ev_type,ev_num))
-                        if set_rules:
-                            if self.rule_type=="IGNORE":
-                                zyncoder.lib_zyncoder.set_midi_filter_event_ignore(ev_type, ch, ev_num)
-                            elif self.rule_type=="CLEAN":
-                                zyncoder.lib_zyncoder.del_midi_filter_event_map(ev_type, ch, ev_num)
+                        yield (ev_type, ch, ev_num, action)
 
         elif self.rule_type=="MAP":
             if self.args[0].ev_type and self.args[1].ev_type:
@@ -261,10 +257,25 @@ class MidiFilterRule:
                         ev2_list = self.args[1].ev_list
 
                     for ev1_num,ev2_num in zip(ev1_list,ev2_list):
-                        n_rules += 1
-                        logging.debug("MAP CH#%s %s#%s => CH#%s %s#%s" % (ch1,ev1_type,ev1_num,ch2,ev2_type,ev2_num))
-                        if set_rules:
-                            zyncoder.lib_zyncoder.set_midi_filter_event_map(ev1_type, ch1, ev1_num, ev2_type, ch2, ev2_num)
+                        yield (ev1_type, ch1, ev1_num, (MidiFilterTable.MAP, ev2_type, ch2, ev2_num))
+
+
+    def set_rules(self, set_rules=True):
+        n_rules=0
+        for ev_type, ch, ev_num, action in self.iter_events():
+            n_rules += 1
+            if action is MidiFilterTable.IGNORE:
+                logging.debug("IGNORE CH#%s %s#%s" % (ch,ev_type,ev_num))
+                if set_rules:
+                    zyncoder.lib_zyncoder.set_midi_filter_event_ignore(ev_type, ch, ev_num)
+            elif action is MidiFilterTable.CLEAN:
+                logging.debug("CLEAN CH#%s %s#%s" % (ch,ev_type,ev_num))
+                if set_rules:
+                    zyncoder.lib_zyncoder.del_midi_filter_event_map(ev_type, ch, ev_num)
+            else:
+                logging.debug("MAP CH#%s %s#%s => CH#%s %s#%s" % (ch,ev_type,ev_num,action[2],action[1],action[3]))
+                if set_rules:
+                    zyncoder.lib_zyncoder.set_midi_filter_event_map(ev_type, ch, ev_num, action[1], action[2], action[3])
 
         return n_rules
 
@@ -295,15 +306,107 @@ class MidiFilterRule:
         return n_rules
 
 
+class MidiFilterTable:
+    """
+    The compiled form of a MidiFilterScript: the action the script results in for each
+    (event type, channel, event number) it touches, with later rules overriding earlier
+    ones, as lib_zyncoder's event map does. A table can be applied on top of the one
+    applied before it, in which case only the events whose action changed are sent to
+    lib_zyncoder, and events no longer touched by the script get their map removed.
+    """
+
+    IGNORE = "IGNORE"
+    CLEAN = "CLEAN"
+    MAP = "MAP"
+
+    def __init__(self, rules=()):
+        self.entries={}
+        for rule in rules:
+            self.add_rule(rule)
+
+
+    def add_rule(self, rule):
+        entries = self.entries
+        n_rules = 0
+        for ev_type, ch, ev_num, action in rule.iter_events():
+            entries[(ev_type, ch, ev_num)] = action
+            n_rules += 1
+        return n_rules
+
+
+    # The table as compact ranges, as (event type, channel, first event number, last event number, action, step)
+    # tuples. For MAP ranges, action is that of the first event, and step is how much the target event number
+    # increases for each event in the range (1 for ranges mapped to ranges, 0 for ranges mapped to one event)
+    def ranges(self):
+        run = None
+        for (ev_type, ch, ev_num), action in sorted(self.entries.items(), key=lambda entry: entry[0]):
+            if run is not None and run[0]==ev_type and run[1]==ch and run[3]+1==ev_num:
+                first_action = run[4]
+                if not isinstance(action, tuple):
+                    if action==first_action:
+                        run[3] = ev_num
+                        continue
+                elif isinstance(first_action, tuple) and action[:3]==first_action[:3]:
+                    offset = ev_num - run[2]
+                    if run[5] is None and action[3] - first_action[3] in (0, 1):
+                        run[5] = action[3] - first_action[3]
+                    if run[5] is not None and action[3]==first_action[3] + offset * run[5]:
+                        run[3] = ev_num
+                        continue
+            if run is not None:
+                yield tuple(run)
+            run = [ev_type, ch, ev_num, ev_num, action, None]
+        if run is not None:
+            yield tuple(run)
+
+
+    # Send the table to lib_zyncoder. If given the table which was applied before this one, only the differences are sent.
+    # Returns the number of lib_zyncoder calls made.
+    def apply(self, previous=None):
+        set_ignore = zyncoder.lib_zyncoder.set_midi_filter_event_ignore
+        set_map = zyncoder.lib_zyncoder.set_midi_filter_event_map
+        del_map = zyncoder.lib_zyncoder.del_midi_filter_event_map
+        previous_entries = previous.entries if previous is not None else {}
+        n_calls = 0
+
+        # Remove the maps of events the previous table touched, and this one doesn't
+        for key in previous_entries.keys() - self.entries.keys():
+            if previous_entries[key] is not MidiFilterTable.CLEAN:
+                del_map(*key)
+                n_calls += 1
+
+        for key, action in self.entries.items():
+            if previous is not None and previous_entries.get(key)==action:
+                continue
+            if action is MidiFilterTable.IGNORE:
+                set_ignore(*key)
+            elif action is MidiFilterTable.CLEAN:
+                del_map(*key)
+            else:
+                set_map(key[0], key[1], key[2], action[1], action[2], action[3])
+            n_calls += 1
+        return n_calls
+
+
+    # Remove the maps of all events set by the table
+    def remove(self):
+        return MidiFilterTable().apply(self)
+
+
+    def __len__(self):
+        return len(self.entries)
+
+
 class MidiFilterScript:
 
     def __init__(self, script=None, set_rules=True):
         self.rules={}
+        self.table=MidiFilterTable()
         if script:
             self.parse_script(script, set_rules)
 
 
-    def parse_script(self, script, set_rules=True):
+    def parse_script(self, script, set_rules=True, previous=None):
         self.rules={}
         if isinstance(script,str):
             script=script.split("\n")
@@ -316,15 +419,24 @@ class MidiFilterScript:
                 if rule[0:2]=='//':
                     continue
                 if len(rule)>8:
-                    self.rules[rule]=MidiFilterRule(rule, set_rules)
+                    self.rules[rule]=MidiFilterRule(rule, False)
                 else:
                     raise MidiFilterException("Script Rule is too short to be valid")
 
+        self.table=MidiFilterTable(self.rules.values())
+        if set_rules:
+            n_calls = self.table.apply(previous)
+            logging.debug("Applied MIDI filter script: {} rules, {} events in {} ranges, {} changes sent".format(len(self.rules), len(self.table), sum(1 for _ in self.table.ranges()), n_calls))
+
+
+    # Replace the script with another one, only sending the differences between the two to lib_zyncoder
+    def update(self, script):
+        self.parse_script(script, True, self.table)
+
 
     #Selectively remove only the rules set by the script
     def clean(self):
-        for rule in self.rules:
-            self.rules[rule].del_rules()
+        self.table.remove()
 
 
     def clean_all(self):
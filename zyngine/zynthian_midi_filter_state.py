@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+#******************************************************************************
+# ZYNTHIAN PROJECT: Zynthian Engine (zynthian_midi_filter_state)
+#
+# Python side mirror of the MIDI filter clone and note range state held by
+# lib_zyncoder, so it can be read without going through the library
+#
+# Copyright (C) 2026 Zynthbox contributors
+#
+#******************************************************************************
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of
+# the License, or any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For a full copy of the GNU General Public License see the LICENSE.txt file.
+#
+#******************************************************************************
+
+import logging
+from functools import wraps
+from threading import RLock
+from time import monotonic
+
+#------------------------------------------------------------------------------
+# MIDI Filter State Mirror Class
+#
+# The setters of lib_zyncoder are wrapped, so any change to the clone or note
+# range state (no matter which module makes it) also refreshes the affected
+# entries of the mirror, by reading them back from the library. That keeps
+# the mirror exactly as the library has it (including what the resets set
+# things to), while reading the whole state only costs a copy. As a safety
+# net, verify() compares the mirror against the library and corrects it, and
+# is run by the users of the mirror every verify_interval seconds.
+#------------------------------------------------------------------------------
+
+class zynthian_midi_filter_state:
+
+    verify_interval = 60.0
+
+    # Setters of lib_zyncoder, and a function returning which entries each one affects, from its arguments
+    clone_setters = {
+        "set_midi_filter_clone": lambda i, j, *args: [(i, j)],
+        "set_midi_filter_clone_cc": lambda i, j, *args: [(i, j)],
+        "reset_midi_filter_clone_cc": lambda i, j, *args: [(i, j)],
+        "reset_midi_filter_clone": lambda i, *args: [(i, j) for j in range(16)],
+    }
+    note_range_setters = {
+        "set_midi_filter_note_range": lambda i, *args: [i],
+        "set_midi_filter_note_low": lambda i, *args: [i],
+        "set_midi_filter_note_high": lambda i, *args: [i],
+        "set_midi_filter_octave_trans": lambda i, *args: [i],
+        "set_midi_filter_halftone_trans": lambda i, *args: [i],
+        "reset_midi_filter_note_range": lambda i, *args: [i],
+    }
+
+    __instance = None
+
+    def __init__(self):
+        self.lib = None
+        self.lock = RLock()
+        self.clone = [[None] * 16 for _ in range(16)]
+        self.note_range = [None] * 16
+        self.last_verify = None
+
+    @staticmethod
+    def instance():
+        if zynthian_midi_filter_state.__instance is None:
+            zynthian_midi_filter_state.__instance = zynthian_midi_filter_state()
+        return zynthian_midi_filter_state.__instance
+
+    # Start mirroring the given lib_zyncoder instance, wrapping its setters
+    def install(self, lib):
+        if lib is None or self.lib is lib:
+            return
+        with self.lock:
+            self.lib = lib
+            for name, affected in self.clone_setters.items():
+                self.wrap_setter(name, affected, self.read_clone)
+            for name, affected in self.note_range_setters.items():
+                self.wrap_setter(name, affected, self.read_note_range)
+            self.refresh()
+
+    def is_installed(self):
+        return self.lib is not None
+
+    def wrap_setter(self, name, affected, read):
+        try:
+            setter = getattr(self.lib, name)
+        except AttributeError:
+            logging.warning(f"lib_zyncoder has no {name}, changes made through it will only be picked up on verification")
+            return
+
+        @wraps(setter)
+        def wrapper(*args):
+            with self.lock:
+                result = setter(*args)
+                try:
+                    for entry in affected(*args):
+                        read(entry)
+                except Exception as e:
+                    logging.error(f"Failed to update the MIDI filter state after {name}{args}: {e}")
+                return result
+        setattr(self.lib, name, wrapper)
+
+    def read_clone(self, entry):
+        i, j = entry
+        self.clone[i][j] = {
+            'enabled': self.lib.get_midi_filter_clone(i, j),
+            'cc': list(map(int, self.lib.get_midi_filter_clone_cc(i, j).nonzero()[0]))
+        }
+
+    def read_note_range(self, i):
+        self.note_range[i] = {
+            'note_low': self.lib.get_midi_filter_note_low(i),
+            'note_high': self.lib.get_midi_filter_note_high(i),
+            'octave_trans': self.lib.get_midi_filter_octave_trans(i),
+            'halftone_trans': self.lib.get_midi_filter_halftone_trans(i)
+        }
+
+    # Re-read the whole state from the library
+    def refresh(self):
+        with self.lock:
+            for i in range(0, 16):
+                for j in range(0, 16):
+                    self.read_clone((i, j))
+                self.read_note_range(i)
+            self.last_verify = monotonic()
+
+    # Compare the mirror with the library, correcting (and logging) any difference, and return whether they matched
+    def verify(self):
+        with self.lock:
+            clone = [list(row) for row in self.clone]
+            note_range = list(self.note_range)
+            self.refresh()
+            mismatches = [f"clone {i}->{j}" for i in range(16) for j in range(16) if clone[i][j] != self.clone[i][j]]
+            mismatches += [f"note range {i}" for i in range(16) if note_range[i] != self.note_range[i]]
+        if len(mismatches) > 0:
+            logging.warning(f"MIDI filter state mirror was out of sync with lib_zyncoder, corrected: {', '.join(mismatches)}")
+        return len(mismatches) == 0
+
+    def verify_if_due(self):
+        if self.last_verify is None or monotonic() - self.last_verify >= self.verify_interval:
+            self.verify()
+
+    def get_clone(self, i, j):
+        return self.clone[i][j]['enabled']
+
+    # The clone state of all channel pairs, as a 16x16 list of {'enabled', 'cc'} dictionaries
+    def get_clone_snapshot(self):
+        with self.lock:
+            return [[{'enabled': info['enabled'], 'cc': list(info['cc'])} for info in row] for row in self.clone]
+
+    # The note range state of all channels, as a list of 16 {'note_low', 'note_high', 'octave_trans', 'halftone_trans'} dictionaries
+    def get_note_range_snapshot(self):
+        with self.lock:
+            return [dict(info) for info in self.note_range]
+
+#------------------------------------------------------------------------------
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+#******************************************************************************
+# ZYNTHIAN PROJECT: Zynthian Engine (zynthian_preset_catalogue)
+#
+# Bank and preset lists of the engines, shared by all layers and kept across
+# restarts
+#
+# Copyright (C) 2026 Zynthbox contributors
+#
+#******************************************************************************
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of
+# the License, or any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For a full copy of the GNU General Public License see the LICENSE.txt file.
+#
+#******************************************************************************
+
+import os
+import json
+import logging
+import threading
+
+from .zynthian_dir_cache import zynthian_dir_cache
+
+#------------------------------------------------------------------------------
+# Preset Catalogue Class
+#
+# Getting the bank and preset lists of an engine means reading a lot of
+# directories and files. The catalogue keeps those lists once for each engine
+# (by nickname), so all layers running the same engine share them, and any
+# layer can fill its lists without becoming the current layer.
+#
+# A list is used for as long as what it was made from is unchanged: the
+# directory listings it was made from (going by the directory listing cache),
+# the bank file a preset list was read from (going by its modification time),
+# and the engine's version. Lists which were made from files are also saved,
+# along with the modification times of those directories and files, so they
+# can be used after a restart without reading everything again. Lists which
+# weren't made from files come from the running engine itself, so those are
+# only used for the engine instance which made them.
+#------------------------------------------------------------------------------
+
+class zynthian_preset_catalogue:
+
+    __instance = None
+
+    catalogue_fpath = "{}/preset_catalogue.json".format(os.environ.get('ZYNTHIAN_CONFIG_DIR', "/zynthian/config"))
+    # Bump this when the format of the saved catalogue changes
+    catalogue_version = 1
+    # Time in seconds to wait after a change before saving the catalogue
+    save_delay = 5
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        # Catalogue of each engine by nickname, as {'version', 'banks', 'presets'}, where banks is an
+        # entry and presets are entries by bank. Each entry is {'list', 'dirs', 'dir_mtimes', 'files', 'engine'}
+        self.engines = {}
+        self.save_timer = None
+        self.load()
+
+    @staticmethod
+    def instance():
+        if zynthian_preset_catalogue.__instance is None:
+            zynthian_preset_catalogue.__instance = zynthian_preset_catalogue()
+        return zynthian_preset_catalogue.__instance
+
+    @staticmethod
+    def get_engine_version(engine):
+        if engine.version_info is not None and getattr(engine.version_info, 'version', None):
+            return str(engine.version_info.version)
+        return ""
+
+    @staticmethod
+    def get_bank_key(bank_info):
+        return "{}\n{}".format(bank_info[0], bank_info[2])
+
+    def get_engine_catalogue(self, engine):
+        version = zynthian_preset_catalogue.get_engine_version(engine)
+        catalogue = self.engines.get(engine.nickname)
+        if catalogue is None or catalogue['version'] != version:
+            # Nothing listed for an older version of the engine is of use
+            catalogue = {'version': version, 'banks': None, 'presets': {}}
+            self.engines[engine.nickname] = catalogue
+        return catalogue
+
+    def is_current(self, entry, engine):
+        if entry is None:
+            return False
+        if len(entry['files']) == 0 and entry['dirs'] is not None and len(entry['dirs']) == 0:
+            return entry['engine'] is engine
+        dir_cache = zynthian_dir_cache.instance()
+        for path, mtime in entry['files'].items():
+            if dir_cache.get_mtime(path) != mtime:
+                return False
+        if entry['dirs'] is None:
+            # Loaded from the saved catalogue, so check against the modification times it was saved with
+            with dir_cache.track() as listed_dirs:
+                for path, mtime in entry['dir_mtimes'].items():
+                    if dir_cache.get_listing_mtime(path) != mtime:
+                        return False
+            entry['dirs'] = listed_dirs
+            return True
+        return dir_cache.is_current(entry['dirs'])
+
+    def make_entry(self, engine, make_list, files=()):
+        dir_cache = zynthian_dir_cache.instance()
+        # Stat before listing, so changes made while listing aren't missed
+        file_mtimes = {path: dir_cache.get_mtime(path) for path in files}
+        with dir_cache.track() as listed_dirs:
+            data = make_list()
+        return {'list': data, 'dirs': listed_dirs, 'dir_mtimes': None, 'files': file_mtimes, 'engine': engine}
+
+    # Returns the bank list of the given engine (for the given layer), from the catalogue if it's still current
+    def get_bank_list(self, engine, layer, force=False):
+        with self.lock:
+            entry = self.get_engine_catalogue(engine)['banks']
+            if not force and self.is_current(entry, engine) and len(entry['list']) > 0:
+                return entry['list']
+        entry = self.make_entry(engine, lambda: engine.get_bank_list(layer))
+        if entry['list'] is not None:
+            with self.lock:
+                self.get_engine_catalogue(engine)['banks'] = entry
+            self.schedule_save()
+        return entry['list']
+
+    # Returns the preset list of the given bank of the given engine, from the catalogue if it's still current
+    def get_preset_list(self, engine, bank_info, force=False):
+        bank_key = zynthian_preset_catalogue.get_bank_key(bank_info)
+        with self.lock:
+            entry = self.get_engine_catalogue(engine)['presets'].get(bank_key)
+            if not force and self.is_current(entry, engine):
+                return entry['list']
+        files = [bank_info[0]] if isinstance(bank_info[0], str) and os.path.isfile(bank_info[0]) else []
+        entry = self.make_entry(engine, lambda: engine.get_preset_list(bank_info), files)
+        if entry['list'] is not None:
+            with self.lock:
+                self.get_engine_catalogue(engine)['presets'][bank_key] = entry
+            self.schedule_save()
+        return entry['list']
+
+    #----------------------------------------------------------------------------
+    # Persistence
+    #----------------------------------------------------------------------------
+
+    def load(self):
+        try:
+            with open(self.catalogue_fpath) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logging.warning(f"Loading the preset catalogue failed: {e}")
+            return
+        if data.get('version') != self.catalogue_version:
+            return
+
+        def load_entry(saved):
+            if saved is None:
+                return None
+            return {'list': saved['list'], 'dirs': None, 'dir_mtimes': saved['dirs'], 'files': saved['files'], 'engine': None}
+
+        try:
+            for nickname, saved in data['engines'].items():
+                self.engines[nickname] = {
+                    'version': saved['version'],
+                    'banks': load_entry(saved['banks']),
+                    'presets': {bank_key: load_entry(entry) for bank_key, entry in saved['presets'].items()}
+                }
+        except Exception as e:
+            logging.warning(f"The preset catalogue is damaged, starting over: {e}")
+            self.engines = {}
+
+    def save_entry(self, entry):
+        if entry is None or entry['engine'] is None and entry['dirs'] is None:
+            # Loaded from the saved catalogue, and not used since, so save it as it was
+            return None if entry is None else {'list': entry['list'], 'dirs': entry['dir_mtimes'], 'files': entry['files']}
+        if len(entry['files']) == 0 and len(entry['dirs']) == 0:
+            # Not made from files, so only of use while the engine which made it runs
+            return None
+        dir_cache = zynthian_dir_cache.instance()
+        if not dir_cache.is_current(entry['dirs']):
+            return None
+        saved = {
+            'list': entry['list'],
+            'dirs': {path: dir_cache.get_listing_mtime(path) for path in entry['dirs']},
+            'files': entry['files']
+        }
+        try:
+            json.dumps(saved['list'])
+        except (TypeError, ValueError):
+            return None
+        return saved
+
+    def save(self):
+        with self.lock:
+            self.save_timer = None
+            engines = {}
+            for nickname, catalogue in self.engines.items():
+                presets = {}
+                for bank_key, entry in catalogue['presets'].items():
+                    saved = self.save_entry(entry)
+                    if saved is not None:
+                        presets[bank_key] = saved
+                engines[nickname] = {
+                    'version': catalogue['version'],
+                    'banks': self.save_entry(catalogue['banks']),
+                    'presets': presets
+                }
+        try:
+            os.makedirs(os.path.dirname(self.catalogue_fpath), exist_ok=True)
+            tmp_fpath = self.catalogue_fpath + ".tmp"
+            with open(tmp_fpath, "w") as f:
+                json.dump({'version': self.catalogue_version, 'engines': engines}, f)
+            os.replace(tmp_fpath, self.catalogue_fpath)
+        except Exception as e:
+            logging.error(f"Saving the preset catalogue failed: {e}")
+
+    # Save the catalogue a little while after it changes, so listing a lot of banks doesn't save it for each one
+    def schedule_save(self):
+        with self.lock:
+            if self.save_timer is None:
+                self.save_timer = threading.Timer(self.save_delay, self.save)
+                self.save_timer.daemon = True
+                self.save_timer.start()
+
+    # Save any pending changes right away
+    def flush(self):
+        with self.lock:
+            pending = self.save_timer is not None
+            if pending:
+                self.save_timer.cancel()
+        if pending:
+            self.save()
+
+#------------------------------------------------------------------------------
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+#******************************************************************************
+# ZYNTHIAN PROJECT: Zynthian Engine (zynthian_sf2)
+#
+# SoundFont preset reading & on-disk preset index
+#
+# Copyright (C) 2026 Zynthbox contributors
+#
+#******************************************************************************
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of
+# the License, or any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For a full copy of the GNU General Public License see the LICENSE.txt file.
+#
+#******************************************************************************
+
+import os
+import json
+import struct
+import logging
+from threading import RLock
+
+#------------------------------------------------------------------------------
+# SoundFont reading
+#
+# SF2 (and SF3, which only differs in how the samples are stored) files are
+# RIFF files, of which the preset headers live in the phdr chunk inside the
+# pdta list. The sample data (by far the largest part of the file) is skipped
+# over, so reading the presets only needs a handful of small reads.
+#------------------------------------------------------------------------------
+
+PHDR_RECORD = struct.Struct("<20sHHHIII")
+
+
+class SF2Exception(Exception):
+    pass
+
+
+def _read_chunk_header(f):
+    header = f.read(8)
+    if len(header) < 8:
+        return None, 0
+    chunk_id, size = struct.unpack("<4sI", header)
+    return chunk_id, size
+
+
+# Returns the presets of the soundfont at the given path, as a list of (bank, program, name)
+# tuples, sorted by bank and program (as fluidsynth lists them)
+def read_sf2_presets(path):
+    with open(path, "rb") as f:
+        chunk_id, riff_size = _read_chunk_header(f)
+        if chunk_id != b"RIFF" or f.read(4) != b"sfbk":
+            raise SF2Exception("Not a SoundFont file: {}".format(path))
+        riff_end = 8 + riff_size
+
+        while f.tell() < riff_end:
+            chunk_id, size = _read_chunk_header(f)
+            if chunk_id is None:
+                break
+            chunk_end = f.tell() + size + (size & 1)
+            if chunk_id == b"LIST" and f.read(4) == b"pdta":
+                while f.tell() < chunk_end:
+                    sub_id, sub_size = _read_chunk_header(f)
+                    if sub_id is None:
+                        break
+                    if sub_id == b"phdr":
+                        return _parse_phdr(f.read(sub_size))
+                    f.seek(sub_size + (sub_size & 1), os.SEEK_CUR)
+            f.seek(chunk_end)
+
+    raise SF2Exception("No preset headers found in {}".format(path))
+
+
+def _parse_phdr(data):
+    presets = []
+    # The last record is the terminal EOP record, and not a preset
+    for index in range(len(data) // PHDR_RECORD.size - 1):
+        name, program, bank, _, _, _, _ = PHDR_RECORD.unpack_from(data, index * PHDR_RECORD.size)
+        name = name.split(b"\0", 1)[0].decode("latin-1")
+        presets.append((bank, program, name))
+    presets.sort(key=lambda preset: (preset[0], preset[1]))
+    return presets
+
+#------------------------------------------------------------------------------
+# SoundFont preset index
+#
+# An on-disk index of the presets in each soundfont, keyed by path, and valid for
+# as long as the soundfont's modification time and size are unchanged.
+#------------------------------------------------------------------------------
+
+SF2_INDEX_FILE = "{}/fluidsynth/sf2_index.json".format(os.environ.get('ZYNTHIAN_CONFIG_DIR', "/zynthian/config"))
+# Bump this whenever the format of the index entries changes, to force a regeneration
+SF2_INDEX_VERSION = 1
+
+sf2_index = None
+sf2_index_lock = RLock()
+
+
+def get_sf2_index():
+    global sf2_index
+
+    with sf2_index_lock:
+        if sf2_index is None:
+            sf2_index = load_sf2_index()
+        return sf2_index
+
+
+def load_sf2_index():
+    try:
+        with open(SF2_INDEX_FILE) as f:
+            index = json.load(f)
+        if index.get('version') == SF2_INDEX_VERSION:
+            return index
+        logging.info("SoundFont index has version {}, expected {}. Regenerating.".format(index.get('version'), SF2_INDEX_VERSION))
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.warning("Loading SoundFont index failed: {}".format(e))
+
+    return {
+        'version': SF2_INDEX_VERSION,
+        'soundfonts': {}
+    }
+
+
+def save_sf2_index():
+    with sf2_index_lock:
+        try:
+            os.makedirs(os.path.dirname(SF2_INDEX_FILE), exist_ok=True)
+            # Write to a temporary file first, so a crash while writing doesn't leave a broken index behind
+            tmp_file = SF2_INDEX_FILE + ".tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(get_sf2_index(), f)
+            os.replace(tmp_file, SF2_INDEX_FILE)
+        except Exception as e:
+            logging.error("Saving SoundFont index failed: {}".format(e))
+
+
+# Returns the presets of the soundfont at the given path (see read_sf2_presets), from the index
+# when it is up to date, or None if the soundfont can't be read
+def get_sf2_presets(path):
+    try:
+        stat = os.stat(path)
+    except OSError as e:
+        logging.warning("Unable to read SoundFont {}: {}".format(path, e))
+        return None
+
+    with sf2_index_lock:
+        soundfonts = get_sf2_index()['soundfonts']
+        entry = soundfonts.get(path)
+        if entry is not None and entry['mtime'] == stat.st_mtime and entry['size'] == stat.st_size:
+            return [tuple(preset) for preset in entry['presets']]
+
+        try:
+            presets = read_sf2_presets(path)
+        except Exception as e:
+            logging.warning("Unable to read presets from SoundFont {}: {}".format(path, e))
+            return None
+
+        soundfonts[path] = {
+            'mtime': stat.st_mtime,
+            'size': stat.st_size,
+            'presets': presets
+        }
+        save_sf2_index()
+        return presets
+
+#------------------------------------------------------------------------------
@@ -0,0 +1,257 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ******************************************************************************
+# ZYNTHIAN PROJECT: Zynthian GUI
+#
+# Sketchpad Autosave Journal: Append-only autosave storage for sketchpad songs
+#
+# Copyright (C) 2026 Zynthbox contributors
+#
+# ******************************************************************************
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of
+# the License, or any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For a full copy of the GNU General Public License see the LICENSE.txt file.
+#
+# ******************************************************************************
+import json
+import logging
+import os
+
+from collections import OrderedDict
+from pathlib import Path
+from queue import Queue
+from threading import Lock, Thread
+
+# The autosave is stored as two files in the sketchpad folder:
+# - Autosave.sketchpad.json, which is a full sketchpad file (with an extra journalSequence
+#   key, telling which journal entries are already included in it)
+# - Autosave.sketchpad.journal, which holds one json object per line, each containing
+#   the new value of one subtree of the sketchpad (a track, the scenes, the arrangements,
+#   the passthrough data for one track, and so on)
+# Writing an autosave only appends the subtrees which changed since the previous write to
+# the journal. The full autosave file is rewritten on the first write (so there always is
+# one to pick, even for short sessions), and after that whenever the journal grows large
+# enough, and the journal entries which are then included in it are dropped. All of this
+# happens on a background thread, so the gui thread only pays for serializing the song.
+AUTOSAVE_FILENAME = "Autosave.sketchpad.json"
+JOURNAL_FILENAME = "Autosave.sketchpad.journal"
+# The keys of the sketchpad data which hold one entry per track, and which are journaled per track
+PER_TRACK_KEYS = ["tracks", "trackPassthroughClients", "mixerPassthroughClients"]
+# Compact once the journal has grown past this many bytes since the last compaction
+COMPACTION_THRESHOLD = 1024 * 1024
+
+
+class sketchpad_autosave_journal(object):
+    def __init__(self, sketchpad_folder: str):
+        self.sketchpad_folder = Path(sketchpad_folder)
+        # The json encoded value of each subtree as it was last written, keyed by subtree key
+        self.__encoded_subtrees__ = OrderedDict()
+        self.__sequence__ = None
+        self.__journal_bytes__ = 0
+        # Whether the full autosave file has been written since this journal was created (or cleared)
+        self.__compacted__ = False
+        self.__journal_lock__ = Lock()
+        # The sketchpad data waiting to be written by the writer thread
+        self.__write_queue__ = Queue()
+        self.__writer_thread__ = None
+
+    @property
+    def autosave_file(self):
+        return self.sketchpad_folder / AUTOSAVE_FILENAME
+
+    @property
+    def journal_file(self):
+        return self.sketchpad_folder / JOURNAL_FILENAME
+
+    def exists(self):
+        return self.autosave_file.exists() or self.journal_file.exists()
+
+    # Queues the given sketchpad data to be written by the writer thread, which appends the subtrees
+    # which changed since the last write to the journal
+    def write(self, sketchpad_data: dict):
+        if self.__writer_thread__ is None:
+            self.__writer_thread__ = Thread(target=self.__run_writer__, daemon=True)
+            self.__writer_thread__.start()
+        self.__write_queue__.put(sketchpad_data)
+
+    # Waits for all queued writes to be done
+    def flush(self):
+        self.__write_queue__.join()
+
+    # Remove the autosave and its journal, for example after the sketchpad was explicitly saved
+    def clear(self):
+        self.flush()
+        with self.__journal_lock__:
+            self.journal_file.unlink(missing_ok=True)
+            self.autosave_file.unlink(missing_ok=True)
+            self.__encoded_subtrees__.clear()
+            self.__sequence__ = 0
+            self.__journal_bytes__ = 0
+            self.__compacted__ = False
+
+    def __run_writer__(self):
+        while True:
+            sketchpad_data = self.__write_queue__.get()
+            try:
+                with self.__journal_lock__:
+                    written_count = self.__write__(sketchpad_data)
+                logging.debug(f"Wrote {written_count} changed parts of the sketchpad to the autosave journal")
+            except Exception as e:
+                logging.exception(f"Error writing autosave journal {self.journal_file} : {e}")
+            finally:
+                self.__write_queue__.task_done()
+
+    # Appends the subtrees of the given sketchpad data which changed since the last write to the
+    # journal, compacts it if needed, and returns the number of subtrees which were written
+    def __write__(self, sketchpad_data: dict):
+        if self.__sequence__ is None:
+            # Continue the sequence from where the files on disk left off, so our entries will be replayed after theirs
+            _, self.__sequence__ = sketchpad_autosave_journal.read_with_sequence(self.sketchpad_folder)
+
+        lines = []
+        changed_keys = []
+        for key, value in sketchpad_autosave_journal.split(sketchpad_data).items():
+            encoded = json.dumps(value)
+            if self.__encoded_subtrees__.get(key) != encoded:
+                self.__encoded_subtrees__[key] = encoded
+                self.__sequence__ += 1
+                lines.append(f'{{"seq": {self.__sequence__}, "key": {json.dumps(key)}, "data": {encoded}}}\n')
+                changed_keys.append(key)
+
+        if len(lines) > 0:
+            data = "".join(lines)
+            try:
+                self.sketchpad_folder.mkdir(parents=True, exist_ok=True)
+                with open(self.journal_file, "a") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self.__journal_bytes__ += len(data)
+            except Exception as e:
+                logging.exception(f"Error appending to autosave journal {self.journal_file} : {e}")
+                # Forget about the failed subtrees, so they get written again next time
+                for key in changed_keys:
+                    del self.__encoded_subtrees__[key]
+                return 0
+            if not self.__compacted__ or self.__journal_bytes__ > COMPACTION_THRESHOLD:
+                self.__compact__()
+        return len(lines)
+
+    # Rewrite the full autosave file from the most recently written state, and drop the journal
+    # entries which it includes
+    def __compact__(self):
+        contents = self.__join__()
+        sequence = self.__sequence__
+        try:
+            temp_file = self.autosave_file.with_suffix(".tmp")
+            with open(temp_file, "w") as f:
+                f.write(contents)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.autosave_file)
+            remaining = []
+            if self.journal_file.exists():
+                with open(self.journal_file, "r") as f:
+                    for line in f:
+                        try:
+                            if json.loads(line)["seq"] > sequence:
+                                remaining.append(line)
+                        except:
+                            pass
+            with open(temp_file, "w") as f:
+                f.write("".join(remaining))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.journal_file)
+            self.__journal_bytes__ = 0
+            self.__compacted__ = True
+            logging.debug(f"Compacted autosave journal up to entry {sequence}, {len(remaining)} entries remain")
+        except Exception as e:
+            logging.exception(f"Error compacting autosave journal into {self.autosave_file} : {e}")
+
+    def __join__(self):
+        parts = []
+        per_track_parts = OrderedDict()
+        for key, encoded in self.__encoded_subtrees__.items():
+            name, _, index = key.partition("/")
+            if name in PER_TRACK_KEYS:
+                if name not in per_track_parts:
+                    per_track_parts[name] = {}
+                    # Keep the position of the first entry, to retain the order of the keys
+                    parts.append((name, None))
+                per_track_parts[name][int(index)] = encoded
+            else:
+                parts.append((name, encoded))
+        entries = []
+        for name, encoded in parts:
+            if encoded is None:
+                tracks = per_track_parts[name]
+                encoded = "[" + ", ".join(tracks[index] for index in sorted(tracks.keys())) + "]"
+            entries.append(f"{json.dumps(name)}: {encoded}")
+        entries.append(f'"journalSequence": {self.__sequence__}')
+        return "{" + ", ".join(entries) + "}"
+
+    @staticmethod
+    def split(sketchpad_data: dict):
+        subtrees = OrderedDict()
+        for key, value in sketchpad_data.items():
+            if key == "journalSequence":
+                continue
+            if key in PER_TRACK_KEYS and isinstance(value, list):
+                for index, entry in enumerate(value):
+                    subtrees[f"{key}/{index}"] = entry
+            else:
+                subtrees[key] = value
+        return subtrees
+
+    # Returns the sketchpad data stored in the autosave of the given folder (with the journal replayed
+    # on top of it) and the sequence number of the most recent entry included in it
+    @staticmethod
+    def read_with_sequence(sketchpad_folder):
+        sketchpad_folder = Path(sketchpad_folder)
+        sketchpad_data = {}
+        sequence = 0
+        autosave_file = sketchpad_folder / AUTOSAVE_FILENAME
+        journal_file = sketchpad_folder / JOURNAL_FILENAME
+        if autosave_file.exists():
+            with open(autosave_file, "r") as f:
+                sketchpad_data = json.loads(f.read())
+            sequence = sketchpad_data.pop("journalSequence", 0)
+        if journal_file.exists():
+            base_sequence = sequence
+            with open(journal_file, "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except:
+                        # A partially written entry from a crash while writing, which is necessarily the last one
+                        logging.warning(f"Skipping unreadable entry in autosave journal {journal_file}")
+                        continue
+                    if entry["seq"] <= base_sequence:
+                        continue
+                    name, _, index = entry["key"].partition("/")
+                    if name in PER_TRACK_KEYS and index != "":
+                        index = int(index)
+                        if not isinstance(sketchpad_data.get(name), list):
+                            sketchpad_data[name] = []
+                        while len(sketchpad_data[name]) <= index:
+                            sketchpad_data[name].append(None)
+                        sketchpad_data[name][index] = entry["data"]
+                    else:
+                        sketchpad_data[name] = entry["data"]
+                    sequence = max(sequence, entry["seq"])
+        return sketchpad_data, sequence
+
+    @staticmethod
+    def read(sketchpad_folder):
+        sketchpad_data, _ = sketchpad_autosave_journal.read_with_sequence(sketchpad_folder)
+        return sketchpad_data
@@ -27,7 +27,6 @@ import logging
 import math
 import os
 import shutil
-import tempfile
 import threading
 import traceback
 import jack
@@ -43,6 +42,7 @@ from .sketchpad_clips_model import sketchpad_clips_model
 from .sketchpad_clip import sketchpad_clip
 from .sketchpad_engineRoutingData import sketchpad_engineRoutingData
 from .sketchpad_keyzoneData import sketchpad_keyzoneData
+from zynqtgui.utils.sample_store import sample_store
 from zynqtgui import zynthian_gui_config
 from ..zynthian_gui_multi_controller import MultiController
 
@@ -481,6 +481,8 @@ class sketchpad_channel(QObject):
         self.__id__ = id
         self.__name__ = None
         self.__song__ = song
+        # The cached state of the slots, by kind (see refresh_slot_state)
+        self.__slot_state__ = {}
         self.__initial_volume__ = 0
         self.__volume__ = Zynthbox.AudioLevels.instance().tracks()[id].gainHandler()
         self.__volume__.gainChanged.connect(self.handleGainChanged)
@@ -621,14 +623,10 @@ class sketchpad_channel(QObject):
         self.__song__.scenesModel.selected_sketchpad_song_index_changed.connect(self.track_index_changed_handler)
         self.__song__.scenesModel.selected_scene_index_changed.connect(lambda: self.selectedClipNamesChanged.emit())
 
-        # Emit occupiedSlotsChanged on dependant property changes
+        # Refresh the slot state on dependant property changes
         self.chained_sounds_changed.connect(self.chained_sounds_changed_handler)
-        try:
-            self.__song__.scenesModel.selectedSketchpadSongIndexChanged.connect(lambda: self.occupiedSlotsChanged.emit())
-        except:
-            pass
-        self.track_type_changed.connect(lambda: self.occupiedSlotsChanged.emit())
-        self.samples_changed.connect(lambda: self.occupiedSlotsChanged.emit())
+        self.track_type_changed.connect(lambda: self.refresh_slot_state("occupied"))
+        self.samples_changed.connect(lambda: self.refresh_slot_state("samples"))
 
         self.selectedClipChanged.connect(lambda: self.clipsModelChanged.emit())
         self.selectedClipChanged.connect(lambda: self.scene_clip_changed.emit())
@@ -824,7 +822,9 @@ class sketchpad_channel(QObject):
         if not self.__song__.__to_be_deleted__:
             layer = self.zynqtgui.layer.layers[layer_index]
             if layer in self.chainedFx:
-                self.chainedFxNamesChanged.emit()
+                self.refresh_slot_state("fx")
+            elif layer.midi_chan in self.chainedSounds:
+                self.refresh_slot_state("synth")
 
     def layerCreatedHandler(self, midichannel):
         if not self.__song__.__to_be_deleted__:
@@ -864,18 +864,16 @@ class sketchpad_channel(QObject):
         if not self.__song__.__to_be_deleted__:
             self.cache_bank_preset_lists()
             self.update_filter_controllers()
-            self.occupiedSlotsChanged.emit()
             self.connectedSoundChanged.emit()
             self.connectedSoundNameChanged.emit()
-            self.chainedSoundsNamesChanged.emit()
-            self.chainedFxNamesChanged.emit()
+            self.refresh_slot_state("synth", "fx")
             self.chainedSoundsAcceptedChannelsChanged.emit()
             self.zynqtgui.snapshot.schedule_save_last_state_snapshot()
 
     def chainedFxChangedHandler(self):
         if not self.__song__.__to_be_deleted__:
             self.zynqtgui.snapshot.schedule_save_last_state_snapshot()
-            self.chainedFxNamesChanged.emit()
+            self.refresh_slot_state("fx")
             self.update_fx_filter_controllers()
 
     def chainedSketchFxChangedHandler(self):
@@ -889,28 +887,27 @@ class sketchpad_channel(QObject):
         if not self.__song__.__to_be_deleted__:
             self.connectedSoundChanged.emit()
             self.connectedSoundNameChanged.emit()
-            self.chainedSoundsNamesChanged.emit()
-            self.chainedFxNamesChanged.emit()
+            self.refresh_slot_state("synth", "fx")
             self.updateSynthRoutingData()
 
     def cache_bank_preset_lists(self):
         if not self.__song__.__to_be_deleted__:
-            # Back up curlayer
-            curlayer = self.zynqtgui.curlayer
-
+            # Fill the bank/preset lists of each synth's layer directly, which puts them in the preset catalogue
+            # shared by all layers of the engine, without changing curlayer
+            cached_layers = []
             for midi_channel in self.chainedSounds:
                 if midi_channel >= 0 and self.checkIfLayerExists(midi_channel):
-                    # Change curlayer to synth's layer and fill back/preset list
-                    self.zynqtgui.curlayer = self.zynqtgui.layer.layer_midi_map[midi_channel]
-                    logging.debug(f"Caching midi channel : channel({midi_channel}), layer({self.zynqtgui.curlayer})")
+                    layer = self.zynqtgui.layer.layer_midi_map[midi_channel]
+                    logging.debug(f"Caching midi channel : channel({midi_channel}), layer({layer})")
                     self.zynqtgui.currentTaskMessage = f"Caching bank/preset lists for Track {self.name}"
-                    self.zynqtgui.bank.fill_list()
-                    self.zynqtgui.preset.fill_list()
+                    layer.load_bank_list()
+                    layer.load_preset_list()
+                    cached_layers.append(layer)
 
-            # Restore curlayer
-            self.zynqtgui.curlayer = curlayer
-            self.zynqtgui.bank.fill_list()
-            self.zynqtgui.preset.fill_list()
+            # Only the bank and preset pages of the current layer need updating
+            if self.zynqtgui.curlayer in cached_layers:
+                self.zynqtgui.bank.fill_list()
+                self.zynqtgui.preset.fill_list()
 
     def update_filter_controllers(self):
         if not self.__song__.__to_be_deleted__:
@@ -1664,6 +1661,8 @@ class sketchpad_channel(QObject):
             for channel_id in range(self.__song__.channelsModel.count):
                 channel = self.__song__.channelsModel.getChannel(channel_id)
                 channel.__chained_sounds__ = [-1 if x == next_free_layer else x for x in channel.__chained_sounds__]
+                if channel is not self:
+                    channel.refresh_slot_state("synth")
 
             self.__chained_sounds__[index] = next_free_layer
             self.chained_sounds_changed.emit()
@@ -1708,6 +1707,65 @@ class sketchpad_channel(QObject):
     def checkIfLayerExists(self, channel):
         return channel in self.__song__.get_metronome_manager().zynqtgui.screens["layer"].layer_midi_map.keys()
 
+    ### BEGIN Slot state cache
+    # The slot related properties (occupiedSlots, chainedSoundsNames, chainedFxNames and the ones derived from them),
+    # which are bound for every track, are read from this cache rather than walking the slots on every read. The
+    # mutators refresh the kinds of state they affect, and the change signal is only emitted for state which changed.
+    # The kinds are:
+    # - synth: (midi channel, whether its layer exists, name) for each synth slot, with an empty name for slots without a layer
+    # - fx: (layer, name) for each fx slot
+    # - samples: whether each sample slot has a sample
+    # - occupied: occupiedSlots, derived from the others according to the track type
+    def compute_slot_state(self, kind):
+        if kind == "synth":
+            state = []
+            for sound in self.__chained_sounds__:
+                exists = sound >= 0 and self.checkIfLayerExists(sound)
+                state.append((sound, exists, self.getLayerNameByMidiChannel(sound) if exists else ""))
+            return state
+        elif kind == "fx":
+            return list(zip(self.__chained_fx, self.compute_chainedFxNames()))
+        elif kind == "samples":
+            return [sample is not None and sample.path is not None and len(sample.path) > 0 for sample in self.__samples__]
+        elif kind == "occupied":
+            if self.__track_type__ == "sample-trig":
+                # If type is sample-trig check which samples have wavs selected
+                return list(self.get_slot_state("samples"))
+            elif self.__track_type__ == "synth":
+                # If type is synth check which synth engines are selected and chained
+                return [exists for _, exists, _ in self.get_slot_state("synth")]
+            else:
+                # For any other modes, slots are not in use
+                return []
+
+    def get_slot_state(self, kind):
+        state = self.__slot_state__.get(kind)
+        if state is None:
+            state = self.__slot_state__[kind] = self.compute_slot_state(kind)
+        return state
+
+    # Recompute the given kinds of slot state, emitting the change signals of those which changed
+    def refresh_slot_state(self, *kinds):
+        if self.__song__.__to_be_deleted__:
+            return
+        changed = []
+        for kind in ["synth", "fx", "samples", "occupied"]:
+            # occupied is derived from the others, so refresh that whenever they change
+            if kind in kinds or (kind == "occupied" and ("synth" in changed or "samples" in changed)):
+                state = self.compute_slot_state(kind)
+                if state != self.__slot_state__.get(kind):
+                    self.__slot_state__[kind] = state
+                    changed.append(kind)
+        if "synth" in changed:
+            self.chainedSoundsNamesChanged.emit()
+        if "fx" in changed:
+            self.chainedFxNamesChanged.emit()
+        if "samples" in changed:
+            self.occupiedSampleSlotsChanged.emit()
+        if "occupied" in changed:
+            self.occupiedSlotsChanged.emit()
+    ### END Slot state cache
+
     @Slot(int)
     def selectSound(self, index):
         zynqtgui = self.__song__.get_metronome_manager().zynqtgui
@@ -1759,15 +1817,7 @@ class sketchpad_channel(QObject):
     ### Property chainedSoundNames
     ### An array of 5 elements with sound name if available or empty string
     def get_chainedSoundsNames(self):
-        res = []
-
-        for sound in self.chainedSounds:
-            if sound >= 0 and self.checkIfLayerExists(sound):
-                res.append(self.getLayerNameByMidiChannel(sound))
-            else:
-                res.append("")
-
-        return res
+        return [name for _, _, name in self.get_slot_state("synth")]
 
     chainedSoundsNamesChanged = Signal()
 
@@ -1905,7 +1955,7 @@ class sketchpad_channel(QObject):
                 self.__sound_snapshot_changed = True
                 self.__song__.schedule_save()
                 self.chainedFxChanged.emit()
-                self.chainedFxNamesChanged.emit()
+                self.refresh_slot_state("fx")
 
     # Add or replace a fx layer at slot_row to fx chain
     # If explicit slot_row is not set then selected slot row is used
@@ -1926,7 +1976,7 @@ class sketchpad_channel(QObject):
             self.__sound_snapshot_changed = True
             self.update_jack_port()
             self.chainedFxChanged.emit()
-            self.chainedFxNamesChanged.emit()
+            self.refresh_slot_state("fx")
 
     @Slot()
     def removeSelectedFxFromChain(self):
@@ -1952,7 +2002,7 @@ class sketchpad_channel(QObject):
                             self.zynqtgui.screens['snapshot'].schedule_save_last_state_snapshot()
 
                             self.chainedFxChanged.emit()
-                            self.chainedFxNamesChanged.emit()
+                            self.refresh_slot_state("fx")
                 #            self.zynqtgui.layer_effects.fx_layers_changed.emit()
                 #            self.zynqtgui.layer_effects.fx_layer = None
                 #            self.zynqtgui.layer_effects.fill_list()
@@ -1987,6 +2037,9 @@ class sketchpad_channel(QObject):
 
     ### Property chainedFxNames
     def get_chainedFxNames(self):
+        return [name for _, name in self.get_slot_state("fx")]
+
+    def compute_chainedFxNames(self):
         names = []
         for fx in self.chainedFx:
             try:
@@ -2747,36 +2800,10 @@ class sketchpad_channel(QObject):
     ### Property occupiedSlots
     @Slot(None, result='QVariantList')
     def get_occupiedSlots(self):
-        occupied_slots = []
-
-        if self.__track_type__ == "sample-trig":
-            # logging.debug(f"### get_occupiedSlots : Sample trig")
-            # If type is sample-trig check how many samples has wavs selected
-            for sample in self.__samples__:
-                if sample is not None and \
-                        sample.path is not None and \
-                        len(sample.path) > 0:
-                    occupied_slots.append(True)
-                else:
-                    occupied_slots.append(False)
-        elif self.__track_type__ == "synth":
-            # logging.debug(f"### get_occupiedSlots : synth")
-            # If type is synth check how many synth engines are selected and chained
-            for sound in self.__chained_sounds__:
-                if sound >= 0 and self.checkIfLayerExists(sound):
-                    occupied_slots.append(True)
-                else:
-                    occupied_slots.append(False)
-        else:
-            # logging.debug(f"### get_occupiedSlots : Slots not in use")
-            # For any other modes, sample slots are not in use. Hence do not increment occupied_slots
-            pass
-
-        # logging.debug(f"### get_occupiedSlots : occupied_slots({occupied_slots})")
-
-        return occupied_slots
+        return list(self.get_slot_state("occupied"))
 
     occupiedSlotsChanged = Signal()
+    occupiedSampleSlotsChanged = Signal()
 
     occupiedSlots = Property('QVariantList', get_occupiedSlots, notify=occupiedSlotsChanged)
     ### END Property occupiedSlots
@@ -2784,26 +2811,16 @@ class sketchpad_channel(QObject):
     ### Property occupiedSlotsCount
     @Slot(None, result='QVariantList')
     def get_occupiedSlotsCount(self):
-        count = 0
-
-        for slot in self.occupiedSlots:
-            if slot:
-                count += 1
-
-        return count
+        return self.get_slot_state("occupied").count(True)
 
     occupiedSlotsCount = Property(int, get_occupiedSlotsCount, notify=occupiedSlotsChanged)
     ### END Property occupiedSlotsCount
 
     ### BEGIN Property occupiedSampleSlotsCount
     def get_occupiedSampleSlotsCount(self):
-        count = 0
-        for sample in self.__samples__:
-            if sample is not None and sample.path is not None and len(sample.path) > 0:
-                count += 1
-        return count
+        return self.get_slot_state("samples").count(True)
 
-    occupiedSampleSlotsCount = Property(int, get_occupiedSampleSlotsCount, notify=occupiedSlotsChanged)
+    occupiedSampleSlotsCount = Property(int, get_occupiedSampleSlotsCount, notify=occupiedSampleSlotsChanged)
     ### END Property occupiedSampleSlotsCount
 
     # BEGIN Property selectedClip
@@ -3452,16 +3469,16 @@ class sketchpad_channel(QObject):
 
     ### BEGIN Property occupiedSynthSlots
     def get_occupiedSynthSlots(self):
-        return [sound != "" for sound in self.chainedSoundsNames]
+        return [name != "" for _, _, name in self.get_slot_state("synth")]
 
     occupiedSynthSlots = Property("QVariantList", get_occupiedSynthSlots, notify=chainedSoundsNamesChanged)
     ### END Property occupiedSynthSlots
 
     ### BEGIN Property occupiedSampleSlots
     def get_occupiedSampleSlots(self):
-        return [sample is not None and sample.path is not None and len(sample.path) > 0 for sample in self.samples]
+        return list(self.get_slot_state("samples"))
 
-    occupiedSampleSlots = Property("QVariantList", get_occupiedSampleSlots, notify=samples_changed)
+    occupiedSampleSlots = Property("QVariantList", get_occupiedSampleSlots, notify=occupiedSampleSlotsChanged)
     ### END Property occupiedSampleSlots
 
     ### BEGIN Property occupiedSketchSlots
@@ -3480,7 +3497,7 @@ class sketchpad_channel(QObject):
 
     ### BEGIN Property occupiedFxSlots
     def get_occupiedFxSlots(self):
-        return [fx != "" for fx in self.chainedFxNames]
+        return [name != "" for _, name in self.get_slot_state("fx")]
 
     occupiedFxSlots = Property("QVariantList", get_occupiedFxSlots, notify=chainedFxNamesChanged)
     ### END Property occupiedFxSlots
@@ -3517,7 +3534,7 @@ class sketchpad_channel(QObject):
                 self.zynqtgui.screens['control'].show()
                 self.zynqtgui.layer.fill_list()
                 self.zynqtgui.screens['snapshot'].schedule_save_last_state_snapshot()
-                self.chainedSoundsNamesChanged.emit()
+                self.refresh_slot_state("synth")
 
     @Slot(int)
     def selectNextSynthPreset(self, slot_index):
@@ -3544,7 +3561,7 @@ class sketchpad_channel(QObject):
                 self.zynqtgui.screens['control'].show()
                 self.zynqtgui.layer.fill_list()
                 self.zynqtgui.screens['snapshot'].schedule_save_last_state_snapshot()
-                self.chainedSoundsNamesChanged.emit()
+                self.refresh_slot_state("synth")
 
     @Slot(int)
     def selectPreviousFxPreset(self, slot_index):
@@ -3557,7 +3574,7 @@ class sketchpad_channel(QObject):
             self.zynqtgui.screens['control'].show()
             self.zynqtgui.layer.fill_list()
             self.zynqtgui.screens['snapshot'].schedule_save_last_state_snapshot()
-            self.chainedFxNamesChanged.emit()
+            self.refresh_slot_state("fx")
 
     @Slot(int)
     def selectNextFxPreset(self, slot_index):
@@ -3570,7 +3587,7 @@ class sketchpad_channel(QObject):
             self.zynqtgui.screens['control'].show()
             self.zynqtgui.layer.fill_list()
             self.zynqtgui.screens['snapshot'].schedule_save_last_state_snapshot()
-            self.chainedFxNamesChanged.emit()
+            self.refresh_slot_state("fx")
 
     @Slot(int)
     def selectPreviousSynthBank(self, slot_index):
@@ -3599,7 +3616,7 @@ class sketchpad_channel(QObject):
                 self.zynqtgui.screens['control'].show()
                 self.zynqtgui.layer.fill_list()
                 self.zynqtgui.screens['snapshot'].schedule_save_last_state_snapshot()
-                self.chainedSoundsNamesChanged.emit()
+                self.refresh_slot_state("synth")
 
     @Slot(int)
     def selectNextSynthBank(self, slot_index):
@@ -3628,7 +3645,7 @@ class sketchpad_channel(QObject):
                 self.zynqtgui.screens['control'].show()
                 self.zynqtgui.layer.fill_list()
                 self.zynqtgui.screens['snapshot'].schedule_save_last_state_snapshot()
-                self.chainedSoundsNamesChanged.emit()
+                self.refresh_slot_state("synth")
 
     @Slot(int)
     def selectPreviousFxBank(self, slot_index):
@@ -3643,7 +3660,7 @@ class sketchpad_channel(QObject):
             self.zynqtgui.screens['control'].show()
             self.zynqtgui.layer.fill_list()
             self.zynqtgui.screens['snapshot'].schedule_save_last_state_snapshot()
-            self.chainedFxNamesChanged.emit()
+            self.refresh_slot_state("fx")
 
     @Slot(int)
     def selectNextFxBank(self, slot_index):
@@ -3658,7 +3675,7 @@ class sketchpad_channel(QObject):
             self.zynqtgui.screens['control'].show()
             self.zynqtgui.layer.fill_list()
             self.zynqtgui.screens['snapshot'].schedule_save_last_state_snapshot()
-            self.chainedFxNamesChanged.emit()
+            self.refresh_slot_state("fx")
 
     @Slot(None, result=QObject)
     def getClipToRecord(self):
@@ -3742,18 +3759,14 @@ class sketchpad_channel(QObject):
                 if index > 9:
                     logging.error("For some reason we have more than ten elements in the encoded sample data, what happened?!")
                     break;
-                filename = snapshot_obj[key]["filename"]
                 # Clear out the existing sample, whether or not there's a new sample to go into that spot
                 self.__samples__[index].clear()
-                # If the filename is an empty string, nothing to load
-                if len(filename) > 0:
-                    # Store the new sample in a temporary file
-                    with tempfile.TemporaryDirectory() as tmp:
-                        temporaryFile = Path(tmp) / filename
-                        with open(temporaryFile, "wb") as file:
-                            file.write(base64.b64decode(snapshot_obj[key]["sampledata"]))
+                # Get the new sample from the sample store (or the snapshot itself, for older snapshots) into a temporary file
+                with sample_store.instance().materialize(snapshot_obj[key]) as temporaryFile:
+                    # If the filename is an empty string (or the sample data is missing), nothing to load
+                    if temporaryFile is not None:
                         # Now set this slot's path to that, and should_copy is True by default, but let's be explicit so we can make sure it keeps working
-                        self.__samples__[index].set_path(str(temporaryFile), should_copy=True)
+                        self.__samples__[index].set_path(temporaryFile, should_copy=True)
                         # Restore the metadata, if it's been saved to the snapshot (otherwise load it from disk)
                         if "metadata" in snapshot_obj[key]:
                             self.__samples__[index].metadata.deserialize(snapshot_obj[key]["metadata"])
@@ -3761,7 +3774,7 @@ class sketchpad_channel(QObject):
                             self.__samples__[index].metadata.clear()
                             # If the metadata doesn't exist in the object passed to us, read it out of the file itself, if that exists
                             if self.__samples__[index].audioSource is not None:
-                                self.__samples__[index].metadata.read()
+                                self.__samples__[index].metadata.read(asynchronous=True)
             self.zynqtgui.end_long_task()
         self.zynqtgui.do_long_task(task, "Loading samples")
 
@@ -3788,18 +3801,14 @@ class sketchpad_channel(QObject):
             if snapshotIndex < len(snapshot_obj):
                 # Key in the snapshot obj is a string
                 key = f"{snapshotIndex}"
-                filename = snapshot_obj[key]["filename"]
                 # Clear out the existing sample, whether or not there's a new sample to go into that spot
                 clip.clear()
-                # If the filename is an empty string, nothing to load
-                if len(filename) > 0:
-                    # Store the new sample in a temporary file
-                    with tempfile.TemporaryDirectory() as tmp:
-                        temporaryFile = Path(tmp) / filename
-                        with open(temporaryFile, "wb") as file:
-                            file.write(base64.b64decode(snapshot_obj[key]["sampledata"]))
+                # Get the new sample from the sample store (or the snapshot itself, for older snapshots) into a temporary file
+                with sample_store.instance().materialize(snapshot_obj[key]) as temporaryFile:
+                    # If the filename is an empty string (or the sample data is missing), nothing to load
+                    if temporaryFile is not None:
                         # Now set this slot's path to that, and should_copy is True by default, but let's be explicit so we can make sure it keeps working
-                        clip.set_path(str(temporaryFile), should_copy=True)
+                        clip.set_path(temporaryFile, should_copy=True)
                         # Restore the metadata, if it's been saved to the snapshot (otherwise load it from disk)
                         clip.metadata.clear()
                         if "metadata" in snapshot_obj[key]:
@@ -3808,7 +3817,7 @@ class sketchpad_channel(QObject):
                         else:
                             # If the metadata doesn't exist in the object passed to us, read it out of the file itself, if that exists
                             if clip.audioSource is not None:
-                                clip.metadata.read()
+                                clip.metadata.read(asynchronous=True)
             if showLoadingScreen:
                 self.zynqtgui.end_long_task()
         if showLoadingScreen:
@@ -3823,13 +3832,20 @@ class sketchpad_channel(QObject):
             thisSample = {
                 "filename": "",
                 "metadata": "",
-                "sampledata": ""
+                "digest": ""
                 }
             if sample is not None and sample.path is not None and len(sample.path) > 0:
                 thisSample["filename"] = sample.filename
                 thisSample["metadata"] = sample.metadata.serialize()
-                with open(sample.path, "rb") as file:
-                    thisSample["sampledata"] = base64.b64encode(file.read()).decode("utf-8")
+                # The sample itself goes into the sample store, and the snapshot only refers to it (files leaving the
+                # device get the sample data embedded again by sample_store.export_file)
+                try:
+                    thisSample["digest"] = sample_store.instance().add(sample.path)
+                except Exception as e:
+                    # Rather than lose the sample, embed it the way snapshots did before the sample store
+                    logging.error(f"Failed to add {sample.path} to the sample store, embedding it instead: {e}")
+                    with open(sample.path, "rb") as file:
+                        thisSample["sampledata"] = base64.b64encode(file.read()).decode("utf-8")
             encodedSampleData[index] = thisSample
         return json.dumps(encodedSampleData)
 
@@ -3850,63 +3866,67 @@ class sketchpad_channel(QObject):
         if snapshotIndex < 0 or Zynthbox.Plugin.instance().sketchpadSlotCount() - 1 < snapshotIndex:
             return
 
-        def task():
-            # Reset the favourites display to everything when loading from a snapshot
-            self.zynqtgui.preset.show_only_favorites = False
+        # Finds the entry for the slot we were asked to restore from in the snapshot. This only touches the snapshot data, so
+        # it runs on the long task executor's worker thread when showing the loading screen
+        def find_snapshot_entry():
             if type(snapshot) is str:
                 # Consider the passed snapshot to be an json string
                 snapshot_obj = json.loads(snapshot)
             else:
                 # Consider the passed snapshot to be an obj
                 snapshot_obj = snapshot
-
-            def post_removal_task():
-                free_layers = self.getFreeLayers()
-                if slotType == "synth" and len(free_layers) == 0:
-                    logging.error(f"There are no more free channels, and we need at least one to load a synth into this slot")
-                else:
-                    # Populate new chained sounds and update channel
-                    limitedSnapshot = {"layers": []}
-                    for index, snapshotEntry in enumerate(snapshot_obj["layers"]):
-                        # Match slot type and slot index to determine if current snapshot layer is the one that needs to be restored
-                        if slotType == "synth" and snapshotEntry["slot_type"] == "TracksBar_synthslot" and snapshotEntry["slot_index"] == snapshotIndex:
-                            snapshotEntry["track_index"] = self.id
-                            snapshotEntry["slot_index"] = slotIndex
-                            # Repopulate after removing current channel layers
-                            free_layers = self.getFreeLayers()
-                            new_chained_sounds = self.chainedSounds
-                            new_chained_sounds[slotIndex] = free_layers[0]
-                            snapshotEntry["midi_chan"] = free_layers[0]
-                            limitedSnapshot["layers"].append(snapshotEntry)
-                            break
-                        elif slotType == "fx" and snapshotEntry["slot_type"] == "TracksBar_fxslot" and snapshotEntry["slot_index"] == snapshotIndex:
-                            snapshotEntry["track_index"] = self.id
-                            snapshotEntry["slot_index"] = slotIndex
-                            snapshotEntry["midi_chan"] = 15
-                            limitedSnapshot["layers"].append(snapshotEntry)
-                            break
-                    if len(limitedSnapshot["layers"]) > 0:
-                        self.zynqtgui.layer.load_channels_snapshot(limitedSnapshot)
-                        if slotType == "synth":
-                            self.chainedSounds = new_chained_sounds
-                        # Run autoconnect after completing loading sounds
-                        self.zynqtgui.zynautoconnect()
-                    else:
-                        logging.info(f"There is nothing to restore from the slot we were asked to restore from.")
-                if showLoadingScreen:
-                    self.zynqtgui.end_long_task()
+            for snapshotEntry in snapshot_obj["layers"]:
+                # Match slot type and slot index to determine if current snapshot layer is the one that needs to be restored
+                if slotType == "synth" and snapshotEntry["slot_type"] == "TracksBar_synthslot" and snapshotEntry["slot_index"] == snapshotIndex:
+                    return snapshotEntry
+                elif slotType == "fx" and snapshotEntry["slot_type"] == "TracksBar_fxslot" and snapshotEntry["slot_index"] == snapshotIndex:
+                    return snapshotEntry
+            return None
+
+        def remove_current_sound():
+            # Reset the favourites display to everything when loading from a snapshot
+            self.zynqtgui.preset.show_only_favorites = False
             if slotType == "synth":
                 if self.chainedSounds[slotIndex] > -1:
-                    self.remove_and_unchain_sound(self.chainedSounds[slotIndex], post_removal_task, showLoadingScreen)
-                else:
-                    post_removal_task()
+                    self.remove_and_unchain_sound(self.chainedSounds[slotIndex], showLoadingScreen=False)
             elif slotType == "fx":
-                self.removeFxFromChain(slotIndex, showLoadingScreen)
-                post_removal_task()
+                self.removeFxFromChain(slotIndex, showLoadingScreen=False)
+
+        def load_sound(snapshotEntry):
+            free_layers = self.getFreeLayers()
+            if slotType == "synth" and len(free_layers) == 0:
+                logging.error(f"There are no more free channels, and we need at least one to load a synth into this slot")
+            elif snapshotEntry is None:
+                logging.info(f"There is nothing to restore from the slot we were asked to restore from.")
+            else:
+                # Populate new chained sounds and update channel
+                snapshotEntry["track_index"] = self.id
+                snapshotEntry["slot_index"] = slotIndex
+                if slotType == "synth":
+                    # Repopulate after removing current channel layers
+                    new_chained_sounds = self.chainedSounds
+                    new_chained_sounds[slotIndex] = free_layers[0]
+                    snapshotEntry["midi_chan"] = free_layers[0]
+                else:
+                    snapshotEntry["midi_chan"] = 15
+                self.zynqtgui.layer.load_channels_snapshot({"layers": [snapshotEntry]})
+                if slotType == "synth":
+                    self.chainedSounds = new_chained_sounds
+                # Run autoconnect after completing loading sounds
+                self.zynqtgui.zynautoconnect()
+
+        def work(task):
+            snapshotEntry = find_snapshot_entry()
+            # Removing the current sound and loading the new one are separate steps, so the gui gets to render in between
+            task.run_on_ui_thread(remove_current_sound)
+            task.run_on_ui_thread(load_sound, snapshotEntry)
+
         if showLoadingScreen:
-            self.zynqtgui.do_long_task(task, f"Loading {slotType} {snapshotIndex + 1} into slot {slotIndex + 1} on Track {self.name}")
+            self.zynqtgui.do_long_task_in_thread(work, f"Loading {slotType} {snapshotIndex + 1} into slot {slotIndex + 1} on Track {self.name}")
         else:
-            task()
+            snapshotEntry = find_snapshot_entry()
+            remove_current_sound()
+            load_sound(snapshotEntry)
 
     @Slot(str, result=None)
     def setChannelSoundFromSnapshot(self, snapshot):
@@ -25,9 +25,7 @@
 import math
 import re
 import shutil
-import tempfile
 import traceback
-import taglib
 import ujson as json
 import os
 import logging
@@ -35,9 +33,10 @@ import Zynthbox
 import numpy as np
 
 from pathlib import Path
-from subprocess import check_output
 from PySide2.QtCore import Property, QObject, QTimer, Qt, Signal, Slot
 from zynqtgui import zynthian_gui_config
+from .sketchpad_clip_metadata_io import sketchpad_clip_metadata_io
+from zynqtgui.utils.sample_store import sample_store
 
 def restoreEqualiserAndCompressorSettings(equaliserCompressorObject, dataChunk):
     for index, filterValues in enumerate(dataChunk["equaliserSettings"]):
@@ -322,23 +321,31 @@ class sketchpad_clip_metadata(QObject):
                     sliceSettingsObject.disconnect(self)
             except: pass
 
-    def read(self, load_autosave=True):
-        self.__isReading = True
+    # If asynchronous is True, the tags are read by the metadata io worker, and the metadata is
+    # deserialized once they have been read, otherwise the read happens immediately (after any
+    # queued writes to the clip's file have been performed)
+    def read(self, load_autosave=True, asynchronous=False):
         if not self.clip.isEmpty:
-            audioMetadata = None
-            try:
-                file = taglib.File(self.clip.path)
-                if load_autosave and "AUTOSAVE" in file.tags:
-                    logging.debug(f"Clip metadata reading {self.clip} : autosave")
-                    self.__audioMetadata = json.loads(file.tags["AUTOSAVE"][0])
-                else:
-                    logging.debug(f"Clip metadata reading {self.clip} : NOT autosave")
-                audioMetadata = file.tags
-                file.close()
-            except Exception as e:
-                logging.error(f"Error reading metadata from sketch {self.clip.path} : {str(e)}")
-
-            self.deserialize(audioMetadata)
+            if asynchronous:
+                path = self.clip.path
+                sketchpad_clip_metadata_io.instance().queue_read(path, lambda tags: self.handleReadTags(path, tags, load_autosave))
+            else:
+                sketchpad_clip_metadata_io.instance().wait_for_path(self.clip.path)
+                self.handleReadTags(self.clip.path, sketchpad_clip_metadata_io.read_tags(self.clip.path), load_autosave)
+
+    def handleReadTags(self, path, tags, load_autosave):
+        if self.clip.path != path:
+            # The clip has been given a different file while we were reading this one
+            logging.debug(f"Clip metadata for {self.clip} was read from {path}, but the clip is now using {self.clip.path}, ignoring")
+            return
+        self.__isReading = True
+        if tags is not None:
+            if load_autosave and "AUTOSAVE" in tags:
+                logging.debug(f"Clip metadata reading {self.clip} : autosave")
+                self.__audioMetadata = json.loads(tags["AUTOSAVE"][0])
+            else:
+                logging.debug(f"Clip metadata reading {self.clip} : NOT autosave")
+        self.deserialize(tags)
         self.__isReading = False
 
     @Slot()
@@ -390,33 +397,12 @@ class sketchpad_clip_metadata(QObject):
                         tags["ZYNTHBOX_SAMPLE_PICKING_STYLE"] = [str(self.__samplePickingStyle)]
                         tags["ZYNTHBOX_SAMPLES"] = [str(self.__samples)]
                         tags["ZYNTHBOX_SOUND_SNAPSHOT"] = [str(self.__soundSnapshot)]
+                        # The samples are kept in the sample store for as long as this file refers to them
+                        sample_store.instance().set_references(path, self.__samples)
 
-                    try:
-                        file = taglib.File(path)
-                        for key, value in tags.items():
-                            file.tags[key] = value
-                        file.save()
-                    except Exception as e:
-                        logging.exception(f"Error writing metadata : {str(e)}")
-                        logging.info("Trying to create a new file without metadata")
-
-                        try:
-                            with tempfile.TemporaryDirectory() as tmp:
-                                logging.info("Creating new temp file without metadata")
-                                fileSuffix = path.rpartition('.')[2]
-                                logging.debug(f"ffmpeg -i {path} -codec copy {Path(tmp) / 'output.'}{fileSuffix}")
-                                check_output(f"ffmpeg -i {path} -codec copy {Path(tmp) / 'output.'}{fileSuffix}", shell=True)
-
-                                logging.info("Replacing old file")
-                                logging.debug(f"mv {Path(tmp) / 'output.'}{fileSuffix} {path}")
-                                check_output(f"mv {Path(tmp) / 'output.'}{fileSuffix} {path}", shell=True)
-
-                                file = taglib.File(path)
-                                for key, value in tags.items():
-                                    file.tags[key] = value
-                                file.save()
-                        except Exception as e:
-                            logging.error(f"Error creating new file and writing metadata : {str(e)}")
+                    # The tags are handed to the metadata io worker, which writes them (along with any other
+                    # tags queued for the same file in the meantime) without blocking the UI thread
+                    sketchpad_clip_metadata_io.instance().queue_write(path, tags)
                 self.__isWriting = False
 
     def serialize(self):
@@ -760,7 +746,7 @@ class sketchpad_clip(QObject):
                 self.__metadata.clear()
                 # If the metadata doesn't exist in the object passed to us, read it out of the file itself, if that exists
                 if self.audioSource is not None:
-                    self.__metadata.read()
+                    self.__metadata.read(asynchronous=True)
         except Exception as e:
             logging.error(f"Error during clip deserialization: {e}")
             traceback.print_exception(None, e, e.__traceback__)
@@ -963,8 +949,8 @@ class sketchpad_clip(QObject):
             logging.error(f"Unsupported file suffix {suffix} (must be wav or ogg) for {path}")
         # TODO Handling duplicates: We may very well want to eventually hold only one copy of a wave asset on disk
         # and then reference-count its users, so that we can remove it from the sketchpad when all users have gone.
-        # This, however, will need tracking globally, otherwise we end up unable to track when it's being used by
-        # other versions of the same sketchpad, and we don't want to remove it from disk until all users have gone.
+        # The samples referred to by sample snapshots are already held like that, globally, by sample_store,
+        # which the bank and sketchpad folders could move to as well (but their files are expected to be real files).
 
     # Arg path: Where you want to store a copy of the slot data, with the metadata stored into the file
     @Slot(str, result=bool)
@@ -1171,7 +1157,8 @@ class sketchpad_clip(QObject):
                 for id in range(5):
                     sample = samples[f"{id}"]
                     # Return true only if there is atleast 1 sample available
-                    if "filename" in sample and "sampledata" in sample and not sample["filename"] == "" and not sample["sampledata"] == "":
+                    # Samples are referred to by their digest in the sample store (or embedded as sampledata, in exported and older sketches)
+                    if not sample.get("filename", "") == "" and not (sample.get("digest", "") == "" and sample.get("sampledata", "") == ""):
                         containsSamples = True
                         break
         except:
@@ -0,0 +1,164 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ******************************************************************************
+# ZYNTHIAN PROJECT: Zynthian GUI
+#
+# Sketchpad Clip Metadata IO: Performs clip metadata reading and writing off the UI thread
+#
+# Copyright (C) 2026 Zynthbox contributors
+#
+# ******************************************************************************
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of
+# the License, or any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For a full copy of the GNU General Public License see the LICENSE.txt file.
+#
+# ******************************************************************************
+import logging
+import tempfile
+import taglib
+
+from collections import OrderedDict
+from pathlib import Path
+from queue import SimpleQueue
+from subprocess import check_output
+from threading import Condition, Thread
+from PySide2.QtCore import QObject, Signal, Slot
+
+
+class sketchpad_clip_metadata_io(QObject):
+    """
+    A single worker thread which performs all clip metadata tag reading and writing.
+
+    Writes are coalesced per file: if more writes are requested for a file while an earlier
+    one is still waiting in the queue, their tags are merged into the pending one, and the
+    file only gets opened and saved once. Completion is reported through the writeCompleted
+    and readCompleted signals, which are delivered on the UI thread.
+    """
+    __instance__ = None
+
+    def __init__(self, parent=None):
+        super(sketchpad_clip_metadata_io, self).__init__(parent)
+        self.__queue__ = SimpleQueue()
+        # Tags waiting to be written, keyed by path
+        self.__pending_writes__ = OrderedDict()
+        # The paths which have a write queued or being performed
+        self.__busy_paths__ = set()
+        self.__read_callbacks__ = {}
+        self.__next_read_id__ = 0
+        self.__condition__ = Condition()
+        self.readCompleted.connect(self.handleReadCompleted)
+        self.__thread__ = Thread(target=self.__run__, daemon=True)
+        self.__thread__.start()
+
+    @staticmethod
+    def instance():
+        if sketchpad_clip_metadata_io.__instance__ is None:
+            sketchpad_clip_metadata_io.__instance__ = sketchpad_clip_metadata_io()
+        return sketchpad_clip_metadata_io.__instance__
+
+    # Queue the given tags (a dictionary of tag names to lists of values) to be written into the file at the given path
+    def queue_write(self, path: str, tags: dict):
+        with self.__condition__:
+            if path in self.__pending_writes__:
+                self.__pending_writes__[path].update(tags)
+                return
+            self.__pending_writes__[path] = dict(tags)
+            self.__busy_paths__.add(path)
+        self.__queue__.put(("write", path))
+
+    # Queue reading the tags of the file at the given path, and call the given callback (on the UI thread)
+    # with the tags (or None, if reading failed) once done
+    def queue_read(self, path: str, callback):
+        with self.__condition__:
+            read_id = self.__next_read_id__
+            self.__next_read_id__ += 1
+            self.__read_callbacks__[read_id] = callback
+        self.__queue__.put(("read", path, read_id))
+
+    # Block until there are no writes queued or ongoing for the given path, so a subsequent read sees what was written
+    def wait_for_path(self, path: str):
+        with self.__condition__:
+            while path in self.__busy_paths__:
+                self.__condition__.wait()
+
+    @Slot(int, str, "QVariant")
+    def handleReadCompleted(self, read_id, path, tags):
+        with self.__condition__:
+            callback = self.__read_callbacks__.pop(read_id, None)
+        if callback is not None:
+            callback(tags)
+
+    def __run__(self):
+        while True:
+            operation = self.__queue__.get()
+            if operation[0] == "write":
+                path = operation[1]
+                with self.__condition__:
+                    tags = self.__pending_writes__.pop(path)
+                success = sketchpad_clip_metadata_io.write_tags(path, tags)
+                with self.__condition__:
+                    if path not in self.__pending_writes__:
+                        self.__busy_paths__.discard(path)
+                    self.__condition__.notify_all()
+                self.writeCompleted.emit(path, success)
+            elif operation[0] == "read":
+                _, path, read_id = operation
+                self.wait_for_path(path)
+                self.readCompleted.emit(read_id, path, sketchpad_clip_metadata_io.read_tags(path))
+
+    @staticmethod
+    def read_tags(path: str):
+        try:
+            file = taglib.File(path)
+            tags = dict(file.tags)
+            file.close()
+            return tags
+        except Exception as e:
+            logging.error(f"Error reading metadata from {path} : {str(e)}")
+            return None
+
+    @staticmethod
+    def write_tags(path: str, tags: dict):
+        try:
+            file = taglib.File(path)
+            for key, value in tags.items():
+                file.tags[key] = value
+            file.save()
+            file.close()
+            return True
+        except Exception as e:
+            logging.exception(f"Error writing metadata : {str(e)}")
+            logging.info("Trying to create a new file without metadata")
+
+            try:
+                with tempfile.TemporaryDirectory() as tmp:
+                    logging.info("Creating new temp file without metadata")
+                    fileSuffix = path.rpartition('.')[2]
+                    logging.debug(f"ffmpeg -i {path} -codec copy {Path(tmp) / 'output.'}{fileSuffix}")
+                    check_output(f"ffmpeg -i {path} -codec copy {Path(tmp) / 'output.'}{fileSuffix}", shell=True)
+
+                    logging.info("Replacing old file")
+                    logging.debug(f"mv {Path(tmp) / 'output.'}{fileSuffix} {path}")
+                    check_output(f"mv {Path(tmp) / 'output.'}{fileSuffix} {path}", shell=True)
+
+                    file = taglib.File(path)
+                    for key, value in tags.items():
+                        file.tags[key] = value
+                    file.save()
+                    file.close()
+                    return True
+            except Exception as e:
+                logging.error(f"Error creating new file and writing metadata : {str(e)}")
+        return False
+
+    writeCompleted = Signal(str, bool)
+    readCompleted = Signal(int, str, "QVariant")
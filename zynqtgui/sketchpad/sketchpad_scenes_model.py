@@ -52,6 +52,15 @@ class sketchpad_scenes_model(QAbstractListModel):
             "8": {"name": "I", "clips": []},
             "9": {"name": "J", "clips": []},
         }
+        # Index of the clips in each scene, as a set of all the scene's clips, and a list of its clips per track,
+        # kept in step with the scenes' clip lists, so membership checks and starting and stopping scenes don't
+        # need to go through all the clips
+        self.__scene_clip_sets__ = {}
+        self.__scene_track_clips__ = {}
+        for key in self.__scenes__:
+            self.__rebuild_scene_index(key)
+        # The sketchpad song index the enabled state of the clips was last synced for
+        self.__synced_sketchpad_song_index__ = None
 
         self.selected_sketchpad_song_index_changed.connect(self.__song__.setBpmFromTrack)
 
@@ -96,7 +105,9 @@ class sketchpad_scenes_model(QAbstractListModel):
                         self.__scenes__[key]["clips"][index] = self.__song__.getClipById(clip["row"], clip["col"], clip["part"])
                     else:
                         self.__scenes__[key]["clips"][index] = self.__song__.getClipById(clip["row"], clip["col"], clip["id"])
+                self.__rebuild_scene_index(key)
             self.endResetModel()
+            self.__synced_sketchpad_song_index__ = None
 
         if "selectedSketchpadSongIndex" in obj:
             self.__selected_sketchpad_song_index__ = obj["selectedSketchpadSongIndex"]
@@ -158,13 +169,14 @@ class sketchpad_scenes_model(QAbstractListModel):
     def get_selected_scene_index(self):
         return self.__selected_scene_index__
     def set_selected_scene_index(self, index):
+        previous_scene_index = self.__selected_scene_index__
         self.stopScene(self.selectedSceneIndex, self.selectedSketchpadSongIndex)
         self.__selected_scene_index__ = index
         self.playScene(self.selectedSceneIndex, self.selectedSketchpadSongIndex)
         self.__song__.schedule_save()
 
         self.selected_scene_index_changed.emit()
-        self.syncClipsEnabledFromCurrentScene()
+        self.syncClipsEnabledFromCurrentScene(previous_scene_index)
         self.__new_name_change_timer.start()
 
     selected_scene_index_changed = Signal()
@@ -197,7 +209,40 @@ class sketchpad_scenes_model(QAbstractListModel):
     selectedSceneName = Property(str, get_selected_scene_name, notify=selected_scene_name_changed)
     ### END Property selectedSceneName
 
-    def syncClipsEnabledFromCurrentScene(self):
+    # Keep the scene index in step with the clip list of the scene with the given key
+    def __rebuild_scene_index(self, key):
+        clips = [clip for clip in self.__scenes__[key]["clips"] if clip is not None]
+        self.__scene_clip_sets__[key] = set(clips)
+        track_clips = {}
+        for clip in clips:
+            track_clips.setdefault(clip.col, []).append(clip)
+        self.__scene_track_clips__[key] = track_clips
+
+    # The clips in the given scene, for the given track (or all tracks if the track index is negative)
+    def __scene_clips(self, sceneIndex, trackIndex=-1):
+        if trackIndex < 0:
+            return [clip for clip in self.getScene(sceneIndex)["clips"] if clip is not None]
+        return self.__scene_track_clips__[str(sceneIndex)].get(trackIndex, [])
+
+    def syncClipsEnabledFromCurrentScene(self, previousSceneIndex=None):
+        sketchpadSongIndex = self.selectedSketchpadSongIndex
+        if previousSceneIndex is not None and sketchpadSongIndex == self.__synced_sketchpad_song_index__:
+            # Only the scene changed since the last sync, and enabling a clip puts it in the current scene (and disabling
+            # removes it), so the clips which were enabled are those in the previous scene, and only those in just one of
+            # the two scenes change
+            previousClips = list(self.__scene_clips(previousSceneIndex, sketchpadSongIndex))
+            currentClips = list(self.__scene_clips(self.__selected_scene_index__, sketchpadSongIndex))
+            previousClipSet = set(previousClips)
+            currentClipSet = set(currentClips)
+            for clip in previousClips:
+                if clip not in currentClipSet:
+                    clip.enabled = False
+            for clip in currentClips:
+                if clip not in previousClipSet:
+                    clip.enabled = True
+            return
+
+        self.__synced_sketchpad_song_index__ = sketchpadSongIndex
         # Sync enabled attribute for clips in scene
         for trackIndex in range(0, Zynthbox.Plugin.instance().sketchpadTrackCount()):
             for clipId in range(0, Zynthbox.Plugin.instance().sketchpadSlotCount()):
@@ -210,23 +255,16 @@ class sketchpad_scenes_model(QAbstractListModel):
 
     @Slot(int)
     def playScene(self, sceneIndex, trackIndex=-1):
-        scene = self.getScene(sceneIndex)
-
-        for i in range(0, len(scene["clips"])):
-            clip = scene["clips"][i]
-
+        clipToRecord = self.zynqtgui.sketchpad.clipToRecord
+        for clip in self.__scene_clips(sceneIndex, trackIndex):
             # Start all clips except clip to be recorded
-            if clip != self.zynqtgui.sketchpad.clipToRecord and (trackIndex < 0 or (0 <= trackIndex == clip.col)):
+            if clip != clipToRecord:
                 clip.play()
 
     @Slot(int)
     def stopScene(self, sceneIndex, trackIndex=-1):
-        scene = self.getScene(sceneIndex)
-
-        for i in range(0, len(scene["clips"])):
-            clip = scene["clips"][i]
-            if trackIndex < 0 or (0 <= trackIndex == clip.col):
-                clip.stop()
+        for clip in self.__scene_clips(sceneIndex, trackIndex):
+            clip.stop()
 
     @Slot(int, result='QVariantMap')
     def getScene(self, index):
@@ -234,17 +272,21 @@ class sketchpad_scenes_model(QAbstractListModel):
 
     @Slot(QObject)
     def toggleClipInCurrentScene(self, clip: sketchpad_clip):
-        if clip in self.getScene(self.__selected_scene_index__)["clips"]:
+        if self.isClipInCurrentScene(clip):
             self.removeClipFromCurrentScene(clip)
         else:
             self.addClipToCurrentScene(clip)
 
     @Slot(QObject)
     def addClipToCurrentScene(self, clip):
-        if clip in self.getScene(self.__selected_scene_index__)["clips"]:
-            self.removeClipFromCurrentScene(clip)
+        if self.isClipInCurrentScene(clip):
+            # Already there (as when syncing the enabled state of the clips on a scene switch), so nothing changes
+            return
 
-        self.getScene(self.__selected_scene_index__)["clips"].append(clip)
+        key = str(self.__selected_scene_index__)
+        self.__scenes__[key]["clips"].append(clip)
+        self.__scene_clip_sets__[key].add(clip)
+        self.__scene_track_clips__[key].setdefault(clip.col, []).append(clip)
 
         if self.__song__.get_metronome_manager().isMetronomeRunning:
             clip.play()
@@ -255,11 +297,19 @@ class sketchpad_scenes_model(QAbstractListModel):
 
     @Slot(QObject)
     def removeClipFromCurrentScene(self, clip):
-        try:
-            self.getScene(self.__selected_scene_index__)["clips"].remove(clip)
-        except Exception as e:
-            # logging.debug(f"Error removing clip from scene : {str(e)}")
-            pass
+        if not self.isClipInCurrentScene(clip):
+            # Not there (as when syncing the enabled state of the clips on a scene switch), so nothing changes
+            return
+
+        key = str(self.__selected_scene_index__)
+        clips = self.__scenes__[key]["clips"]
+        clips.remove(clip)
+        if clip in clips:
+            # The clip was in the scene more than once, so work the index out again from scratch
+            self.__rebuild_scene_index(key)
+        else:
+            self.__scene_clip_sets__[key].discard(clip)
+            self.__scene_track_clips__[key][clip.col].remove(clip)
 
         if self.__song__.get_metronome_manager().isMetronomeRunning:
             clip.stop()
@@ -270,7 +320,7 @@ class sketchpad_scenes_model(QAbstractListModel):
 
     @Slot(QObject, int, result=bool)
     def isClipInScene(self, clip, sceneIndex):
-        return clip in self.getScene(sceneIndex)["clips"]
+        return clip in self.__scene_clip_sets__[str(sceneIndex)]
 
     @Slot(QObject, result=bool)
     def isClipInCurrentScene(self, clip):
@@ -429,11 +429,4 @@ class sketchpad_segment(QObject):
 
     @Slot(result=int)
     def getOffsetInBeats(self):
-        offset = 0
-
-        # Iterate all segments till current to determine offset in beats
-        for segment_index in range(self.segmentId):
-            segment = self.__arrangement.segmentsModel.get_segment(segment_index)
-            offset += segment.barLength * 4 + segment.beatLength
-
-        return offset
+        return self.__segment_model.beatDurationAtIndex(self.__segment_model.segment_index(self))
@@ -0,0 +1,136 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ******************************************************************************
+# ZYNTHIAN PROJECT: Zynthian GUI
+#
+# An index of the positions of the segments of an arrangement in Sketchpad
+#
+# Copyright (C) 2026 Zynthbox contributors
+#
+# ******************************************************************************
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of
+# the License, or any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For a full copy of the GNU General Public License see the LICENSE.txt file.
+#
+# ******************************************************************************
+
+
+class sketchpad_segment_timeline(object):
+    """
+    Keeps the beat durations of an arrangement's segments in a Fenwick tree (a binary indexed
+    tree of prefix sums), so the offset of a segment, and which segment is at a given beat,
+    can be found in logarithmic time, and a segment's length can change in logarithmic time.
+    Inserting and removing segments rebuilds the tree, which is linear, like the list insert
+    and removal which goes along with it.
+    """
+    def __init__(self):
+        self.__segments = []
+        self.__durations = []
+        self.__tree = [0]
+        # The index of each segment in the timeline
+        self.__indices = {}
+
+    @staticmethod
+    def segment_duration(segment):
+        return segment.barLength * 4 + segment.beatLength
+
+    def reset(self, segments):
+        self.__segments = list(segments)
+        self.__durations = [sketchpad_segment_timeline.segment_duration(segment) for segment in self.__segments]
+        self.__rebuild()
+
+    def insert(self, index, segment):
+        self.__segments.insert(index, segment)
+        self.__durations.insert(index, sketchpad_segment_timeline.segment_duration(segment))
+        self.__rebuild()
+
+    def remove(self, index):
+        self.__segments.pop(index)
+        self.__durations.pop(index)
+        self.__rebuild()
+
+    # Update the duration of the given segment, after its length changed
+    def update(self, segment):
+        index = self.__indices.get(segment)
+        if index is None:
+            return
+        duration = sketchpad_segment_timeline.segment_duration(segment)
+        delta = duration - self.__durations[index]
+        if delta != 0:
+            self.__durations[index] = duration
+            position = index + 1
+            while position < len(self.__tree):
+                self.__tree[position] += delta
+                position += position & -position
+
+    def __rebuild(self):
+        count = len(self.__durations)
+        tree = [0] + self.__durations
+        for position in range(1, count + 1):
+            parent = position + (position & -position)
+            if parent <= count:
+                tree[parent] += tree[position]
+        self.__tree = tree
+        self.__indices = {segment: index for index, segment in enumerate(self.__segments)}
+
+    def count(self):
+        return len(self.__durations)
+
+    def duration(self, index):
+        return self.__durations[index]
+
+    # The index of the given segment, or -1 if it is not in the timeline
+    def index_of(self, segment):
+        return self.__indices.get(segment, -1)
+
+    # The position in beats at which the segment at the given index starts (for an index past the end, the total duration)
+    def offset(self, index):
+        position = min(max(index, 0), len(self.__durations))
+        offset = 0
+        while position > 0:
+            offset += self.__tree[position]
+            position -= position & -position
+        return offset
+
+    def total(self):
+        return self.offset(len(self.__durations))
+
+    # The index of the segment which plays at the given position in beats, or -1 if the position is outside the timeline
+    def index_at(self, beat):
+        if beat < 0 or beat >= self.total():
+            return -1
+        # Find the largest number of segments whose total duration is at most the given position
+        index = 0
+        remaining = beat
+        step = 1 << (len(self.__durations).bit_length())
+        while step > 0:
+            position = index + step
+            if position < len(self.__tree) and self.__tree[position] <= remaining:
+                index = position
+                remaining -= self.__tree[position]
+            step >>= 1
+        return index
+
+    # The index of the first segment which ends at or after the given position in beats, or the number
+    # of segments, if the position is past the end of the timeline
+    def index_ending_at_or_after(self, beat):
+        # Find the largest number of segments whose total duration is less than the given position
+        index = 0
+        remaining = beat
+        step = 1 << (len(self.__durations).bit_length())
+        while step > 0:
+            position = index + step
+            if position < len(self.__tree) and self.__tree[position] < remaining:
+                index = position
+                remaining -= self.__tree[position]
+            step >>= 1
+        return index
@@ -28,6 +28,7 @@ import math
 from PySide2.QtCore import QAbstractListModel, QObject, Qt, QTimer, Property, Signal, Slot
 from zynqtgui import zynthian_gui_config
 from zynqtgui.sketchpad.sketchpad_segment import sketchpad_segment
+from zynqtgui.sketchpad.sketchpad_segment_timeline import sketchpad_segment_timeline
 
 
 class sketchpad_segments_model(QAbstractListModel):
@@ -41,6 +42,8 @@ class sketchpad_segments_model(QAbstractListModel):
         self.__sketch = sketch
         self.__selected_segment_index = 0
         self.__segments = []
+        # Positions of the segments, for looking up offsets and which segment is at a given position
+        self.__timeline = sketchpad_segment_timeline()
         self.totalBeatDurationThrottle = QTimer()
         self.totalBeatDurationThrottle.setInterval(1)
         self.totalBeatDurationThrottle.setSingleShot(True)
@@ -67,6 +70,7 @@ class sketchpad_segments_model(QAbstractListModel):
 
         self.beginResetModel()
         self.__segments.clear()
+        self.__timeline.reset(self.__segments)
 
         for index, segment_obj in enumerate(obj):
             segment = sketchpad_segment(self.__sketch, self, self.__song)
@@ -109,6 +113,9 @@ class sketchpad_segments_model(QAbstractListModel):
     @Slot(int, QObject)
     def add_segment(self, segment_index, segment: sketchpad_segment):
         self.__segments.insert(segment_index, segment)
+        self.__timeline.insert(segment_index, segment)
+        segment.barLengthChanged.connect(self.handleSegmentLengthChanged)
+        segment.beatLengthChanged.connect(self.handleSegmentLengthChanged)
         segment.barLengthChanged.connect(self.totalBeatDurationThrottle.start)
         segment.beatLengthChanged.connect(self.totalBeatDurationThrottle.start)
         self.countChangedThrottle.start()
@@ -126,9 +133,12 @@ class sketchpad_segments_model(QAbstractListModel):
         if segment_index == -1:
             segment_index = len(self.__segments)
         newSegment = sketchpad_segment(self.__sketch, self, self.__song)
+        newSegment.barLengthChanged.connect(self.handleSegmentLengthChanged)
+        newSegment.beatLengthChanged.connect(self.handleSegmentLengthChanged)
         newSegment.barLengthChanged.connect(self.totalBeatDurationThrottle.start)
         newSegment.beatLengthChanged.connect(self.totalBeatDurationThrottle.start)
         self.__segments.insert(segment_index, newSegment)
+        self.__timeline.insert(segment_index, newSegment)
         self.countChangedThrottle.start()
         self.totalBeatDurationThrottle.start()
         self.selectedSegmentIndexChanged.emit()
@@ -177,17 +187,17 @@ class sketchpad_segments_model(QAbstractListModel):
             # logging.error("This is position zero, that'll always exist")
             positionEnsured = True
         else:
-            totalPosition = 0
-            for segment in self.__segments:
-                segmentIndex = segmentIndex + 1
-                # logging.error(f"Checking position {segmentIndex}")
-                segmentLength = (segment.barLength * 4) + segment.beatLength
+            # Find the first segment which stops at or after the split position
+            segmentIndex = self.__timeline.index_ending_at_or_after(splitPosition)
+            if segmentIndex < len(self.__segments):
+                segment = self.__segments[segmentIndex]
+                totalPosition = self.__timeline.offset(segmentIndex)
+                segmentLength = self.__timeline.duration(segmentIndex)
                 if totalPosition + segmentLength == splitPosition:
                     # logging.error(f"Position already exists, great!")
                     # This is the best possible case - then the position already exists
                     positionEnsured = True
-                    break
-                elif totalPosition + segmentLength > splitPosition:
+                else:
                     # The least best case - we need to split a segment into two
                     # First create the new segment, and give it a length far enough back that it starts at the position we want the split to be at
                     newSegmentLength = (totalPosition + segmentLength) - splitPosition
@@ -211,25 +221,23 @@ class sketchpad_segments_model(QAbstractListModel):
                     segment.beatLength = oldSegmentBeatLength
                     positionEnsured = True
                     logging.error(f"The position exists inside the current segment which ends at {totalPosition + segmentLength}, split that segment in two segments with durations {oldSegmentLength} and {newSegmentLength}")
-                    break
-                totalPosition = totalPosition + segmentLength
             if positionEnsured == False:
                 # logging.error("This position is further ahead than the end of the last position, so create a new segment and set the duration as expected")
                 # In case we reached this position, we will need to add a new segment at the end, and
                 # set its end point to the position we need, so the position exists as a stop
+                totalPosition = self.__timeline.total()
                 newSegmentLength = splitPosition - totalPosition
                 newSegmentBarLength = math.floor(newSegmentLength / 4)
                 newSegmentBeatLength = newSegmentLength - (newSegmentBarLength * 4)
                 newSegment = self.new_segment();
                 newSegment.barLength = newSegmentBarLength
                 newSegment.beatLength = newSegmentBeatLength
-                segmentIndex = segmentIndex + 1
+                segmentIndex = len(self.__segments) - 1
                 positionEnsured = True
-        totalPosition = 0;
-        for segment in self.__segments:
-            logging.error(f"segment {segment} at position {totalPosition} has duration {(segment.barLength * 4) + segment.beatLength} beats, with {len(segment.clips)} clips")
-            totalPosition = totalPosition + (segment.barLength * 4) + segment.beatLength
-        logging.error(f"Final segment ends at {totalPosition}")
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            for index, segment in enumerate(self.__segments):
+                logging.debug(f"segment {segment} at position {self.__timeline.offset(index)} has duration {self.__timeline.duration(index)} beats, with {len(segment.clips)} clips")
+            logging.debug(f"Final segment ends at {self.__timeline.total()}")
         return segmentIndex
 
     # Position a clip to be played from start_position until end_position (as given in beats), creating any splits as required to make that possible
@@ -250,6 +258,7 @@ class sketchpad_segments_model(QAbstractListModel):
     @Slot(int, result=QObject)
     def remove_segment(self, segment_index):
         segment = self.__segments.pop(segment_index)
+        self.__timeline.remove(segment_index)
         self.countChangedThrottle.start()
         self.totalBeatDurationThrottle.start()
         if self.__selected_segment_index == len(self.__segments):
@@ -262,9 +271,16 @@ class sketchpad_segments_model(QAbstractListModel):
 
     @Slot(QObject, result=int)
     def segment_index(self, segment: sketchpad_segment):
-        if segment in self.__segments:
-            return self.__segments.index(segment)
-        return -1
+        return self.__timeline.index_of(segment)
+
+    @Slot()
+    def handleSegmentLengthChanged(self):
+        self.__timeline.update(self.sender())
+
+    # Returns the index of the segment which plays at the given position (in beats), or -1 if the position is outside the arrangement
+    @Slot(float, result=int)
+    def segmentIndexAtBeat(self, beat):
+        return self.__timeline.index_at(beat)
 
     ### Property count
     def get_count(self):
@@ -277,20 +293,11 @@ class sketchpad_segments_model(QAbstractListModel):
 
     @Slot(int, result=int)
     def beatDurationAtIndex(self, index):
-        beatDuration = 0
-        currentIndex = 0
-        while currentIndex < len(self.__segments) and currentIndex < index:
-            currentSegment = self.__segments[currentIndex]
-            beatDuration += currentSegment.barLength * 4 + currentSegment.beatLength
-            currentIndex += 1
-        return beatDuration
+        return self.__timeline.offset(index)
 
     ### Property totalBeatDuration
     def get_totalBeatDuration(self):
-        totalDuration = 0
-        for segment in self.__segments:
-            totalDuration += segment.barLength * 4 + segment.beatLength
-        return totalDuration
+        return self.__timeline.total()
 
     totalBeatDurationChanged = Signal()
 
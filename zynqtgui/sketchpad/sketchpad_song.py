@@ -34,6 +34,7 @@ from pathlib import Path
 from PySide2.QtCore import Qt, QTimer, QMetaObject, Property, QObject, Signal, Slot
 from .sketchpad_arrangement import sketchpad_arrangement
 from .sketchpad_arrangements_model import sketchpad_arrangements_model
+from .sketchpad_autosave_journal import sketchpad_autosave_journal
 from .sketchpad_scenes_model import sketchpad_scenes_model
 from .sketchpad_segment import sketchpad_segment
 from .sketchpad_channel import sketchpad_channel
@@ -97,7 +98,9 @@ def serializePassthroughData(passthroughClient):
 class sketchpad_song(QObject):
     __instance__ = None
 
-    def __init__(self, sketchpad_folder: str, name, parent=None, load_autosave=True, clear_passthroughs=True):
+    # If given, sketchpad_data is what read_sketchpad returned for this sketchpad (which can be read on a worker thread), and
+    # is restored instead of reading the sketchpad again
+    def __init__(self, sketchpad_folder: str, name, parent=None, load_autosave=True, clear_passthroughs=True, sketchpad_data=None):
         super(sketchpad_song, self).__init__(parent)
 
         self.zynqtgui = zynthian_gui_config.zynqtgui
@@ -118,6 +121,7 @@ class sketchpad_song(QObject):
         self.__save_timer__.setInterval(1000)
         self.__save_timer__.setSingleShot(True)
         self.__save_timer__.timeout.connect(self.save)
+        self.__autosave_journal__ = sketchpad_autosave_journal(self.sketchpad_folder)
         self.__scale_model__ = ['C', 'G', 'D', 'A', 'E', 'B', 'Gb', 'Db', 'Ab', 'Eb', 'Bb', 'F']
         self.__selected_scale_index__ = 0
         # The octave is -1 indexed, as we operate with C4 == midi note 60, so this makes our default a key of C2
@@ -174,7 +178,7 @@ class sketchpad_song(QObject):
                 connectPassthroughClientForSaving(Zynthbox.Plugin.instance().fxPassthroughClients()[trackIndex][slotIndex], self.zynqtgui.screens['snapshot'].schedule_save_last_state_snapshot)
                 connectPassthroughClientForSaving(Zynthbox.Plugin.instance().sketchFxPassthroughClients()[trackIndex][slotIndex], self.zynqtgui.screens['snapshot'].schedule_save_last_state_snapshot)
 
-        if not self.restore(load_autosave):
+        if not self.restore(load_autosave, sketchpad_data):
             # Creating new temp sketchpad. So set hasUnsavedChanges to True
             self.hasUnsavedChanges = True
             self.__is_loading__ = True
@@ -280,6 +284,10 @@ class sketchpad_song(QObject):
                     sketchpad_file = Path(self.sketchpad_folder) / "Autosave.sketchpad.json"
                     # Since this is an autosave, sketchpad has unsaved changes
                     self.hasUnsavedChanges = True
+                    # Autosaves only append the parts of the sketchpad which changed to the journal (and write sketchpad_file
+                    # the first time around, and whenever the journal gets large), all of which happens in the background
+                    self.__autosave_journal__.write(current_state_obj)
+                    current_state_obj = None
                 else:
                     if self.isTemp:
                         # For temp sketchpad, do not save snapshot as it relies on last_state snapshot
@@ -295,7 +303,7 @@ class sketchpad_song(QObject):
                     sketchpad_file = Path(self.sketchpad_folder) / f"{self.__name__}.sketchpad.json"
                     logging.info(f"Storing sketchpad to {str(sketchpad_file)}")
                     # Also delete the cache file as we are performing a sketchpad save initiated by user
-                    Path(self.sketchpad_folder + "Autosave.sketchpad.json").unlink(missing_ok=True)
+                    self.__autosave_journal__.clear()
 
                 # When saving an empty sketchpad, we are not switching to it. Do not set lastSelectedSketchpad
                 if not save_empty:
@@ -307,14 +315,15 @@ class sketchpad_song(QObject):
                     sequenceModel = Zynthbox.PlayGridManager.instance().getSequenceModel(self.scenesModel.selectedSequenceName)
                     sequenceModel.exportTo(f"{self.sketchpad_folder}/sequences/{self.name}/{sequenceModel.objectName().lower().replace(' ', '-')}/metadata.sequence.json")
 
-                try:
-                    Path(self.sketchpad_folder).mkdir(parents=True, exist_ok=True)
-                    with open(sketchpad_file, "w") as f:
-                        f.write(json.dumps(current_state_obj))
-                        f.flush()
-                        os.fsync(f.fileno())
-                except Exception as e:
-                    logging.exception(f"Error writing sketchpad json to {str(sketchpad_file)} : {e}")
+                if current_state_obj is not None:
+                    try:
+                        Path(self.sketchpad_folder).mkdir(parents=True, exist_ok=True)
+                        with open(sketchpad_file, "w") as f:
+                            f.write(json.dumps(current_state_obj))
+                            f.flush()
+                            os.fsync(f.fileno())
+                    except Exception as e:
+                        logging.exception(f"Error writing sketchpad json to {str(sketchpad_file)} : {e}")
 
                 snapshot_file = str(soundsets_dir) + "/" + self.__name__ + ".zss"
                 soundsets_dir.mkdir(parents=True, exist_ok=True)
@@ -343,7 +352,24 @@ class sketchpad_song(QObject):
         if not self.__to_be_deleted__ and self.__is_loading__ == False and self.__is_saving__ == False and self.zynqtgui.isBootingComplete:
             QMetaObject.invokeMethod(self.__save_timer__, "start", Qt.QueuedConnection)
 
-    def restore(self, load_autosave):
+    # Reads the data of the sketchpad with the given name in the given folder, or of its autosave if asked to load that and
+    # there is one. This only reads files, so it can be done on a worker thread. Returns the data (None if there is no such
+    # sketchpad) and whether it is from the autosave
+    @staticmethod
+    def read_sketchpad(sketchpad_folder: str, name, load_autosave=True):
+        if name == "Autosave":
+            # If user is explicitly loading Autosave, set load_autosave to True to mimic automatic loading an autosave sketchpad
+            load_autosave = True
+        if load_autosave is True and sketchpad_autosave_journal(sketchpad_folder).exists():
+            # The autosave is the last compacted state, with any changes since then replayed on top from the journal
+            return sketchpad_autosave_journal.read(sketchpad_folder), True
+        sketchpad_file = Path(sketchpad_folder) / f"{name}.sketchpad.json"
+        if sketchpad_file.exists():
+            with open(sketchpad_file, "r") as f:
+                return json.loads(f.read()), False
+        return None, False
+
+    def restore(self, load_autosave, sketchpad_data=None):
         if self.__name__ == "Autosave":
             # If user is explicitly loading Autosave, set load_autosave to True to mimic automatic loading an autosave sketchpad
             load_autosave = True
@@ -352,7 +378,11 @@ class sketchpad_song(QObject):
         self.isLoadingChanged.emit()
         self.zynqtgui.currentTaskMessage = "Loading Sketchpad : Restoring Data"
 
-        if load_autosave is True and (Path(self.sketchpad_folder) / "Autosave.sketchpad.json").exists():
+        if sketchpad_data is not None:
+            restoring_autosave = sketchpad_data[1]
+        else:
+            restoring_autosave = load_autosave is True and self.__autosave_journal__.exists()
+        if restoring_autosave:
             sketchpad_file = Path(self.sketchpad_folder) / "Autosave.sketchpad.json"
             # Since this is an autosave, sketchpad has unsaved changes
             self.hasUnsavedChanges = True
@@ -360,92 +390,93 @@ class sketchpad_song(QObject):
             # Since this is NOT an autosave, sketchpad does not have any unsaved changes
             self.hasUnsavedChanges = False
             # Also delete the cache file if there are any (for fallback purposes)
-            Path(self.sketchpad_folder + "Autosave.sketchpad.json").unlink(missing_ok=True)
+            self.__autosave_journal__.clear()
 
         try:
-            if sketchpad_file.exists():
+            if sketchpad_data is None:
+                sketchpad_data = sketchpad_song.read_sketchpad(self.sketchpad_folder, self.__name__, load_autosave)
+            sketchpad = sketchpad_data[0]
+            if sketchpad is not None:
                 logging.info(f"Restoring sketchpad {sketchpad_file}")
-                with open(sketchpad_file, "r") as f:
-                    sketchpad = json.loads(f.read())
-
-                    if "name" in sketchpad and sketchpad["name"] != "":
-                        if self.__name__ == "Autosave":
-                            # If Sketchpad name is Autosave, make sure to update self.__name__ to the one saved in json
-                            self.__name__ = sketchpad["name"]
-                            self.__name_changed__.emit()
-                        elif self.__name__ != sketchpad["name"]:
-                            logging.info(f"Sketchpad filename changed from '{sketchpad['name']}' to '{self.__name__}'. "
-                                        f"Trying to rename soundset file.")
-                            logging.info(f'Renaming {self.sketchpad_folder}/soundsets/{sketchpad["name"]}.zss to {self.sketchpad_folder}/soundsets/{self.__name__}.zss')
-
-                            try:
-                                shutil.move(f'{self.sketchpad_folder}/soundsets/{sketchpad["name"]}.zss', f'{self.sketchpad_folder}/soundsets/{self.__name__}.zss')
-                            except Exception as e:
-                                logging.error(f"Error renaming old soundset to new name : {str(e)}")
-                    if "volume" in sketchpad:
-                        self.__volume__ = sketchpad["volume"]
-                        self.set_volume(self.__volume__, True)
-                    if "selectedScaleIndex" in sketchpad:
-                        self.set_selected_scale_index(sketchpad["selectedScaleIndex"], True)
-                    if "octave" in sketchpad:
-                        self.set_octave(sketchpad["octave"], True)
-
-                    # TODO : `channels` key is deprecated and has been renamed to `tracks`. Remove this fallback later
-                    if "channels" in sketchpad:
-                        warnings.warn("`channels` key is deprecated (will be removed soon) and has been renamed to `track`. Update any existing references to avoid issues with loading sketchpad", DeprecationWarning)
-                        self.__channels_model__.deserialize(sketchpad["channels"], load_autosave=not self.isTemp and load_autosave)
-                    if "tracks" in sketchpad:
-                        self.__channels_model__.deserialize(sketchpad["tracks"], load_autosave=not self.isTemp and load_autosave)
-
-                    if "scenes" in sketchpad:
-                        self.__scenes_model__.deserialize(sketchpad["scenes"])
-
-                    # TODO Remove this when we're reasonably certain there are no more of these
-                    if "sketches" in sketchpad:
-                        self.__arrangements_model__.deserialize(sketchpad["sketches"])
-                    if "arrangements" in sketchpad:
-                        self.__arrangements_model__.deserialize(sketchpad["arrangements"])
-
-                    if "bpm" in sketchpad:
-                        # In older sketchpad files, bpm would still be an int instead of a list
-                        # So if bpm is not a list, then generate a list and store it
-                        if isinstance(sketchpad["bpm"], list):
-                            self.__bpm__ = sketchpad["bpm"]
-                        else:
-                            self.__bpm__ = [120, 120, 120, 120, 120, 120, 120, 120, 120, 120]
-                            self.__bpm__[self.__scenes_model__.selectedSketchpadSongIndex] = sketchpad["bpm"]
-
-                        Zynthbox.SyncTimer.instance().setBpm(self.__bpm__[self.__scenes_model__.selectedSketchpadSongIndex])
-
-                    if "globalPlaybackClient" in sketchpad:
-                        restorePassthroughClientData(Zynthbox.Plugin.instance().globalPlaybackClient(), sketchpad["globalPlaybackClient"])
-                    if "trackPassthroughClients" in sketchpad:
-                        for trackIndex in range(0, Zynthbox.Plugin.instance().sketchpadTrackCount()):
-                            for slotType in range(0, 2):
-                                for laneIndex in range(0, Zynthbox.Plugin.instance().sketchpadSlotCount()):
-                                    laneIndexForEntry = laneIndex
-                                    # See serialize() - this is done to ensure we can later on simply re-add the rest of the lane entries if we want, without having to change anything here
-                                    if isinstance(sketchpad["trackPassthroughClients"][trackIndex], dict) == False and slotType < len(sketchpad["trackPassthroughClients"][trackIndex]) and len(sketchpad["trackPassthroughClients"][trackIndex][slotType]) == 1:
-                                        laneIndexForEntry = 0
-                                    if "trackPassthroughClient" in sketchpad["trackPassthroughClients"][trackIndex]:
-                                        # This is a fallback for older sketchpads, which didn't store the individual slot type clients
-                                        restorePassthroughClientData(Zynthbox.Plugin.instance().trackPassthroughClient(trackIndex, slotType, laneIndex), sketchpad["trackPassthroughClients"][trackIndex]["trackPassthroughClient"])
-                                    elif slotType < len(sketchpad["trackPassthroughClients"][trackIndex]) and laneIndexForEntry < len(sketchpad["trackPassthroughClients"][trackIndex][slotType]):
-                                        restorePassthroughClientData(Zynthbox.Plugin.instance().trackPassthroughClient(trackIndex, slotType, laneIndex), sketchpad["trackPassthroughClients"][trackIndex][slotType][laneIndexForEntry])
-                                    else:
-                                        logging.error(f"Failed to fetch either trackPassthroughClient or the fallback from the trackPassthroughClients entry in the sketchpad - something isn't right with this. The object data was:\n{sketchpad['trackPassthroughClients'][trackIndex]}")
-                    if "mixerPassthroughClients" in sketchpad:
-                        for trackIndex in range(0, Zynthbox.Plugin.instance().sketchpadTrackCount()):
-                            restorePassthroughClientData(Zynthbox.AudioLevels.instance().tracks()[trackIndex], sketchpad["mixerPassthroughClients"][trackIndex])
-
-                    # Load sequence model for this version explicitly after restoring sketchpad if it is not a temp sketchpad and not an autosave version
-                    if not self.isTemp and not load_autosave:
-                        sequenceModel = Zynthbox.PlayGridManager.instance().getSequenceModel(self.scenesModel.selectedSequenceName)
-                        sequenceModel.importFrom(f"{self.sketchpad_folder}/sequences/{self.name}/{sequenceModel.objectName().lower().replace(' ', '-')}/metadata.sequence.json")
-
-                    self.__is_loading__ = False
-                    self.isLoadingChanged.emit()
-                    return True
+
+                if "name" in sketchpad and sketchpad["name"] != "":
+                    if self.__name__ == "Autosave":
+                        # If Sketchpad name is Autosave, make sure to update self.__name__ to the one saved in json
+                        self.__name__ = sketchpad["name"]
+                        self.__name_changed__.emit()
+                    elif self.__name__ != sketchpad["name"]:
+                        logging.info(f"Sketchpad filename changed from '{sketchpad['name']}' to '{self.__name__}'. "
+                                    f"Trying to rename soundset file.")
+                        logging.info(f'Renaming {self.sketchpad_folder}/soundsets/{sketchpad["name"]}.zss to {self.sketchpad_folder}/soundsets/{self.__name__}.zss')
+
+                        try:
+                            shutil.move(f'{self.sketchpad_folder}/soundsets/{sketchpad["name"]}.zss', f'{self.sketchpad_folder}/soundsets/{self.__name__}.zss')
+                        except Exception as e:
+                            logging.error(f"Error renaming old soundset to new name : {str(e)}")
+                if "volume" in sketchpad:
+                    self.__volume__ = sketchpad["volume"]
+                    self.set_volume(self.__volume__, True)
+                if "selectedScaleIndex" in sketchpad:
+                    self.set_selected_scale_index(sketchpad["selectedScaleIndex"], True)
+                if "octave" in sketchpad:
+                    self.set_octave(sketchpad["octave"], True)
+
+                # TODO : `channels` key is deprecated and has been renamed to `tracks`. Remove this fallback later
+                if "channels" in sketchpad:
+                    warnings.warn("`channels` key is deprecated (will be removed soon) and has been renamed to `track`. Update any existing references to avoid issues with loading sketchpad", DeprecationWarning)
+                    self.__channels_model__.deserialize(sketchpad["channels"], load_autosave=not self.isTemp and load_autosave)
+                if "tracks" in sketchpad:
+                    self.__channels_model__.deserialize(sketchpad["tracks"], load_autosave=not self.isTemp and load_autosave)
+
+                if "scenes" in sketchpad:
+                    self.__scenes_model__.deserialize(sketchpad["scenes"])
+
+                # TODO Remove this when we're reasonably certain there are no more of these
+                if "sketches" in sketchpad:
+                    self.__arrangements_model__.deserialize(sketchpad["sketches"])
+                if "arrangements" in sketchpad:
+                    self.__arrangements_model__.deserialize(sketchpad["arrangements"])
+
+                if "bpm" in sketchpad:
+                    # In older sketchpad files, bpm would still be an int instead of a list
+                    # So if bpm is not a list, then generate a list and store it
+                    if isinstance(sketchpad["bpm"], list):
+                        self.__bpm__ = sketchpad["bpm"]
+                    else:
+                        self.__bpm__ = [120, 120, 120, 120, 120, 120, 120, 120, 120, 120]
+                        self.__bpm__[self.__scenes_model__.selectedSketchpadSongIndex] = sketchpad["bpm"]
+
+                    Zynthbox.SyncTimer.instance().setBpm(self.__bpm__[self.__scenes_model__.selectedSketchpadSongIndex])
+
+                if "globalPlaybackClient" in sketchpad:
+                    restorePassthroughClientData(Zynthbox.Plugin.instance().globalPlaybackClient(), sketchpad["globalPlaybackClient"])
+                if "trackPassthroughClients" in sketchpad:
+                    for trackIndex in range(0, Zynthbox.Plugin.instance().sketchpadTrackCount()):
+                        for slotType in range(0, 2):
+                            for laneIndex in range(0, Zynthbox.Plugin.instance().sketchpadSlotCount()):
+                                laneIndexForEntry = laneIndex
+                                # See serialize() - this is done to ensure we can later on simply re-add the rest of the lane entries if we want, without having to change anything here
+                                if isinstance(sketchpad["trackPassthroughClients"][trackIndex], dict) == False and slotType < len(sketchpad["trackPassthroughClients"][trackIndex]) and len(sketchpad["trackPassthroughClients"][trackIndex][slotType]) == 1:
+                                    laneIndexForEntry = 0
+                                if "trackPassthroughClient" in sketchpad["trackPassthroughClients"][trackIndex]:
+                                    # This is a fallback for older sketchpads, which didn't store the individual slot type clients
+                                    restorePassthroughClientData(Zynthbox.Plugin.instance().trackPassthroughClient(trackIndex, slotType, laneIndex), sketchpad["trackPassthroughClients"][trackIndex]["trackPassthroughClient"])
+                                elif slotType < len(sketchpad["trackPassthroughClients"][trackIndex]) and laneIndexForEntry < len(sketchpad["trackPassthroughClients"][trackIndex][slotType]):
+                                    restorePassthroughClientData(Zynthbox.Plugin.instance().trackPassthroughClient(trackIndex, slotType, laneIndex), sketchpad["trackPassthroughClients"][trackIndex][slotType][laneIndexForEntry])
+                                else:
+                                    logging.error(f"Failed to fetch either trackPassthroughClient or the fallback from the trackPassthroughClients entry in the sketchpad - something isn't right with this. The object data was:\n{sketchpad['trackPassthroughClients'][trackIndex]}")
+                if "mixerPassthroughClients" in sketchpad:
+                    for trackIndex in range(0, Zynthbox.Plugin.instance().sketchpadTrackCount()):
+                        restorePassthroughClientData(Zynthbox.AudioLevels.instance().tracks()[trackIndex], sketchpad["mixerPassthroughClients"][trackIndex])
+
+                # Load sequence model for this version explicitly after restoring sketchpad if it is not a temp sketchpad and not an autosave version
+                if not self.isTemp and not load_autosave:
+                    sequenceModel = Zynthbox.PlayGridManager.instance().getSequenceModel(self.scenesModel.selectedSequenceName)
+                    sequenceModel.importFrom(f"{self.sketchpad_folder}/sequences/{self.name}/{sequenceModel.objectName().lower().replace(' ', '-')}/metadata.sequence.json")
+
+                self.__is_loading__ = False
+                self.isLoadingChanged.emit()
+                return True
             else:
                 logging.info(f"Sketchpad not restored - no such file (expected when creating a new sketchpad): {sketchpad_file}")
                 self.__is_loading__ = False
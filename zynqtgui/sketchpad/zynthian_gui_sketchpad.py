@@ -41,6 +41,7 @@ from PySide2.QtCore import QMetaObject, Qt, Property, QObject, QTimer, Signal, S
 from PySide2.QtGui import QColor, QGuiApplication
 from .sketchpad_channel import last_selected_obj_dto
 from ..zynthian_gui_multi_controller import MultiController
+from ..zynthian_gui_task_executor import copy_tree
 from . import sketchpad_clip, sketchpad_song
 from .. import zynthian_qt_gui_base
 from .. import zynthian_gui_controller
@@ -556,6 +557,23 @@ class zynthian_gui_sketchpad(zynthian_qt_gui_base.zynqtgui):
 
             return f"{name}-{counter}"
 
+    # Reads the data of a sketchpad for sketchpad_song, on the long task executor's worker thread. If that fails, None is
+    # returned, and the song reads the sketchpad itself (and handles the failure like it otherwise would)
+    def read_sketchpad_data(self, sketchpad_folder, name, load_autosave):
+        try:
+            return sketchpad_song.sketchpad_song.read_sketchpad(sketchpad_folder, name, load_autosave)
+        except Exception as e:
+            logging.exception(f"Error reading sketchpad {name} from {sketchpad_folder} : {e}")
+            return None
+
+    # Reads the given snapshot, or the default snapshot if there is no such file, on the long task executor's worker
+    # thread. Returns the path of the snapshot which was read along with the snapshot, or None for both if neither exists
+    def read_sketchpad_snapshot(self, snapshot_path):
+        for fpath in [snapshot_path, "/zynthian/zynthian-my-data/snapshots/default.zss"]:
+            if fpath is not None and Path(fpath).exists():
+                return fpath, self.zynqtgui.screens["layer"].read_snapshot(fpath)
+        return None, None
+
     # Fallback for loading sequences from old sketchpads. This will try to check if there are any sequences from old sketchpad structure where the sequences were saved globally across all versions.
     # If old global sequences are found and new sequences directory do not exist, it will copy the global sequences to all the versions.
     # TODO : Remove after a considerable amount of time or when we are sure that all the old sketchpads got updated. Or maybe before a stable release
@@ -582,7 +600,9 @@ class zynthian_gui_sketchpad(zynthian_qt_gui_base.zynqtgui):
 
     @Slot(None)
     def newSketchpad(self, base_sketchpad=None, cb=None, load_snapshot=True, force=False, load_last_state_snapshot=False):
-        def task():
+        # The file work happens on the long task executor's worker thread, and everything touching the song (or any other
+        # Qt object) happens in steps on the gui thread, so the gui keeps rendering in between
+        def stop_playback():
             self.zynqtgui.currentTaskMessage = "Stopping playback"
 
             try:
@@ -595,65 +615,84 @@ class zynthian_gui_sketchpad(zynthian_qt_gui_base.zynqtgui):
             if old_song is not None:
                 old_song.to_be_deleted()
 
-            if (self.__sketchpad_basepath__ / 'temp').exists():
-                self.zynqtgui.currentTaskMessage = "Removing existing temp sketchpad"
-                shutil.rmtree(self.__sketchpad_basepath__ / 'temp')
-
             # Reset the keyzoning state when creating a new sketch (essentially to be on the safe side, it should otherwise be reset whenever we load/create synths)
             for synthSlot in range(0, 16):
                 Zynthbox.MidiRouter.instance().setZynthianSynthKeyzones(synthSlot, 0, 127, 60)
+            return old_song
+
+        def load_copied_sketchpad(base_sketchpad_path, new_sketchpad_name, sketchpad_data):
+            logging.info(f"Loading new sketchpad from community sketchpad : {str(self.__sketchpad_basepath__ / new_sketchpad_name / base_sketchpad_path.name)}")
+            self.__song__ = sketchpad_song.sketchpad_song(str(self.__sketchpad_basepath__ / new_sketchpad_name) + "/", base_sketchpad_path.stem.replace(".sketchpad", ""), self, load_autosave=False, sketchpad_data=sketchpad_data)
+            self.zynqtgui.global_settings.setValue("Sketchpad/lastSelectedSketchpad", str(self.__sketchpad_basepath__ / new_sketchpad_name / base_sketchpad_path.name))
+
+        def load_copied_sketchpad_snapshot(snapshot_path, snapshot):
+            # Load sketchpad snapshot if available or else load default snapshot
+            if snapshot_path is not None:
+                self.zynqtgui.currentTaskMessage = "Loading snapshot"
+                logging.info(f"Loading snapshot : {snapshot_path}")
+                self.zynqtgui.screens["layer"].load_snapshot(snapshot_path, snapshot=snapshot)
+            self.song_changed.emit()
+            self.selectedTrackId = 0
+
+        def create_empty_sketchpad():
+            logging.info("Creating New Sketchpad")
+            # Reset global fx to 100%
+            self.zynqtgui.global_fx_engines[0][1].value = self.zynqtgui.global_fx_engines[0][1].value_max
+            self.zynqtgui.global_fx_engines[1][1].value = self.zynqtgui.global_fx_engines[1][1].value_max
+            self.zynqtgui.currentTaskMessage = "Creating empty sketchpad as temp sketchpad"
+            self.__song__ = sketchpad_song.sketchpad_song(str(self.__sketchpad_basepath__ / "temp") + "/", "Sketchpad-1", self, load_autosave=False)
+
+        def load_empty_sketchpad_snapshot(snapshot_path, snapshot):
+            # When zynqtgui is starting, it will load last_state or default snapshot
+            # based on the value of self.init_should_load_last_state
+            # Do not load snapshot again otherwise it will create multiple processes for same synths
+            if load_snapshot:
+                if snapshot_path is not None:
+                    logging.info(f"Loading default snapshot")
+                    self.zynqtgui.currentTaskMessage = "Loading snapshot"
+                    self.zynqtgui.screens["layer"].load_snapshot(snapshot_path, snapshot=snapshot)
+            if load_last_state_snapshot:
+                if not self.zynqtgui.screens["snapshot"].load_default_snapshot():
+                    # Show error if loading default snapshot fails
+                    logging.error("Error loading default snapshot")
+            self.zynqtgui.global_settings.setValue("Sketchpad/lastSelectedSketchpad", str(self.__sketchpad_basepath__ / 'temp' / 'Sketchpad-1.sketchpad.json'))
+            # Connect all jack ports of respective channel after jack client initialization is done.
+            for i in range(0, self.__song__.channelsModel.count):
+                channel = self.__song__.channelsModel.getChannel(i)
+                channel.update_jack_port()
+            self.song_changed.emit()
+            self.selectedTrackId = 0
+            self.newSketchpadLoaded.emit()
+
+        def work(task):
+            old_song = task.run_on_ui_thread(stop_playback)
+
+            if (self.__sketchpad_basepath__ / 'temp').exists():
+                task.set_progress(-1, "Removing existing temp sketchpad")
+                shutil.rmtree(self.__sketchpad_basepath__ / 'temp')
+
             if base_sketchpad is not None:
                 logging.info(f"Creating New Sketchpad from community sketchpad : {base_sketchpad}")
-                self.zynqtgui.currentTaskMessage = "Copying community sketchpad to my sketchpads"
+                task.set_progress(0, "Copying community sketchpad to my sketchpads")
                 base_sketchpad_path = Path(base_sketchpad)
                 # Copy community sketchpad to my sketchpads
                 new_sketchpad_name = self.generate_unique_mysketchpad_name(base_sketchpad_path.parent.name)
-                shutil.copytree(base_sketchpad_path.parent, self.__sketchpad_basepath__ / new_sketchpad_name)
+                copy_tree(task, base_sketchpad_path.parent, self.__sketchpad_basepath__ / new_sketchpad_name)
                 # TODO : Remove after a considerable amount of time or when we are sure that all the old sketchpads got updated. Or maybe before a stable release
                 self.checkOldSequencesAndApplyFallback(self.__sketchpad_basepath__ / new_sketchpad_name / base_sketchpad_path.name)
-                logging.info(f"Loading new sketchpad from community sketchpad : {str(self.__sketchpad_basepath__ / new_sketchpad_name / base_sketchpad_path.name)}")
-                self.__song__ = sketchpad_song.sketchpad_song(str(self.__sketchpad_basepath__ / new_sketchpad_name) + "/", base_sketchpad_path.stem.replace(".sketchpad", ""), self, load_autosave=False)
-                self.zynqtgui.global_settings.setValue("Sketchpad/lastSelectedSketchpad", str(self.__sketchpad_basepath__ / new_sketchpad_name / base_sketchpad_path.name))
-                # Load sketchpad snapshot if available or else load default snapshot
-                snapshot_path = f"{str(self.__sketchpad_basepath__ / new_sketchpad_name / 'soundsets')}/{base_sketchpad_path.stem.replace('.sketchpad', '')}.zss"
-                if Path(snapshot_path).exists():
-                    self.zynqtgui.currentTaskMessage = "Loading snapshot"
-                    logging.info(f"Loading snapshot : {snapshot_path}")
-                    self.zynqtgui.screens["layer"].load_snapshot(snapshot_path)
-                elif Path("/zynthian/zynthian-my-data/snapshots/default.zss").exists():
-                    logging.info(f"Loading default snapshot")
-                    self.zynqtgui.currentTaskMessage = "Loading snapshot"
-                    self.zynqtgui.screens["layer"].load_snapshot("/zynthian/zynthian-my-data/snapshots/default.zss")
-                self.song_changed.emit()
-                self.selectedTrackId = 0
+                task.set_progress(-1)
+                sketchpad_name = base_sketchpad_path.stem.replace(".sketchpad", "")
+                sketchpad_data = self.read_sketchpad_data(str(self.__sketchpad_basepath__ / new_sketchpad_name) + "/", sketchpad_name, False)
+                task.run_on_ui_thread(load_copied_sketchpad, base_sketchpad_path, new_sketchpad_name, sketchpad_data)
+                snapshot_path, snapshot = self.read_sketchpad_snapshot(f"{str(self.__sketchpad_basepath__ / new_sketchpad_name / 'soundsets')}/{sketchpad_name}.zss")
+                task.run_on_ui_thread(load_copied_sketchpad_snapshot, snapshot_path, snapshot)
             else:
-                logging.info("Creating New Sketchpad")
-                # Reset global fx to 100%
-                self.zynqtgui.global_fx_engines[0][1].value = self.zynqtgui.global_fx_engines[0][1].value_max
-                self.zynqtgui.global_fx_engines[1][1].value = self.zynqtgui.global_fx_engines[1][1].value_max
-                self.zynqtgui.currentTaskMessage = "Creating empty sketchpad as temp sketchpad"
-                self.__song__ = sketchpad_song.sketchpad_song(str(self.__sketchpad_basepath__ / "temp") + "/", "Sketchpad-1", self, load_autosave=False)
-                # When zynqtgui is starting, it will load last_state or default snapshot
-                # based on the value of self.init_should_load_last_state
-                # Do not load snapshot again otherwise it will create multiple processes for same synths
-                if load_snapshot:
-                    if Path("/zynthian/zynthian-my-data/snapshots/default.zss").exists():
-                        logging.info(f"Loading default snapshot")
-                        self.zynqtgui.currentTaskMessage = "Loading snapshot"
-                        self.zynqtgui.screens["layer"].load_snapshot("/zynthian/zynthian-my-data/snapshots/default.zss")
-                if load_last_state_snapshot:
-                    if not self.zynqtgui.screens["snapshot"].load_default_snapshot():
-                        # Show error if loading default snapshot fails
-                        logging.error("Error loading default snapshot")
-                self.zynqtgui.global_settings.setValue("Sketchpad/lastSelectedSketchpad", str(self.__sketchpad_basepath__ / 'temp' / 'Sketchpad-1.sketchpad.json'))
-                # Connect all jack ports of respective channel after jack client initialization is done.
-                for i in range(0, self.__song__.channelsModel.count):
-                    channel = self.__song__.channelsModel.getChannel(i)
-                    channel.update_jack_port()
-                self.song_changed.emit()
-                self.selectedTrackId = 0
-                self.newSketchpadLoaded.emit()
+                task.run_on_ui_thread(create_empty_sketchpad)
+                snapshot_path, snapshot = self.read_sketchpad_snapshot(None) if load_snapshot else (None, None)
+                task.run_on_ui_thread(load_empty_sketchpad_snapshot, snapshot_path, snapshot)
+            return old_song
 
+        def finish(old_song):
             # Delete old song object after creating a new song instance
             if old_song is not None:
                 old_song.deleteLater()
@@ -675,10 +714,14 @@ class zynthian_gui_sketchpad(zynthian_qt_gui_base.zynqtgui):
             self.longOperationDecrement()
             QTimer.singleShot(1000, self.zynqtgui.end_long_task)
 
+        def failed(error):
+            self.sketchpadLoadingInProgress = False
+            self.longOperationDecrement()
+
         def confirmNewSketchpad(params=None):
             self.longOperationIncrement()
             self.sketchpadLoadingInProgress = True
-            self.zynqtgui.do_long_task(task, "Creating New Sketchpad")
+            self.zynqtgui.do_long_task_in_thread(work, "Creating New Sketchpad", on_done=finish, on_error=failed)
 
         if not force and self.zynqtgui.isBootingComplete and self.song.hasUnsavedChanges:
             self.zynqtgui.show_confirm("You have unsaved changes. Do you really want to continue?", confirmNewSketchpad)
@@ -758,96 +801,44 @@ class zynthian_gui_sketchpad(zynthian_qt_gui_base.zynqtgui):
 
     @Slot(str)
     def saveCopy(self, name, cb=None):
-        def task():
-            old_folder = self.__song__.sketchpad_folder
-            shutil.copytree(old_folder, self.__sketchpad_basepath__ / name)
+        old_folder = self.__song__.sketchpad_folder
+
+        # Copying the sketchpad is only file work, so all of it happens on the long task executor's worker thread
+        def work(task):
+            copy_tree(task, old_folder, self.__sketchpad_basepath__ / name)
+
+        def finish(result):
             if cb is not None:
                 cb()
             QTimer.singleShot(1000, self.zynqtgui.end_long_task)
 
-        self.zynqtgui.do_long_task(task, "Saving a copy of the sketchpad to {name}")
+        self.zynqtgui.do_long_task_in_thread(work, f"Saving a copy of the sketchpad to {name}", on_done=finish, cancellable=True)
 
     @Slot(str, bool)
     def loadSketchpad(self, sketchpad, load_autosave, load_snapshot=True, cb=None, load_last_state_snapshot=False):
-        def task():
-            logging.info(f"Loading sketchpad : {sketchpad}")
-
-            sketchpad_path = Path(sketchpad)
-
+        sketchpad_path = Path(sketchpad)
+
+        # Prepare a regex to check if a sketchpad json is from community-sketchpads
+        community_sketchpads_regex = re.compile(".*/zynthian-my-data/sketchpads/community-sketchpads/.*")
+        # If the regex matches a string, it returns a re.Match object otherwise returns None
+        # We do not need the matched string but instead we just need to check if the string matched.
+        # If string matched the regex, it means the sketchpad is from community and hence ask to create a new sketchpad using the community one as a base
+        is_community_sketchpad = community_sketchpads_regex.match(sketchpad) is not None
+        sketchpad_folder = str(sketchpad_path.parent.absolute()) + "/"
+        sketchpad_name = str(sketchpad_path.stem.replace(".sketchpad", ""))
+        sketchpad_snapshot_path = sketchpad_folder + "soundsets/" + sketchpad_name + ".zss"
+
+        # The file work happens on the long task executor's worker thread, and everything touching the song (or any other
+        # Qt object) happens in steps on the gui thread, so the gui keeps rendering in between
+        def stop_playback():
             # self.zynqtgui.currentTaskMessage = "Stopping playback"
             try:
                 self.zynqtgui.run_stop_metronome_and_playback.emit()
             except:
                 pass
 
-            # Prepare a regex to check if a sketchpad json is from community-sketchpads
-            community_sketchpads_regex = re.compile(".*/zynthian-my-data/sketchpads/community-sketchpads/.*")
-            # If the regex matches a string, it returns a re.Match object otherwise returns None
-            # We do not need the matched string but instead we just need to check if the string matched.
-            # If string matched the regex, it means the sketchpad is from community and hence ask to create a new sketchpad using the community one as a base
-            if community_sketchpads_regex.match(sketchpad) is not None:
-                def _cb():
-                    # Connect all jack ports of respective channel after jack client initialization is done.
-                    for i in range(0, self.__song__.channelsModel.count):
-                        channel = self.__song__.channelsModel.getChannel(i)
-                        channel.update_jack_port()
-
-                    if cb is not None:
-                        cb()
-
-                    if self.zynqtgui.isBootingComplete:
-                        self.zynqtgui.currentTaskMessage = "Finalizing"
-                    self.longOperationDecrement()
-                    QTimer.singleShot(3000, self.zynqtgui.end_long_task)
-
-                self.zynqtgui.currentTaskMessage = "Creating new sketchpad from community sketchpad"
-                # newSketchpad will handle loading snapshot based on the value of load_snapshot
-                self.newSketchpad(sketchpad, _cb, load_snapshot=load_snapshot, force=True)
-            else:
-                logging.info(f"Loading Sketchpad : {str(sketchpad_path.parent.absolute()) + '/'}, {str(sketchpad_path.stem)}")
-                self.zynqtgui.currentTaskMessage = f"Loading Sketchpad:<br />{str(sketchpad_path.parent.name)}"
-                self.sketchpadLoadingInProgress = True
-
-                # Mark old song to be deleted to not perform any operations on it
-                old_song = self.__song__
-                if old_song is not None:
-                    old_song.to_be_deleted()
-
-                # TODO : Remove after a considerable amount of time or when we are sure that all the old sketchpads got updated. Or maybe before a stable release
-                self.checkOldSequencesAndApplyFallback(sketchpad_path)
-                self.__song__ = sketchpad_song.sketchpad_song(str(sketchpad_path.parent.absolute()) + "/", str(sketchpad_path.stem.replace(".sketchpad", "")), self, load_autosave)
-                self.zynqtgui.global_settings.setValue("Sketchpad/lastSelectedSketchpad", str(sketchpad_path))
-
-                if load_snapshot:
-                    snapshot_path = str(sketchpad_path.parent.absolute()) + '/soundsets/' + str(sketchpad_path.stem.replace('.sketchpad', '')) + '.zss'
-                    # Load snapshot
-                    if Path(snapshot_path).exists():
-                        logging.info(f"Loading snapshot : {snapshot_path}")
-                        self.zynqtgui.currentTaskMessage = "Loading Sketchpad : Restoring Snapshot"
-                        self.zynqtgui.screens["layer"].load_snapshot(snapshot_path)
-                    elif Path("/zynthian/zynthian-my-data/snapshots/default.zss").exists():
-                        logging.info(f"Loading default snapshot")
-                        self.zynqtgui.currentTaskMessage = "Loading Sketchpad : Loading Default Snapshot"
-                        self.zynqtgui.screens["layer"].load_snapshot("/zynthian/zynthian-my-data/snapshots/default.zss")
-                if load_last_state_snapshot:
-                    if not self.zynqtgui.screens["snapshot"].load_last_state_snapshot():
-                        # Try loading default snapshot if loading last_state snapshot fails
-                        if not self.zynqtgui.screens["snapshot"].load_default_snapshot():
-                            # Show error if loading default snapshot fails
-                            logging.error("Error loading default snapshot")
-
-                # Update volume controls
-                self.zynqtgui.fixed_layers.fill_list()
-                self.selectedTrackId = 0
-                self.song_changed.emit()
-
-                # Delete old song object after creating a new song instance
-                if old_song is not None:
-                    old_song.deleteLater()
-
-                # Reset last selected item
-                self.lastSelectedObj.reset()
-
+        def new_sketchpad_from_community_sketchpad():
+            def _cb():
                 # Connect all jack ports of respective channel after jack client initialization is done.
                 for i in range(0, self.__song__.channelsModel.count):
                     channel = self.__song__.channelsModel.getChannel(i)
@@ -856,17 +847,109 @@ class zynthian_gui_sketchpad(zynthian_qt_gui_base.zynqtgui):
                 if cb is not None:
                     cb()
 
-                self.sketchpadLoadingInProgress = False
-                self.zynqtgui.zynautoconnect()
-
                 if self.zynqtgui.isBootingComplete:
                     self.zynqtgui.currentTaskMessage = "Finalizing"
                 self.longOperationDecrement()
-                QTimer.singleShot(1000, self.zynqtgui.end_long_task)
+                QTimer.singleShot(3000, self.zynqtgui.end_long_task)
+
+            self.zynqtgui.currentTaskMessage = "Creating new sketchpad from community sketchpad"
+            # newSketchpad will handle loading snapshot based on the value of load_snapshot
+            self.newSketchpad(sketchpad, _cb, load_snapshot=load_snapshot, force=True)
+
+        def begin_loading():
+            logging.info(f"Loading Sketchpad : {str(sketchpad_path.parent.absolute()) + '/'}, {str(sketchpad_path.stem)}")
+            self.zynqtgui.currentTaskMessage = f"Loading Sketchpad:<br />{str(sketchpad_path.parent.name)}"
+            self.sketchpadLoadingInProgress = True
+
+            # Mark old song to be deleted to not perform any operations on it
+            old_song = self.__song__
+            if old_song is not None:
+                old_song.to_be_deleted()
+            return old_song
+
+        def load_song(sketchpad_data):
+            self.__song__ = sketchpad_song.sketchpad_song(sketchpad_folder, sketchpad_name, self, load_autosave, sketchpad_data=sketchpad_data)
+            self.zynqtgui.global_settings.setValue("Sketchpad/lastSelectedSketchpad", str(sketchpad_path))
+
+        def load_snapshots(snapshot_path, snapshot):
+            if load_snapshot:
+                # Load snapshot
+                if snapshot_path == sketchpad_snapshot_path:
+                    logging.info(f"Loading snapshot : {snapshot_path}")
+                    self.zynqtgui.currentTaskMessage = "Loading Sketchpad : Restoring Snapshot"
+                    self.zynqtgui.screens["layer"].load_snapshot(snapshot_path, snapshot=snapshot)
+                elif snapshot_path is not None:
+                    logging.info(f"Loading default snapshot")
+                    self.zynqtgui.currentTaskMessage = "Loading Sketchpad : Loading Default Snapshot"
+                    self.zynqtgui.screens["layer"].load_snapshot(snapshot_path, snapshot=snapshot)
+            if load_last_state_snapshot:
+                if not self.zynqtgui.screens["snapshot"].load_last_state_snapshot():
+                    # Try loading default snapshot if loading last_state snapshot fails
+                    if not self.zynqtgui.screens["snapshot"].load_default_snapshot():
+                        # Show error if loading default snapshot fails
+                        logging.error("Error loading default snapshot")
+
+        def work(task):
+            logging.info(f"Loading sketchpad : {sketchpad}")
+            task.run_on_ui_thread(stop_playback)
+
+            if is_community_sketchpad:
+                # The new sketchpad gets created in a long task of its own, which ends this one once it's done
+                task.run_on_ui_thread(new_sketchpad_from_community_sketchpad)
+                return None
+
+            old_song = task.run_on_ui_thread(begin_loading)
+            # TODO : Remove after a considerable amount of time or when we are sure that all the old sketchpads got updated. Or maybe before a stable release
+            self.checkOldSequencesAndApplyFallback(sketchpad_path)
+            sketchpad_data = self.read_sketchpad_data(sketchpad_folder, sketchpad_name, load_autosave)
+            task.set_progress(0.1)
+            task.run_on_ui_thread(load_song, sketchpad_data)
+            task.set_progress(0.4)
+            snapshot_path, snapshot = self.read_sketchpad_snapshot(sketchpad_snapshot_path) if load_snapshot else (None, None)
+            task.set_progress(0.5)
+            task.run_on_ui_thread(load_snapshots, snapshot_path, snapshot)
+            task.set_progress(0.9)
+            return old_song
+
+        def finish(old_song):
+            if is_community_sketchpad:
+                return
+
+            # Update volume controls
+            self.zynqtgui.fixed_layers.fill_list()
+            self.selectedTrackId = 0
+            self.song_changed.emit()
+
+            # Delete old song object after creating a new song instance
+            if old_song is not None:
+                old_song.deleteLater()
+
+            # Reset last selected item
+            self.lastSelectedObj.reset()
+
+            # Connect all jack ports of respective channel after jack client initialization is done.
+            for i in range(0, self.__song__.channelsModel.count):
+                channel = self.__song__.channelsModel.getChannel(i)
+                channel.update_jack_port()
+
+            if cb is not None:
+                cb()
+
+            self.sketchpadLoadingInProgress = False
+            self.zynqtgui.zynautoconnect()
+
+            if self.zynqtgui.isBootingComplete:
+                self.zynqtgui.currentTaskMessage = "Finalizing"
+            self.longOperationDecrement()
+            QTimer.singleShot(1000, self.zynqtgui.end_long_task)
+
+        def failed(error):
+            self.sketchpadLoadingInProgress = False
+            self.longOperationDecrement()
 
         def confirmLoadSketchpad(params=None):
             self.longOperationIncrement()
-            self.zynqtgui.do_long_task(task, "Loading Sketchpad")
+            self.zynqtgui.do_long_task_in_thread(work, "Loading Sketchpad", on_done=finish, on_error=failed)
 
         if self.zynqtgui.isBootingComplete and self.song.hasUnsavedChanges:
             self.zynqtgui.show_confirm("You have unsaved changes. Do you really want to continue?", confirmLoadSketchpad)
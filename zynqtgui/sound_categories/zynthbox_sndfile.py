@@ -32,6 +32,7 @@ import taglib
 import Zynthbox
 from pathlib import Path
 from PySide2.QtCore import Property, QObject, Signal
+from zynqtgui.utils.sample_store import sample_store
 
 
 class zynthbox_sndfile_metadata(QObject):
@@ -145,6 +146,8 @@ class zynthbox_sndfile_metadata(QObject):
             tags["ZYNTHBOX_SOUND_SYNTH_SLOTS_DATA"] = str(self.__synthSlotsData)
             tags["ZYNTHBOX_SOUND_SAMPLE_SLOTS_DATA"] = str(self.__sampleSlotsData)
             tags["ZYNTHBOX_SOUND_FX_SLOTS_DATA"] = str(self.__fxSlotsData)
+            # The samples are kept in the sample store for as long as this sound refers to them
+            sample_store.instance().set_references(self.sound.path, self.__sampleSnapshot)
             try:
                 logging.debug(f"Writing sound metadata {self.sound} : {self.sound.path}")
                 # file = taglib.File(self.sound.path)
@@ -1,9 +1,16 @@
 # -*- coding: utf-8 -*-
 __all__ = [
+    "file_metadata_index",
     "file_properties_helper",
+    "sample_store",
 ]
 
+from zynqtgui.utils.file_metadata_index import (
+    file_metadata_index,
+)
 from zynqtgui.utils.file_properties_helper import (
     file_properties_helper,
 )
-
+from zynqtgui.utils.sample_store import (
+    sample_store,
+)
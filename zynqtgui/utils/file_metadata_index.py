@@ -0,0 +1,346 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#******************************************************************************
+# ZYNTHIAN PROJECT: Zynthian GUI
+#
+# Persistent index of the metadata of sample and sketch files
+#
+# Copyright (C) 2026 Zynthbox contributors
+#
+#******************************************************************************
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of
+# the License, or any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For a full copy of the GNU General Public License see the LICENSE.txt file.
+#
+#******************************************************************************
+
+import os
+import json
+import logging
+import sqlite3
+import threading
+import mutagen
+import taglib
+
+from soundfile import SoundFile
+
+from zynqtgui import zynthian_gui_config
+
+#------------------------------------------------------------------------------
+# File metadata reading
+#------------------------------------------------------------------------------
+
+AUDIO_EXTENSIONS = (".wav", ".ogg", ".flac", ".mp3")
+# Tags longer than this (the sound and pattern snapshots, mostly) are not kept in the index
+MAX_TAG_LENGTH = 256
+
+
+def is_audio_file(path):
+    return path.lower().endswith(AUDIO_EXTENSIONS)
+
+
+def get_tag(tags, name, default=None):
+    try:
+        value = tags[name][0]
+        if value == "None":
+            # If 'None' value is saved, return default
+            return default
+        return value
+    except:
+        return default
+
+
+# Returns a description of each of the sounds in the given (ZYNTHBOX_SOUND_SNAPSHOT) sound snapshot
+def describe_sound_snapshot(snapshot):
+    descriptions = []
+    plugins_helper = None
+    if zynthian_gui_config.zynqtgui is not None:
+        plugins_helper = zynthian_gui_config.zynqtgui.zynthbox_plugins_helper
+    try:
+        for layer_data in json.loads(snapshot)["layers"]:
+            if plugins_helper is not None:
+                layer_data = plugins_helper.update_layer_snapshot_plugin_id_to_name(layer_data)
+            name = layer_data["engine_name"].split("/")[-1]
+            if name != "":
+                descriptions.append(f"{name} ({layer_data.get('preset_name')})")
+    except Exception as e:
+        logging.error(f"Failed to read sound snapshot: {e}")
+    return descriptions
+
+
+# Reads the metadata of the audio file at the given path, as a dictionary of the index' columns, or None if it can't be read
+def read_file_metadata(path):
+    metadata = {
+        "frames": 0,
+        "sample_rate": 0,
+        "channels": 0,
+        "duration": 0.0,
+        "bpm": None,
+        "key": None,
+        "playback_style": None,
+        "tags": {},
+        "sound_descriptions": [],
+        "is_sketch": False
+    }
+    try:
+        with SoundFile(path) as f:
+            metadata["frames"] = f.frames
+            metadata["sample_rate"] = f.samplerate
+            metadata["channels"] = f.channels
+            metadata["duration"] = f.frames / f.samplerate
+    except Exception:
+        # Not something libsndfile reads (mp3, for older versions of it), so at least find out how long it is
+        try:
+            info = mutagen.File(path).info
+            metadata["sample_rate"] = getattr(info, "sample_rate", 0)
+            metadata["channels"] = getattr(info, "channels", 0)
+            metadata["duration"] = info.length
+            metadata["frames"] = int(info.length * metadata["sample_rate"])
+        except Exception as e:
+            logging.warning(f"Unable to read audio file {path}: {e}")
+            return None
+
+    try:
+        file = taglib.File(path)
+        tags = file.tags
+        file.close()
+    except Exception:
+        tags = {}
+    metadata["tags"] = {name: values[0] for name, values in tags.items() if len(values) > 0 and len(values[0]) <= MAX_TAG_LENGTH}
+    if "ZYNTHBOX_BPM" in tags:
+        metadata["is_sketch"] = True
+        metadata["bpm"] = get_tag(tags, "ZYNTHBOX_BPM", 0)
+        metadata["key"] = get_tag(tags, "ZYNTHBOX_ROOT_NOTE", None)
+        metadata["playback_style"] = get_tag(tags, "ZYNTHBOX_PLAYBACK_STYLE", "LoopingPlaybackStyle").split(".")[-1]
+        snapshot = get_tag(tags, "ZYNTHBOX_SOUND_SNAPSHOT", None)
+        if snapshot is not None:
+            metadata["sound_descriptions"] = describe_sound_snapshot(snapshot)
+    return metadata
+
+#------------------------------------------------------------------------------
+# File metadata index
+#
+# An SQLite database of the metadata of audio files, keyed by path, and valid
+# for as long as the file's size and modification time are unchanged. Looking
+# up a file (or a whole folder, which is a single query on the indexed folder
+# column) only needs a stat of each file, and files which are new or changed
+# are read and added on the fly. A scanner thread walks the sample, sketch and
+# capture folders in the background after booting, so most lookups don't need
+# to read anything at all, and forgets about files which no longer exist.
+#------------------------------------------------------------------------------
+
+class file_metadata_index(object):
+
+    index_fpath = os.environ.get('ZYNTHIAN_CONFIG_DIR', "/zynthian/config") + "/file_metadata_index.sqlite"
+    # Bump this whenever the schema or the contents of the columns change, to force a regeneration
+    index_version = 1
+    # Time in seconds between scans of the folders
+    scan_interval = 600
+    # Time in seconds the scanner pauses after reading a file, to keep it out of the way of everything else
+    scan_pause = 0.02
+    scan_folders = [
+        os.environ.get('ZYNTHIAN_MY_DATA_DIR', "/zynthian/zynthian-my-data") + "/samples",
+        os.environ.get('ZYNTHIAN_MY_DATA_DIR', "/zynthian/zynthian-my-data") + "/sketches",
+        os.environ.get('ZYNTHIAN_MY_DATA_DIR', "/zynthian/zynthian-my-data") + "/capture"
+    ]
+
+    columns = ["frames", "sample_rate", "channels", "duration", "bpm", "key", "playback_style", "tags", "sound_descriptions", "is_sketch"]
+
+    __instance = None
+
+    def __init__(self, fpath=None):
+        self.fpath = fpath if fpath is not None else self.index_fpath
+        self.lock = threading.RLock()
+        self.db = None
+        self.scanner = None
+        self.scanner_stop = threading.Event()
+
+    @staticmethod
+    def instance():
+        if file_metadata_index.__instance is None:
+            file_metadata_index.__instance = file_metadata_index()
+        return file_metadata_index.__instance
+
+    def get_db(self):
+        with self.lock:
+            if self.db is None:
+                self.db = self.open_db()
+            return self.db
+
+    def open_db(self):
+        try:
+            os.makedirs(os.path.dirname(self.fpath), exist_ok=True)
+            db = sqlite3.connect(self.fpath, check_same_thread=False)
+            version = db.execute("PRAGMA user_version").fetchone()[0]
+            if version != self.index_version:
+                if version != 0:
+                    logging.info(f"File metadata index has version {version}, expected {self.index_version}. Regenerating.")
+                db.execute("DROP TABLE IF EXISTS files")
+        except Exception as e:
+            # A broken database is no worse than an empty one, start over
+            logging.warning(f"Opening file metadata index failed, regenerating: {e}")
+            try:
+                os.remove(self.fpath)
+            except FileNotFoundError:
+                pass
+            db = sqlite3.connect(self.fpath, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("""CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY,
+            folder TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            frames INTEGER,
+            sample_rate INTEGER,
+            channels INTEGER,
+            duration REAL,
+            bpm TEXT,
+            key TEXT,
+            playback_style TEXT,
+            tags TEXT,
+            sound_descriptions TEXT,
+            is_sketch INTEGER
+        )""")
+        db.execute("CREATE INDEX IF NOT EXISTS files_folder ON files (folder)")
+        db.execute(f"PRAGMA user_version={self.index_version}")
+        db.commit()
+        return db
+
+    def row_to_metadata(self, row):
+        metadata = dict(zip(self.columns, row))
+        metadata["tags"] = json.loads(metadata["tags"])
+        metadata["sound_descriptions"] = json.loads(metadata["sound_descriptions"])
+        metadata["is_sketch"] = bool(metadata["is_sketch"])
+        return metadata
+
+    def store(self, db, path, stat, metadata):
+        db.execute(
+            f"INSERT OR REPLACE INTO files (path, folder, size, mtime_ns, {', '.join(self.columns)}) VALUES ({', '.join(['?'] * (len(self.columns) + 4))})",
+            [path, os.path.dirname(path), stat.st_size, stat.st_mtime_ns,
+             metadata["frames"], metadata["sample_rate"], metadata["channels"], metadata["duration"],
+             metadata["bpm"], metadata["key"], metadata["playback_style"],
+             json.dumps(metadata["tags"]), json.dumps(metadata["sound_descriptions"]), int(metadata["is_sketch"])])
+
+    # Returns the metadata of the audio file at the given path (see read_file_metadata), from the index when it is up to date
+    def get(self, path):
+        path = os.path.abspath(str(path))
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        with self.lock:
+            db = self.get_db()
+            row = db.execute(f"SELECT size, mtime_ns, {', '.join(self.columns)} FROM files WHERE path=?", (path,)).fetchone()
+            if row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+                return self.row_to_metadata(row[2:])
+        metadata = read_file_metadata(path)
+        if metadata is not None:
+            with self.lock:
+                self.store(db, path, stat, metadata)
+                db.commit()
+        return metadata
+
+    # Returns the metadata of the audio files in the given folder, by path, reading those which are not in the index (or changed) yet
+    def get_folder(self, folder):
+        folder = os.path.abspath(str(folder))
+        stats = {}
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if is_audio_file(entry.name) and entry.is_file():
+                        stats[entry.path] = entry.stat()
+        except OSError as e:
+            logging.warning(f"Unable to list {folder}: {e}")
+            return {}
+
+        result = {}
+        with self.lock:
+            db = self.get_db()
+            for row in db.execute(f"SELECT path, size, mtime_ns, {', '.join(self.columns)} FROM files WHERE folder=?", (folder,)):
+                stat = stats.get(row[0])
+                if stat is not None and row[1] == stat.st_size and row[2] == stat.st_mtime_ns:
+                    result[row[0]] = self.row_to_metadata(row[3:])
+
+        missing = {path: stat for path, stat in stats.items() if path not in result}
+        if len(missing) > 0:
+            read = {path: read_file_metadata(path) for path in missing}
+            with self.lock:
+                for path, metadata in read.items():
+                    if metadata is not None:
+                        self.store(db, path, missing[path], metadata)
+                        result[path] = metadata
+                db.execute(f"DELETE FROM files WHERE folder=? AND path NOT IN ({', '.join(['?'] * len(stats))})", [folder] + list(stats.keys()))
+                db.commit()
+        return result
+
+    # Bring the index up to date for all the audio files in the given folders (and their subfolders), and forget about those which are gone
+    def scan(self, folders):
+        for folder in folders:
+            for dirpath, dirnames, filenames in os.walk(folder, followlinks=False):
+                if self.scanner_stop.is_set():
+                    return
+                dirnames.sort()
+                for fname in sorted(filenames):
+                    if self.scanner_stop.is_set():
+                        return
+                    if not is_audio_file(fname):
+                        continue
+                    path = os.path.join(dirpath, fname)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    with self.lock:
+                        db = self.get_db()
+                        row = db.execute("SELECT size, mtime_ns FROM files WHERE path=?", (path,)).fetchone()
+                    if row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+                        continue
+                    metadata = read_file_metadata(path)
+                    if metadata is not None:
+                        with self.lock:
+                            self.store(db, path, stat, metadata)
+                            db.commit()
+                    self.scanner_stop.wait(self.scan_pause)
+
+        with self.lock:
+            db = self.get_db()
+            paths = [row[0] for row in db.execute("SELECT path FROM files")]
+        gone = [path for path in paths if not os.path.isfile(path)]
+        if len(gone) > 0:
+            logging.debug(f"Removing {len(gone)} files which no longer exist from the file metadata index")
+            with self.lock:
+                db.executemany("DELETE FROM files WHERE path=?", [(path,) for path in gone])
+                db.commit()
+
+    def start_scanner(self):
+        if self.scanner is not None:
+            return
+        self.scanner_stop.clear()
+        self.scanner = threading.Thread(target=self.scanner_loop, name="file metadata index scanner", daemon=True)
+        self.scanner.start()
+
+    def scanner_loop(self):
+        while not self.scanner_stop.is_set():
+            try:
+                self.scan(self.scan_folders)
+            except Exception as e:
+                logging.error(f"Scanning for the file metadata index failed: {e}")
+            self.scanner_stop.wait(self.scan_interval)
+
+    def stop_scanner(self):
+        self.scanner_stop.set()
+        if self.scanner is not None:
+            self.scanner.join()
+            self.scanner = None
+
+#------------------------------------------------------------------------------
@@ -10,7 +10,8 @@ from PySide2.QtCore import Property, QMimeDatabase, QObject, Signal, Slot
 from pathlib import Path
 from PySide2.QtGui import QIcon
 from PySide2.QtWidgets import QApplication, QStyle
-from soundfile import SoundFile
+from zynqtgui.utils.file_metadata_index import file_metadata_index
+from zynqtgui.utils.sample_store import sample_store
 
 # Function by Fred Cirera - https://web.archive.org/web/20111010015624/http://blogmag.net/blog/read/38/Print_human_readable_file_size
 def sizeof_fmt(num, suffix="B"):
@@ -170,6 +171,9 @@ class file_properties_helper(QObject):
                 for key, value in values.items():
                     file.tags[key] = [str(value)]
                 file.save()
+                if "ZYNTHBOX_SAMPLES" in values:
+                    # The samples are kept in the sample store for as long as this file refers to them
+                    sample_store.instance().set_references(filename, values["ZYNTHBOX_SAMPLES"])
             except Exception as e:
                 logging.error(f"Error writing metadata : {str(e)}")
                 logging.info(f"Trying to create a new file without metadata")
@@ -203,74 +207,22 @@ class file_properties_helper(QObject):
 
     @staticmethod
     def getWavData(path):
-        def getMetadataProperty(metadata, name, default=None):
-            try:
-                value = metadata[name][0]
-                if value == "None":
-                    # If 'None' value is saved, return default
-                    return default
-                return value
-            except:
-                return default
-        try:
-            f = SoundFile(path)
-            try:
-                file = taglib.File(path)
-                metadata = file.tags
-                file.close()
-            except Exception as e:
-                metadata = {}
-            if "ZYNTHBOX_BPM" in metadata:
-                snapshot = getMetadataProperty(metadata, "ZYNTHBOX_SOUND_SNAPSHOT", None)
-                soundDescriptions = []
-                if snapshot is not None:
-                    # This is so we don't have to import the layers code from parent, but... maybe we want to, or it wants to live elsewhere, or... something
-                    try:
-                        data = []
-                        layers = JSONDecoder().decode(snapshot)
-                        for layer_data in layers["layers"]:
-                            layer_snapshot = self.zynqtgui.zynthbox_plugins_helper.update_layer_snapshot_plugin_id_to_name(layer_data)
-                            #if not layer_snapshot["midi_chan"] in data:
-                                #data[layer_snapshot["midi_chan"]] = []
-                            item = {"name": layer_snapshot["engine_name"].split("/")[-1]}
-                            if "midi_chan" in layer_snapshot:
-                                item["midi_chan"] = layer_snapshot["midi_chan"]
-                            else:
-                                item["midi_chan"] = -1
-                            if "slot_index" in layer_snapshot:
-                                item["slot_index"] = layer_snapshot["slot_index"]
-                            if "bank_name" in layer_snapshot:
-                                item["bank_name"] = layer_snapshot["bank_name"]
-                            if "preset_name" in layer_snapshot:
-                                item["preset_name"] = layer_snapshot["preset_name"]
-                            if "engine_type" in layer_snapshot:
-                                item["engine_type"] = layer_snapshot["engine_type"]
-                            data.append(item)
-                        for entry in data:
-                            if entry["name"] != "":
-                                soundDescriptions.append(f"{entry['name']} ({entry['preset_name']})")
-                    except Exception as e:
-                        logging.error(e)
-                return {
-                    "frames": f.frames,
-                    "sampleRate": f.samplerate,
-                    "channels": f.channels,
-                    "duration": f.frames/f.samplerate,
-                    "zynthbox": {
-                        "bpm": getMetadataProperty(metadata, "ZYNTHBOX_BPM", 0),
-                        "playbackStyle": getMetadataProperty(metadata, "ZYNTHBOX_PLAYBACK_STYLE", "LoopingPlaybackStyle").split(".")[-1],
-                        "soundDescriptions": soundDescriptions
-                    }
-                }
-            else:
-                return {
-                    "frames": f.frames,
-                    "sampleRate": f.samplerate,
-                    "channels": f.channels,
-                    "duration": f.frames/f.samplerate
-                }
-        except:
+        metadata = file_metadata_index.instance().get(path)
+        if metadata is None:
             return []
+        data = {
+            "frames": metadata["frames"],
+            "sampleRate": metadata["sample_rate"],
+            "channels": metadata["channels"],
+            "duration": metadata["duration"]
+        }
+        if metadata["is_sketch"]:
+            data["zynthbox"] = {
+                "bpm": metadata["bpm"],
+                "playbackStyle": metadata["playback_style"],
+                "soundDescriptions": metadata["sound_descriptions"]
+            }
+        return data
 
     @Slot(int)
     def playPreview(self, velocity):
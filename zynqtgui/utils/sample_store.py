@@ -0,0 +1,321 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ******************************************************************************
+# ZYNTHIAN PROJECT: Zynthian GUI
+#
+# Sample Store: Content addressed storage for the samples referenced by sample snapshots
+#
+# Copyright (C) 2026 Zynthbox contributors
+#
+# ******************************************************************************
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of
+# the License, or any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For a full copy of the GNU General Public License see the LICENSE.txt file.
+#
+# ******************************************************************************
+import base64
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+import taglib
+import Zynthbox
+
+from contextlib import contextmanager
+from pathlib import Path
+from threading import RLock, Thread
+
+
+class sample_store(object):
+    """
+    Holds one copy of each sample referenced by a sample snapshot (the ZYNTHBOX_SAMPLES tag of
+    sketches, and the sample snapshot of sounds), named by the hash of its contents, so snapshots
+    only need to carry the digest of each sample, rather than the whole file encoded as base64.
+
+    The files which contain snapshots (the referrers) are tracked along with the digests they
+    reference, which makes for a reference count of each sample. Files which were copied without
+    the store being told (by copying a sketchpad, or by hand) are found by collect_garbage(), which
+    looks through the folders holding snapshots before it removes any sample, so only samples which
+    no file on the device references are removed. As snapshots are also taken for copying between
+    slots, samples which were never referenced are kept for a grace period before they are removed.
+
+    Files leaving the device need to carry their samples with them, which export_file() takes care
+    of, by writing a copy with the sample data embedded into its snapshot. Snapshots made before the
+    store existed carry the sample data as well, and can still be loaded.
+    """
+    __instance__ = None
+
+    store_path = Path(os.environ.get('ZYNTHIAN_MY_DATA_DIR', "/zynthian/zynthian-my-data")) / "sample-store"
+    # The folders holding the files which contain sample snapshots
+    referrer_roots = [Path(os.environ.get('ZYNTHIAN_MY_DATA_DIR', "/zynthian/zynthian-my-data")) / folder for folder in ["sketchpads", "sketches", "sounds"]]
+    # The tag holding the sample snapshot, by the suffix of the file it is in
+    snapshot_tags = {".wav": "ZYNTHBOX_SAMPLES", ".snd": "ZYNTHBOX_SOUND_SAMPLE_SNAPSHOT"}
+    # Time in seconds an unreferenced sample is kept in the store
+    grace_period = 24 * 60 * 60
+
+    def __init__(self, store_path=None):
+        self.__store_path__ = Path(store_path) if store_path is not None else sample_store.store_path
+        self.__references_path__ = self.__store_path__ / "references.json"
+        self.__lock__ = RLock()
+        # The referrers, keyed by path, as {"mtime", "digests"}, where mtime is the modification time the file was last
+        # read at (or None if its snapshot was handed to us, and not read from the file)
+        self.__references__ = None
+        # The digests of files added to the store, keyed by path, with the size and modification time they were hashed at
+        self.__digests__ = {}
+
+    @staticmethod
+    def instance():
+        if sample_store.__instance__ is None:
+            sample_store.__instance__ = sample_store()
+        return sample_store.__instance__
+
+    @staticmethod
+    def hash_file(path):
+        hasher = hashlib.blake2b(digest_size=20)
+        with open(path, "rb") as file:
+            for block in iter(lambda: file.read(1024 * 1024), b""):
+                hasher.update(block)
+        return hasher.hexdigest()
+
+    def sample_path(self, digest):
+        return self.__store_path__ / digest[0:2] / digest
+
+    def has_sample(self, digest):
+        return self.sample_path(digest).exists()
+
+    # Add the sample at the given path to the store (unless it's already in there), and return its digest
+    def add(self, path):
+        stat = os.stat(path)
+        key = (stat.st_size, stat.st_mtime_ns)
+        with self.__lock__:
+            cached = self.__digests__.get(str(path))
+        if cached is not None and cached[0] == key and self.has_sample(cached[1]):
+            return cached[1]
+        digest = sample_store.hash_file(path)
+        sample_path = self.sample_path(digest)
+        if not sample_path.exists():
+            sample_path.parent.mkdir(parents=True, exist_ok=True)
+            # Copy to a temporary file first, so a crash while copying doesn't leave a broken sample behind
+            temporary_path = sample_path.with_name(f"{digest}.tmp")
+            shutil.copyfile(path, temporary_path)
+            os.replace(temporary_path, sample_path)
+        else:
+            # Restart the grace period, as the sample is about to be referenced again
+            os.utime(sample_path)
+        with self.__lock__:
+            self.__digests__[str(path)] = (key, digest)
+        return digest
+
+    # Yields the path of a file containing the sample data of the given snapshot entry, named by the entry's filename,
+    # or None if the sample data is not available (the digest is unknown to the store, and there is no embedded data)
+    @contextmanager
+    def materialize(self, entry):
+        filename = entry.get("filename", "")
+        sample_path = self.sample_path(entry["digest"]) if len(entry.get("digest", "")) > 0 else None
+        if len(filename) == 0:
+            yield None
+        elif sample_path is not None and sample_path.exists():
+            with tempfile.TemporaryDirectory() as tmp:
+                # A link is enough, as anything using the sample copies it anyway
+                temporary_file = Path(tmp) / filename
+                os.symlink(sample_path, temporary_file)
+                yield str(temporary_file)
+        elif len(entry.get("sampledata", "")) > 0:
+            # An exported snapshot, or one from before the sample store, which has the sample data embedded
+            with tempfile.TemporaryDirectory() as tmp:
+                temporary_file = Path(tmp) / filename
+                with open(temporary_file, "wb") as file:
+                    file.write(base64.b64decode(entry["sampledata"]))
+                yield str(temporary_file)
+        else:
+            if sample_path is not None:
+                logging.error(f"The sample {filename} ({entry['digest']}) is not in the sample store")
+            yield None
+
+    # Returns the given snapshot (as a json string) with the data of each of its samples embedded, for a file leaving the device
+    def embed_sample_data(self, snapshot):
+        snapshot_obj = json.loads(snapshot) if type(snapshot) is str else snapshot
+        for entry in snapshot_obj.values():
+            if len(entry.get("digest", "")) > 0 and len(entry.get("sampledata", "")) == 0:
+                sample_path = self.sample_path(entry["digest"])
+                if sample_path.exists():
+                    with open(sample_path, "rb") as file:
+                        entry["sampledata"] = base64.b64encode(file.read()).decode("utf-8")
+                else:
+                    logging.error(f"The sample {entry.get('filename', '')} ({entry['digest']}) is not in the sample store, so it can't be embedded")
+        return json.dumps(snapshot_obj)
+
+    # Returns the sample snapshot in the file at the given path (a sketch or a sound), or None if it has none
+    @staticmethod
+    def read_snapshot(path):
+        tag = sample_store.snapshot_tags.get(Path(path).suffix.lower())
+        if tag == "ZYNTHBOX_SAMPLES":
+            file = taglib.File(str(path))
+            try:
+                values = file.tags.get(tag, [])
+                return values[0] if len(values) > 0 else None
+            finally:
+                file.close()
+        elif tag is not None:
+            return Zynthbox.AudioTagHelper.instance().readWavMetadata(str(path)).get(tag)
+        return None
+
+    # Write a copy of the sketch or sound at source to destination, with the sample data its snapshot refers to embedded,
+    # so the copy stays usable off the device. Returns whether the copy was written
+    def export_file(self, source, destination):
+        tag = sample_store.snapshot_tags.get(Path(source).suffix.lower())
+        try:
+            shutil.copy2(source, destination)
+            snapshot = sample_store.read_snapshot(source)
+            if snapshot is not None and len(sample_store.snapshot_digests(snapshot)) > 0:
+                snapshot = self.embed_sample_data(snapshot)
+                if tag == "ZYNTHBOX_SAMPLES":
+                    file = taglib.File(str(destination))
+                    file.tags[tag] = [snapshot]
+                    file.save()
+                    file.close()
+                else:
+                    tags = Zynthbox.AudioTagHelper.instance().readWavMetadata(str(destination))
+                    tags[tag] = snapshot
+                    Zynthbox.AudioTagHelper.instance().saveWavMetadata(str(destination), tags)
+            return True
+        except Exception as e:
+            logging.error(f"Failed to export {source} to {destination} : {e}")
+            return False
+
+    @staticmethod
+    def snapshot_digests(snapshot):
+        digests = set()
+        try:
+            snapshot_obj = json.loads(snapshot) if type(snapshot) is str else snapshot
+            for entry in snapshot_obj.values():
+                if len(entry.get("digest", "")) > 0:
+                    digests.add(entry["digest"])
+        except Exception:
+            pass
+        return digests
+
+    def load_references(self):
+        with self.__lock__:
+            if self.__references__ is None:
+                try:
+                    with open(self.__references_path__) as file:
+                        self.__references__ = {referrer: {"mtime": reference["mtime"], "digests": set(reference["digests"])} for referrer, reference in json.load(file).items()}
+                except FileNotFoundError:
+                    self.__references__ = {}
+                except Exception as e:
+                    logging.error(f"Failed to load the sample store references, starting over: {e}")
+                    self.__references__ = {}
+            return self.__references__
+
+    def save_references(self):
+        with self.__lock__:
+            try:
+                self.__store_path__.mkdir(parents=True, exist_ok=True)
+                temporary_path = self.__references_path__.with_suffix(".tmp")
+                with open(temporary_path, "w") as file:
+                    json.dump({referrer: {"mtime": reference["mtime"], "digests": sorted(reference["digests"])} for referrer, reference in self.__references__.items()}, file)
+                os.replace(temporary_path, self.__references_path__)
+            except Exception as e:
+                logging.error(f"Failed to save the sample store references: {e}")
+
+    # Record that the file at the given path contains the given sample snapshot (replacing what it referenced before)
+    def set_references(self, referrer, snapshot, mtime=None):
+        digests = sample_store.snapshot_digests(snapshot)
+        referrer = str(referrer)
+        with self.__lock__:
+            references = self.load_references()
+            reference = references.get(referrer)
+            if reference is not None and reference["digests"] == digests and reference["mtime"] == mtime:
+                return
+            # Files read without finding any samples are remembered too, so they are not read again until they change
+            if len(digests) > 0 or mtime is not None:
+                references[referrer] = {"mtime": mtime, "digests": digests}
+            else:
+                references.pop(referrer, None)
+            self.save_references()
+
+    # The number of referrers referencing each of the samples, keyed by digest
+    def reference_counts(self):
+        counts = {}
+        with self.__lock__:
+            for reference in self.load_references().values():
+                for digest in reference["digests"]:
+                    counts[digest] = counts.get(digest, 0) + 1
+        return counts
+
+    # Forget about referrers which no longer exist
+    def forget_missing_referrers(self):
+        with self.__lock__:
+            references = self.load_references()
+            gone = [referrer for referrer in references if not os.path.exists(referrer)]
+            for referrer in gone:
+                references.pop(referrer)
+            if len(gone) > 0:
+                self.save_references()
+
+    # Look through the folders holding snapshots for referrers we were not told about (or which changed since they were
+    # last read)
+    def find_referrers(self):
+        with self.__lock__:
+            known = {referrer: reference["mtime"] for referrer, reference in self.load_references().items()}
+        for root in self.referrer_roots:
+            for dirpath, _, filenames in os.walk(root):
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    if Path(filename).suffix.lower() not in self.snapshot_tags:
+                        continue
+                    try:
+                        mtime = os.stat(path).st_mtime_ns
+                        if path in known and known[path] == mtime:
+                            continue
+                        self.set_references(path, sample_store.read_snapshot(path), mtime)
+                    except Exception as e:
+                        logging.error(f"Failed to read the sample snapshot of {path} : {e}")
+
+    # Remove the samples which no file references any longer (and which are past their grace period)
+    def collect_garbage(self):
+        if not self.__store_path__.exists():
+            return
+        now = time.time()
+
+        def find_unreferenced():
+            counts = self.reference_counts()
+            unreferenced = []
+            for sample_path in self.__store_path__.glob("??/*"):
+                try:
+                    if counts.get(sample_path.name, 0) == 0 and now - sample_path.stat().st_mtime > self.grace_period:
+                        unreferenced.append(sample_path)
+                except OSError:
+                    pass
+            return unreferenced
+
+        self.forget_missing_referrers()
+        if len(find_unreferenced()) == 0:
+            return
+        # Before removing anything, make sure the references are complete, as files can be copied without us knowing
+        self.find_referrers()
+        removed = 0
+        for sample_path in find_unreferenced():
+            try:
+                sample_path.unlink()
+                removed += 1
+            except OSError as e:
+                logging.error(f"Failed to remove {sample_path} from the sample store: {e}")
+        if removed > 0:
+            logging.info(f"Removed {removed} samples which are no longer referenced from the sample store")
+
+    def start_garbage_collection(self):
+        Thread(target=self.collect_garbage, daemon=True).start()
@@ -33,6 +33,7 @@ import time
 from pathlib import Path
 from threading import Thread
 from PySide2.QtCore import QMetaObject, Qt, Property, QObject, QTimer, Signal, Slot
+from zynqtgui.utils.sample_store import sample_store
 import Zynthbox
 
 ### Bi-directional communication channel between Webconf and Zynthbox QML
@@ -192,6 +193,13 @@ class webconf_fifo_handler(QObject):
     #       slot (that is, in the snd or sketch) is empty, the destination slot will be cleared.
     #     * if they are not set, we will attempt to load the given file into the specified slot
     #     * the type of the given file must (hopefully obviously) contain suitable data for the destination
+    # files
+    #   export - writes a copy of a sketch (.sketch.wav) or sound (.snd) for taking off the device
+    #     required: params
+    #     * params contains two entries, the absolute path of the file to export, and the absolute path to write the copy to
+    #     * the samples in the file are otherwise only referred to (by their digest in the sample store on the device),
+    #       and the copy has their data embedded, so it can be loaded anywhere. Download the copy, not the original
+    #     * success is sent once the copy has been written
     #
     # ### /-Separated Commands ###
     #
@@ -425,6 +433,24 @@ class webconf_fifo_handler(QObject):
                             logging.error(f"Missing params field for snd processing in {jsonData}")
                             jsonData["messageType"] = "error"
                             jsonData["description"] = "Missing params field for snd processing"
+            case "files":
+                match jsonData["command"]:
+                    case "export":
+                        if "params" in jsonData and len(jsonData["params"]) == 2 and os.path.exists(jsonData["params"][0]):
+                            def work(task):
+                                return sample_store.instance().export_file(jsonData["params"][0], jsonData["params"][1])
+                            def finish(result):
+                                if result:
+                                    jsonData["messageType"] = "success"
+                                else:
+                                    jsonData["messageType"] = "error"
+                                    jsonData["description"] = "Failed to write the exported copy of the file"
+                                self.send(json.dumps(jsonData, separators=(',', ':')))
+                                self.core_gui.end_long_task()
+                            self.core_gui.do_long_task_in_thread(work, f"Exporting {Path(jsonData['params'][0]).name}", on_done=finish)
+                        else:
+                            jsonData["messageType"] = "error"
+                            jsonData["description"] = "Missing or incorrect params field for exporting a file (the list should contain the path of an existing file, and the path to write the copy to)"
             case "sketchpad":
                 match jsonData["command"]:
                     case "new":
@@ -26,7 +26,6 @@
 import os
 import sys
 import logging
-import mutagen
 import threading
 from time import sleep
 from os.path import isfile, isdir, join, basename
@@ -38,6 +37,7 @@ from . import zynthian_gui_config
 from . import zynthian_gui_selector
 from . import zynthian_gui_controller
 from zyngine import zynthian_controller
+from .utils.file_metadata_index import file_metadata_index
 
 #------------------------------------------------------------------------------
 # Zynthian Audio Recorder GUI Class
@@ -145,12 +145,13 @@ class zynthian_gui_audio_recorder(zynthian_gui_selector):
                         'ext': fext
                     }
 
+        metadata = file_metadata_index.instance().get_folder(src_dir)
         for fname in res:
             try:
-                res[fname]['length'] = mutagen.File(res[fname]['fpath']).info.length
-            except Exception as e:
+                res[fname]['length'] = metadata[os.path.abspath(res[fname]['fpath'])]['duration']
+            except KeyError:
                 res[fname]['length'] = 0
-                logging.warning(e)
+                logging.warning(f"Unable to read the length of {res[fname]['fpath']}")
 
         return res
 
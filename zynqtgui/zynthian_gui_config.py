@@ -153,6 +153,8 @@ custom_switch_midi_events = []
 
 snapshot_mixer_settings=int(os.environ.get('ZYNTHIAN_UI_SNAPSHOT_MIXER_SETTINGS',False))
 show_cpu_status=int(os.environ.get('ZYNTHIAN_UI_SHOW_CPU_STATUS',False))
+# How many jalv plugin hosts to keep started ahead of time, for the most used plugins (0 to disable)
+jalv_pool_size=int(os.environ.get('ZYNTHIAN_UI_JALV_POOL_SIZE',2))
 
 #------------------------------------------------------------------------------
 # Audio Options
@@ -29,13 +29,13 @@ import os
 from time import sleep
 from datetime import datetime
 from pathlib import Path
-from json import JSONEncoder, JSONDecoder
-import json
+from json import JSONEncoder
 
 # Zynthian specific modules
 from . import zynthian_gui_config
 from . import zynthian_gui_controller
 from . import zynthian_gui_selector
+from .zynthian_gui_control_mod_registry import zynthian_gui_control_mod_registry
 
 # Qt modules
 from PySide2.QtCore import QTimer, Qt, QObject, Slot, Signal, Property, QAbstractListModel, QModelIndex, QByteArray
@@ -128,6 +128,7 @@ class zynthian_gui_control(zynthian_gui_selector):
         self.custom_controller_id_start = 100
 
         self.__preferred_modpack__ = ""
+        self.__mod_registry__ = zynthian_gui_control_mod_registry()
         Path("/zynthian/zynthian-my-data/mods/community-mods").mkdir(exist_ok=True, parents=True)
         Path("/zynthian/zynthian-my-data/mods/default-mods").mkdir(exist_ok=True, parents=True)
         Path("/zynthian/zynthian-my-data/mods/my-mods").mkdir(exist_ok=True, parents=True)
@@ -210,73 +211,8 @@ class zynthian_gui_control(zynthian_gui_selector):
     def get_single_effect_engine(self):
         return self.__single_effect_engine
 
-    def searchThroughModPack(self, modPackRoot):
-        discoveredMods = []
-        discoveredModpacks = []
-        if Path(modPackRoot).exists():
-            for folder in [f for f in os.scandir(modPackRoot) if f.is_dir()]:
-                manifestPath = folder.path + "/manifest.json"
-                metadataPath = folder.path + "/metadata.json"
-                if Path(manifestPath).exists():
-                    try:
-                        logging.debug(f"Found a mod-pack, with metadata in file path {manifestPath} - loading")
-                        with open(manifestPath, "r") as f:
-                            obj = json.loads(f.read())
-                            modPackName = folder.name
-                            if "Name" in obj:
-                                modPackName = obj["Name"]
-                            discoveredModpacks.append({
-                                    "display": modPackName,
-                                    "path": folder.path
-                                })
-                            mods, modpacks = self.searchThroughModPack(folder.path)
-                            discoveredMods.extend(mods)
-                            discoveredModpacks.extend(modpacks)
-                    except Exception as e:
-                        logging.error(f"Error while handling mod-pack manifest for {manifestPath}: {e}")
-                        continue
-                elif Path(metadataPath).exists():
-                    try:
-                        logging.debug(f"Found a mod, with the metadata file path {metadataPath} - loading")
-                        with open(metadataPath, "r") as f:
-                            obj = json.loads(f.read())
-
-                            modName = folder.name
-                            if "Name" in obj:
-                                modName = obj["Name"]
-
-                            modEngines = []
-                            if "Engines" in obj:
-                                modEngines = obj["Engines"]
-                            # If defined, but actually empty, then don't add anything
-                            if "Engine" in obj and obj["Engine"] != "":
-                                modEngines.append(obj["Engine"])
-
-                            modType = 0
-                            if "Type" in obj:
-                                if obj["Type"] == 1 or obj["Type"] == 2:
-                                    modType = obj["Type"]
-
-                            discoveredMods.append({
-                                    "display": modName,
-                                    "path": folder.path,
-                                    "engines": modEngines,
-                                    "type": modType
-                                })
-                            logging.error(f"Added entry to the registry: {discoveredMods[-1]}")
-                    except Exception as e:
-                        logging.error(f"Error while handling manifest: {e}")
-                        continue
-                else:
-                    # If there is no metadata file, then this is not a mod, and we can assume it's a mod pack, so try and look deeper
-                    mods, modpacks = self.searchThroughModPack(folder.path)
-                    discoveredMods.extend(mods)
-                    discoveredModpacks.extend(modpacks)
-        else:
-            logging.error(f"The given mod pack root does not exist on disk: {modPackRoot}")
-        return discoveredMods, discoveredModpacks
-
-    # This updates the internal registry for mods, and saves that registry to disk for load_registry to load
+    # This updates the internal registry for mods, and saves that registry to disk for loadRegistry to load
+    # Only the folders which changed since the registry was last updated are read again (see zynthian_gui_control_mod_registry)
     # The mod registry contains a flat list of all the mods, with all entries containing the following keys:
     # - display: The human-readable display name
     # - path: The on-disk path for the folder containing the mod (that is, the folder which contains the manifest file)
@@ -284,52 +220,17 @@ class zynthian_gui_control(zynthian_gui_selector):
     # - type: A number from 0 through 2: 0 meaning "supports all engine types", 1 meaning "synth engines only", 2 meaning "fx engines only". 0 is the default, and fallback for invalid values
     @Slot(None)
     def updateRegistry(self):
-        self.__mod_registry__ = []
-        self.__modpack_registry__ = []
-        # The mods are expected to exist in my-data, underneath the mods folder, inside which are three further folders, one for the defaults, one for the user's own ones, and one for community ones (which then has the extra subfolders store-userID/productID/), and finally for any built-ins
-        # Each of these searched folders then in turn has either folders with mods in, or mod-packs (which is a folder, which has mods or mod-packs in it). That is, a mod-pack can be recursive, but mods cannot
-        searchRoots = ["/zynthian/zynthian-my-data/mods/community-mods", "/zynthian/zynthian-my-data/mods/default-mods", "/zynthian/zynthian-my-data/mods/my-mods", "/zynthian/zynthbox-qml/qml-ui/engineeditpages"]
-        # Recurse through the directory structures, treating each of the roots as a mod pack (which we can do, since we assume that the only place a mod pack ends is at the discovery of a mod, or we run out of directories)
-        for searchRoot in searchRoots:
-            mods, modpacks = self.searchThroughModPack(searchRoot)
-            self.__mod_registry__.extend(mods)
-            self.__modpack_registry__.extend(modpacks)
-        logging.debug(f"Mod registry now contains:\n{self.__mod_registry__}")
-        # Finally, save the registry to disk
-        modregistryFile = "/zynthian/config/control_page.modregistry"
-        try:
-            with open("/zynthian/config/control_page.modregistry", "w") as f:
-                data = json.dumps({"mods": self.__mod_registry__, "modpacks": self.__modpack_registry__})
-                f.write(data)
-                f.flush()
-                os.fsync(f.fileno())
-        except Exception as e:
-            logging.error(f"Error while writing mod registry: {e}")
-
-    # This loads the registry from disk (and if there isn't one, creates that registry)
-    def loadRegistry(self):
-        self.__mod_registry__ = []
-        self.__modpack_registry__ = []
-        # Load registry from disk
-        modregistryFile = "/zynthian/config/control_page.modregistry"
-        if Path(modregistryFile).exists():
-            try:
-                with open(modregistryFile, "r") as f:
-                    obj = json.loads(f.read())
-                    if "mods" in obj and "modpacks" in obj:
-                        self.__mod_registry__ = obj["mods"]
-                        self.__modpack_registry__ = obj["modpacks"]
-                    else:
-                        logging.error("The mod registry has become corrupted, aborting load")
-            except Exception as e:
-                logging.error(f"Failed to read mod registry from disk: {e}")
-        # Test whether the registry is still length 0, at which point, fix that (we can totally reasonably have no modpacks)
-        if len(self.__mod_registry__) == 0:
-            self.updateRegistry()
-        else:
+        if self.__mod_registry__.rescan():
             self.modsChanged.emit()
             self.modpacksChanged.emit()
 
+    # This loads the registry from disk, and then brings it up to date with what is on disk now
+    def loadRegistry(self):
+        self.__mod_registry__.load()
+        self.__mod_registry__.rescan()
+        self.modsChanged.emit()
+        self.modpacksChanged.emit()
+
     # Call this to force an update of anything beneath the given path
     @Slot(str)
     def updateRegistryPartial(self, subPath):
@@ -337,37 +238,22 @@ class zynthian_gui_control(zynthian_gui_selector):
         testPath = subPath[:-1] if subPath.endswith("*") else subPath
         testPath = testPath[:-1] if testPath.endswith("*") else testPath
         logging.error(f"Performing a partial registry update for {testPath}")
-        # First, remove any entry whose path begins with the given path
-        self.__mod_registry__ = [entry for entry in self.__mod_registry__ if entry["path"].startswith(testPath) == False]
-        self.__modpack_registry__ = [entry for entry in self.__modpack_registry__ if entry["path"].startswith(testPath) == False]
-        # Now, scan the sub path for any new bits
-        mods, modpacks = self.searchThroughModPack(testPath)
-        self.__mod_registry__.extend(mods)
-        self.__modpack_registry__.extend(mods)
-        # Save the registry to disk
-        modregistryFile = "/zynthian/config/control_page.modregistry"
-        try:
-            with open("/zynthian/config/control_page.modregistry", "w") as f:
-                data = json.dumps({"mods": self.__mod_registry__, "modpacks": self.__modpack_registry__})
-                f.write(data)
-                f.flush()
-                os.fsync(f.fileno())
-        except Exception as e:
-            logging.error(f"Error while writing mod registry: {e}")
-        # Finally, tell everybody the thing changed
-        self.modsChanged.emit()
-        self.modpacksChanged.emit()
+        # Re-read everything beneath the given path, even where the modification times didn't change
+        if self.__mod_registry__.rescan([testPath]):
+            # Finally, tell everybody the thing changed
+            self.modsChanged.emit()
+            self.modpacksChanged.emit()
 
     ### BEGIN Property mods
     def get_mods(self):
-        return self.__mod_registry__
+        return self.__mod_registry__.mods
     modsChanged = Signal()
     mods = Property('QVariantList', get_mods, notify=modsChanged)
     ### END Property mods
 
     ### BEGIN Property modpacks
     def get_modpacks(self):
-        return self.__modpack_registry__
+        return self.__mod_registry__.modpacks
     modpacksChanged = Signal()
     modpacks = Property('QVariantList', get_modpacks, notify=modpacksChanged)
     ### END Property modpacks
@@ -406,7 +292,7 @@ class zynthian_gui_control(zynthian_gui_selector):
                 engineType = 2
             # elif engine.type == "MIDI Effect":
                 # engineType = 3
-            for modEntry in self.__mod_registry__:
+            for modEntry in self.__mod_registry__.mods:
                 if len(modEntry["engines"]) == 0 or engineId in modEntry["engines"]:
                     if modEntry["type"] == 0 or modEntry["type"] == engineType:
                         entries.append(modEntry)
@@ -617,34 +503,15 @@ class zynthian_gui_control(zynthian_gui_selector):
             packsToTest = ["/zynthian/zynthbox-qml/qml-ui/engineeditpages"]
             # If we've got a preferred mod pack, add that first on the list, so we test against that first
             if self.__preferred_modpack__ != "":
-                packsToTest = [self.__preferred_modpack__].extend(packsToTest)
+                packsToTest = [self.__preferred_modpack__] + packsToTest
             for testPack in packsToTest:
-                # Note that mod pack contents are matched very simply by their paths. So, just cycle through and match all those,
-                # - test for engine matches
-                # - then match-type
-                # - then match-all
-                # - and only then fall through to the default, and only once all potential packs are exhausted
-                engineMatch = ""
-                typeMatch = ""
-                allMatch = ""
-                for entry in self.__mod_registry__:
-                    if entry["path"].startswith(testPack):
-                        if pluginID in entry["engines"]:
-                            engineMatch = entry["path"]
-                            # Since we've got an actual match on engine, just break out now
-                            break
-                        if entry["type"] == engineType:
-                            typeMatch = entry["path"]
-                        if entry["type"] == 0 and len(entry["engines"]) == 0:
-                            allMatch = entry["path"]
-                if engineMatch != "":
-                    customControlPage = engineMatch + "/content/main.qml"
-                elif typeMatch != "":
-                    customControlPage = typeMatch + "/content/main.qml"
-                elif allMatch != "":
-                    customControlPage = typeMatch + "/content/main.qml"
-                if customControlPage != "":
+                # Note that mod pack contents are matched very simply by their paths. The registry keeps a lookup table for
+                # each pack, which matches an engine first, then the match-type, and then the match-all, and only then do we
+                # fall through to the default, and only once all potential packs are exhausted
+                modPath = self.__mod_registry__.find_mod(testPack, pluginID, engineType)
+                if modPath != "":
                     # If we have found a control page to use, break out and use that
+                    customControlPage = modPath + "/content/main.qml"
                     break
             if customControlPage == "":
                 # logging.error(f"No match found, using default control page getter...")
@@ -0,0 +1,253 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#******************************************************************************
+# ZYNTHIAN PROJECT: Zynthian GUI
+#
+# Index of the control page mods and mod-packs found on disk
+#
+# Copyright (C) 2026 Zynthbox contributors
+#
+#******************************************************************************
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of
+# the License, or any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For a full copy of the GNU General Public License see the LICENSE.txt file.
+#
+#******************************************************************************
+
+import os
+import json
+import logging
+
+#------------------------------------------------------------------------------
+# Control page mod registry
+#
+# Mods live in folders underneath the search roots. A folder with a
+# manifest.json is a mod-pack, a folder with a metadata.json is a mod, and any
+# other folder is looked through for more of them (as are mod-packs, but not
+# mods). Alongside the flat lists of mods and mod-packs, the registry keeps
+# what it found in each folder, with the modification times of the folder and
+# of its manifest or metadata file. Rescanning only lists the folders which
+# changed, and only reads the manifest and metadata files which changed, so
+# everything else costs a stat or two.
+#
+# Looking up the control page for a plugin goes through a table for each
+# mod-pack, made the first time the pack is asked about.
+#------------------------------------------------------------------------------
+
+class zynthian_gui_control_mod_registry(object):
+
+    registry_fpath = "/zynthian/config/control_page.modregistry"
+    # Bump this when the format of the saved folder index changes
+    index_version = 1
+    # The mods are expected to exist in my-data, underneath the mods folder, inside which are three further folders, one for the defaults, one for the user's own ones, and one for community ones (which then has the extra subfolders store-userID/productID/), and finally for any built-ins
+    # Each of these searched folders then in turn has either folders with mods in, or mod-packs (which is a folder, which has mods or mod-packs in it). That is, a mod-pack can be recursive, but mods cannot
+    search_roots = ["/zynthian/zynthian-my-data/mods/community-mods", "/zynthian/zynthian-my-data/mods/default-mods", "/zynthian/zynthian-my-data/mods/my-mods", "/zynthian/zynthbox-qml/qml-ui/engineeditpages"]
+
+    def __init__(self):
+        self.mods = []
+        self.modpacks = []
+        # What was found in each folder, by path, as {'mtime', 'kind', 'meta_mtime', 'subfolders', 'entry'}
+        self.folders = {}
+        # Control page lookup table of each mod-pack, by the path of the pack
+        self.lookup_tables = {}
+
+    @staticmethod
+    def get_mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    # Load the registry saved by save(), returns whether there was a usable one
+    def load(self):
+        try:
+            with open(self.registry_fpath, "r") as f:
+                obj = json.loads(f.read())
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logging.error(f"Failed to read mod registry from disk: {e}")
+            return False
+        if "mods" not in obj or "modpacks" not in obj:
+            logging.error("The mod registry has become corrupted, aborting load")
+            return False
+        self.mods = obj["mods"]
+        self.modpacks = obj["modpacks"]
+        # A registry saved without (or with an older) folder index still works, the next rescan just reads everything
+        if obj.get("index_version") == self.index_version:
+            self.folders = obj.get("folders", {})
+        else:
+            self.folders = {}
+        self.lookup_tables = {}
+        return True
+
+    def save(self):
+        try:
+            tmp_fpath = self.registry_fpath + ".tmp"
+            with open(tmp_fpath, "w") as f:
+                data = json.dumps({"mods": self.mods, "modpacks": self.modpacks, "index_version": self.index_version, "folders": self.folders})
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_fpath, self.registry_fpath)
+        except Exception as e:
+            logging.error(f"Error while writing mod registry: {e}")
+
+    # Rescan the search roots, re-reading only the folders (and files) which changed since the last scan, or
+    # everything underneath any of the given paths. Saves the registry and returns True if anything changed
+    def rescan(self, changed_paths=()):
+        old_folders = self.folders
+        if len(changed_paths) > 0:
+            old_folders = {path: folder for path, folder in old_folders.items() if not path.startswith(tuple(changed_paths))}
+        new_folders = {}
+        mods = []
+        modpacks = []
+        for search_root in self.search_roots:
+            if os.path.isdir(search_root):
+                # Each of the roots is treated as a mod pack, without a manifest of its own
+                self.scan_folder(search_root, old_folders, new_folders, mods, modpacks, is_root=True)
+            else:
+                logging.error(f"The given mod pack root does not exist on disk: {search_root}")
+        changed = mods != self.mods or modpacks != self.modpacks or new_folders != self.folders
+        self.folders = new_folders
+        if changed:
+            self.mods = mods
+            self.modpacks = modpacks
+            self.lookup_tables = {}
+            logging.debug(f"Mod registry now contains:\n{self.mods}")
+            self.save()
+        return changed
+
+    # The listing of the given folder, from the previous scan if the folder is unchanged since, as (mtime, kind, subfolders)
+    def list_folder(self, path, old_folders):
+        mtime = zynthian_gui_control_mod_registry.get_mtime(path)
+        old_folder = old_folders.get(path)
+        if old_folder is not None and old_folder["mtime"] == mtime:
+            return mtime, old_folder["kind"], old_folder["subfolders"]
+        names = []
+        subfolders = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    names.append(entry.name)
+                    try:
+                        if entry.is_dir():
+                            subfolders.append(entry.path)
+                    except OSError:
+                        pass
+        except OSError as e:
+            logging.error(f"Error while listing mod folder {path}: {e}")
+        if "manifest.json" in names:
+            kind = "modpack"
+        elif "metadata.json" in names:
+            kind = "mod"
+        else:
+            kind = "folder"
+        return mtime, kind, subfolders
+
+    def scan_folder(self, path, old_folders, new_folders, mods, modpacks, is_root=False):
+        mtime, kind, subfolders = self.list_folder(path, old_folders)
+        if is_root or kind == "folder":
+            # If there is no metadata file, then this is not a mod, and we can assume it's a mod pack, so try and look deeper
+            new_folders[path] = {"mtime": mtime, "kind": kind, "meta_mtime": None, "subfolders": subfolders, "entry": None}
+            for subfolder in subfolders:
+                self.scan_folder(subfolder, old_folders, new_folders, mods, modpacks)
+            return
+
+        meta_path = os.path.join(path, "manifest.json" if kind == "modpack" else "metadata.json")
+        meta_mtime = zynthian_gui_control_mod_registry.get_mtime(meta_path)
+        old_folder = old_folders.get(path)
+        if old_folder is not None and old_folder["kind"] == kind and old_folder["meta_mtime"] == meta_mtime:
+            entry = old_folder["entry"]
+        else:
+            entry = self.read_modpack(path, meta_path) if kind == "modpack" else self.read_mod(path, meta_path)
+        new_folders[path] = {"mtime": mtime, "kind": kind, "meta_mtime": meta_mtime, "subfolders": subfolders, "entry": entry}
+        if entry is None:
+            # Broken manifest or metadata, so skip the mod (or mod-pack and everything in it)
+            return
+        if kind == "modpack":
+            modpacks.append(entry)
+            for subfolder in subfolders:
+                self.scan_folder(subfolder, old_folders, new_folders, mods, modpacks)
+        else:
+            mods.append(entry)
+
+    def read_modpack(self, path, manifest_path):
+        try:
+            logging.debug(f"Found a mod-pack, with metadata in file path {manifest_path} - loading")
+            with open(manifest_path, "r") as f:
+                obj = json.loads(f.read())
+            return {
+                "display": obj["Name"] if "Name" in obj else os.path.basename(path),
+                "path": path
+            }
+        except Exception as e:
+            logging.error(f"Error while handling mod-pack manifest for {manifest_path}: {e}")
+            return None
+
+    def read_mod(self, path, metadata_path):
+        try:
+            logging.debug(f"Found a mod, with the metadata file path {metadata_path} - loading")
+            with open(metadata_path, "r") as f:
+                obj = json.loads(f.read())
+
+            modEngines = []
+            if "Engines" in obj:
+                modEngines = obj["Engines"]
+            # If defined, but actually empty, then don't add anything
+            if "Engine" in obj and obj["Engine"] != "":
+                modEngines.append(obj["Engine"])
+
+            modType = 0
+            if "Type" in obj:
+                if obj["Type"] == 1 or obj["Type"] == 2:
+                    modType = obj["Type"]
+
+            entry = {
+                "display": obj["Name"] if "Name" in obj else os.path.basename(path),
+                "path": path,
+                "engines": modEngines,
+                "type": modType
+            }
+            logging.debug(f"Added entry to the registry: {entry}")
+            return entry
+        except Exception as e:
+            logging.error(f"Error while handling manifest: {e}")
+            return None
+
+    # The lookup table for the mods in the given mod-pack (matched simply by path), as {'engines', 'types', 'all'}, where
+    # engines holds the first mod for each plugin ID, types the last mod for each type, and all the last mod for everything
+    def get_lookup_table(self, pack_path):
+        table = self.lookup_tables.get(pack_path)
+        if table is None:
+            table = {"engines": {}, "types": {}, "all": ""}
+            for entry in self.mods:
+                if entry["path"].startswith(pack_path):
+                    for pluginID in entry["engines"]:
+                        table["engines"].setdefault(pluginID, entry["path"])
+                    table["types"][entry["type"]] = entry["path"]
+                    if entry["type"] == 0 and len(entry["engines"]) == 0:
+                        table["all"] = entry["path"]
+            self.lookup_tables[pack_path] = table
+        return table
+
+    # The path of the mod in the given mod-pack to use for the given plugin (and engine type): a mod made for the
+    # plugin, then one made for the type of engine, and then one made for everything. Empty if there is none
+    def find_mod(self, pack_path, pluginID, engineType):
+        table = self.get_lookup_table(pack_path)
+        if pluginID in table["engines"]:
+            return table["engines"][pluginID]
+        if engineType in table["types"]:
+            return table["types"][engineType]
+        return table["all"]
+
+#------------------------------------------------------------------------------
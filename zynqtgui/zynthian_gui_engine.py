@@ -32,6 +32,7 @@ from functools import cmp_to_key
 from zyngine import *
 from zyngine.zynthian_engine_jalv import zynthian_engine_jalv
 from . import zynthian_gui_selector
+from .zynthian_gui_jalv_pool import zynthian_gui_jalv_pool
 
 from PySide2.QtCore import Signal, Property
 
@@ -78,6 +79,7 @@ class zynthian_gui_engine(zynthian_gui_selector):
 
         # Sort the engine details by name (case insensitive)
         self.engine_info = OrderedDict(sorted(engine_info.items(), key=lambda e: e[1][0].lower()))
+        self.jalv_pool = zynthian_gui_jalv_pool(self)
 
         self.only_categories = False
         self.single_category = None
@@ -238,7 +240,9 @@ class zynthian_gui_engine(zynthian_gui_selector):
                 self.select(i)
                 return
 
-    def start_engine(self, eng, setTaskMessage=True, taskMessagePrefix:str=""):
+    # If wait_for_start is False, the engine's process will be launched, but not waited for,
+    # and the caller is expected to call wait_for_start() on the engine before using it
+    def start_engine(self, eng, setTaskMessage=True, taskMessagePrefix:str="", wait_for_start=True):
         # TODO : This start_engine method needs to accept plugin id and version and start that version of the plugin
         #        This entire gui_engine page logic is made to work with only 1 version of an engine.
         #        Generating engine list creates entries for multiple version with same nickname and hence will cause problems identifying
@@ -250,9 +254,18 @@ class zynthian_gui_engine(zynthian_gui_selector):
 
             info=self.engine_info[eng]
             zynthian_engine_class=info[4]
+            self.jalv_pool.record_usage(eng)
+            engine = self.jalv_pool.take(eng)
             # Allow all engines to have multiple instances. Hence add counter to all engines
             eng = f"{eng.split('/')[0]}/{self.zyngine_counter}"
-            self.zyngines[eng]=zynthian_engine_class(info[7], self.zynqtgui)
+            if engine is not None:
+                if wait_for_start:
+                    engine.wait_for_start()
+                self.zyngines[eng]=engine
+            elif wait_for_start:
+                self.zyngines[eng]=zynthian_engine_class(info[7], self.zynqtgui)
+            else:
+                self.zyngines[eng]=zynthian_engine_class(info[7], self.zynqtgui, defer_start_wait=True)
 
         self.zyngine_counter+=1
         return self.zyngines[eng]
@@ -273,7 +286,7 @@ class zynthian_gui_engine(zynthian_gui_selector):
         for eng in list(self.zyngines.keys()):
             if len(self.zyngines[eng].layers) == 0 and self.zyngines[eng] not in global_fx_engines:
                 logging.debug("Stopping Unused Engine '{}' ...".format(eng))
-                self.zyngines[eng].stop()
+                self.jalv_pool.release(self.zyngines[eng])
                 del self.zyngines[eng]
 
 
@@ -282,7 +295,7 @@ class zynthian_gui_engine(zynthian_gui_selector):
 
         for eng in list(self.zyngines.keys()):
             if len(self.zyngines[eng].layers) == 0 and self.zyngines[eng] not in global_fx_engines and eng[0:3] == "JV/":
-                self.zyngines[eng].stop()
+                self.jalv_pool.release(self.zyngines[eng])
                 del self.zyngines[eng]
 
 
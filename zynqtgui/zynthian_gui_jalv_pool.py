@@ -0,0 +1,198 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#******************************************************************************
+# ZYNTHIAN PROJECT: Zynthian GUI
+#
+# Pool of jalv plugin hosts started ahead of time, for the most used plugins
+#
+# Copyright (C) 2026 Zynthbox contributors
+#
+#******************************************************************************
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of
+# the License, or any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For a full copy of the GNU General Public License see the LICENSE.txt file.
+#
+#******************************************************************************
+
+import os
+import json
+import logging
+
+from collections import OrderedDict
+from threading import RLock, Timer
+
+from PySide2.QtCore import QObject, QTimer, Signal
+
+from zyngine import zynthian_engine
+from zyngine.zynthian_engine_jalv import zynthian_engine_jalv
+from . import zynthian_gui_config
+
+#------------------------------------------------------------------------------
+# Jalv host pool
+#
+# Starting a jalv engine means launching the process, waiting for the plugin
+# to be instantiated, and querying its controllers and presets, which can take
+# seconds. The pool keeps one engine started ahead of time for each of the most
+# used plugins (going by how often each plugin gets started), which
+# start_engine hands out instead of starting a new one. Plugin state can't be
+# reliably reset, so engines which were used are stopped when released, and
+# the pool is refilled with fresh ones a little while later, one at a time, on
+# the gui thread, and only while nothing is loading.
+#------------------------------------------------------------------------------
+
+class zynthian_gui_jalv_pool(QObject):
+
+    usage_fpath = "{}/jalv/plugin_usage.json".format(zynthian_engine.config_dir)
+    # Time in ms between starting the engines of the pool
+    refill_interval = 3000
+    # Time in seconds to wait after a change to the usage statistics before saving them
+    save_delay = 5
+
+    def __init__(self, engine_screen):
+        super(zynthian_gui_jalv_pool, self).__init__(engine_screen)
+        self.engine_screen = engine_screen
+        self.zynqtgui = engine_screen.zynqtgui
+        self.size = zynthian_gui_config.jalv_pool_size
+        self.lock = RLock()
+        # Warm engines, by engine id (as used in start_engine, e.g. "JV/Dexed")
+        self.warm = OrderedDict()
+        self.usage = self.load_usage()
+        self.save_timer = None
+        self.stopped = False
+
+        self.refill_timer = QTimer(self)
+        self.refill_timer.setSingleShot(True)
+        self.refill_timer.setInterval(self.refill_interval)
+        self.refill_timer.timeout.connect(self.refill)
+        # Engines are started and stopped from other threads too, and timers can only be started on their own thread
+        self.refill_requested.connect(self.refill_timer.start)
+        # Fill the pool once booting is done
+        self.schedule_refill()
+
+    def load_usage(self):
+        try:
+            with open(self.usage_fpath) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"Loading jalv plugin usage statistics failed: {e}")
+        return {}
+
+    def save_usage(self):
+        with self.lock:
+            self.save_timer = None
+            usage = dict(self.usage)
+        try:
+            os.makedirs(os.path.dirname(self.usage_fpath), exist_ok=True)
+            tmp_fpath = self.usage_fpath + ".tmp"
+            with open(tmp_fpath, "w") as f:
+                json.dump(usage, f)
+            os.replace(tmp_fpath, self.usage_fpath)
+        except Exception as e:
+            logging.error(f"Saving jalv plugin usage statistics failed: {e}")
+
+    # Save the usage statistics a little while after they change, so loading a snapshot with a lot of layers doesn't save them for each one
+    def schedule_save_usage(self):
+        with self.lock:
+            if self.save_timer is None:
+                self.save_timer = Timer(self.save_delay, self.save_usage)
+                self.save_timer.daemon = True
+                self.save_timer.start()
+
+    # Save any pending changes to the usage statistics right away
+    def flush_usage(self):
+        with self.lock:
+            pending = self.save_timer is not None
+            if pending:
+                self.save_timer.cancel()
+        if pending:
+            self.save_usage()
+
+    def is_pooled(self, eng):
+        info = self.engine_screen.engine_info.get(eng)
+        return info is not None and info[4] is zynthian_engine_jalv
+
+    # Count a start of the given engine towards which plugins the pool keeps engines for
+    def record_usage(self, eng):
+        if self.size > 0 and self.is_pooled(eng):
+            with self.lock:
+                self.usage[eng] = self.usage.get(eng, 0) + 1
+            self.schedule_save_usage()
+
+    # The engine ids the pool should have a warm engine for
+    def wanted(self):
+        with self.lock:
+            ranked = sorted(self.usage.items(), key=lambda item: item[1], reverse=True)
+        return [eng for eng, _ in ranked if self.is_pooled(eng)][:self.size]
+
+    # Hand out the warm engine for the given engine id, if there is one
+    def take(self, eng):
+        with self.lock:
+            engine = self.warm.pop(eng, None)
+        if engine is not None:
+            logging.info(f"Using prestarted engine {engine.name} ({engine.jackname})")
+            self.schedule_refill()
+        return engine
+
+    # Stop an engine which is no longer used, and have the pool replace it with a fresh one if needed
+    def release(self, engine):
+        engine.stop()
+        if isinstance(engine, zynthian_engine_jalv):
+            self.schedule_refill()
+
+    def schedule_refill(self):
+        if self.size > 0 and not self.stopped:
+            self.refill_requested.emit()
+
+    def refill(self):
+        if self.stopped:
+            return
+        if not self.zynqtgui.isBootingComplete or self.zynqtgui.isShuttingDown or self.zynqtgui.sketchpad is None or self.zynqtgui.sketchpad.sketchpadLoadingInProgress:
+            self.refill_timer.start()
+            return
+
+        wanted = self.wanted()
+        with self.lock:
+            for eng in [eng for eng in self.warm if eng not in wanted]:
+                logging.debug(f"Stopping prestarted engine for {eng}, as it is no longer among the most used")
+                self.warm.pop(eng).stop()
+            missing = [eng for eng in wanted if eng not in self.warm]
+
+        if len(missing) > 0:
+            eng = missing[0]
+            info = self.engine_screen.engine_info[eng]
+            logging.debug(f"Prestarting engine for {eng}")
+            # Don't block the gui while the process starts, take() callers wait for it if needed
+            try:
+                engine = info[4](info[7], self.zynqtgui, defer_start_wait=True)
+            except Exception as e:
+                logging.error(f"Prestarting engine for {eng} failed: {e}")
+                engine = None
+            if engine is not None:
+                with self.lock:
+                    self.warm[eng] = engine
+            if len(missing) > 1:
+                self.refill_timer.start()
+
+    def stop(self):
+        self.stopped = True
+        self.refill_timer.stop()
+        self.flush_usage()
+        with self.lock:
+            for engine in self.warm.values():
+                engine.stop()
+            self.warm.clear()
+
+    refill_requested = Signal()
+
+#------------------------------------------------------------------------------
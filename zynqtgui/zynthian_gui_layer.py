@@ -29,6 +29,7 @@ import sys
 import copy
 import math
 import base64
+import hashlib
 import logging
 import collections
 import jack
@@ -37,6 +38,7 @@ from collections import OrderedDict
 from json import JSONEncoder, JSONDecoder
 from pathlib import Path
 from functools import partial
+from time import sleep
 
 import zynautoconnect
 # Zynthian specific modules
@@ -44,6 +46,7 @@ from zyncoder import *
 from . import zynthian_gui_config
 from . import zynthian_gui_selector
 from zyngine import zynthian_layer
+from zyngine import zynthian_midi_filter_state
 
 import Zynthbox
 from .sketchpad import sketchpad_song
@@ -65,6 +68,10 @@ class zynthian_gui_layer(zynthian_gui_selector):
         self.replace_layer_index = None
         self.layer_chain_parallel = False
         self.last_snapshot_fpath = None
+        # Digests of the subtrees of the snapshot last written to each path, used to skip rewriting unchanged snapshots
+        self.__snapshot_digests = {}
+        self.snapshot_saves_written = 0
+        self.snapshot_saves_skipped = 0
         self.auto_next_screen = False
         self.layer_index_replace_engine = None
         self.__page_after_layer_creation = "layers_for_channel"
@@ -487,13 +494,11 @@ class zynthian_gui_layer(zynthian_gui_selector):
                         layer.reset_audio_out()
                         layer.reset_audio_in()
                     layer.set_engine(zyngine);
-                    # Reset bank and preset cache and Update since engine has changed
-                    layer.reset_bank_cache()
-                    layer.reset_preset_cache()
+                    # Reset bank and preset and Update since engine has changed (the catalogue keeps the lists by engine, so they're those of the new engine)
                     layer.reset_bank()
                     layer.reset_preset()
-                    layer.load_bank_list(force=True)
-                    layer.load_preset_list(force=True)
+                    layer.load_bank_list()
+                    layer.load_preset_list()
                     self.zynqtgui.screens['engine'].stop_unused_engines()
                     # initialize the bank
                     self.zynqtgui.screens['bank'].show()
@@ -1338,6 +1343,14 @@ class zynthian_gui_layer(zynthian_gui_selector):
             # if zynthian_gui_config.snapshot_mixer_settings and self.amixer_layer:
             #     snapshot['layers'].append(self.amixer_layer.get_snapshot())
 
+            midi_filter_state = zynthian_midi_filter_state.instance()
+            if midi_filter_state.is_installed():
+                # Clone & Note-range info, from the mirror of lib_zyncoder's state
+                midi_filter_state.verify_if_due()
+                snapshot['clone'] = midi_filter_state.get_clone_snapshot()
+                snapshot['note_range'] = midi_filter_state.get_note_range_snapshot()
+                return snapshot
+
             #Clone info
             for i in range(0,16):
                 snapshot['clone'].append([])
@@ -1363,47 +1376,104 @@ class zynthian_gui_layer(zynthian_gui_selector):
             logging.exception(f"Can't generate snapshot: {str(e)}")
             return None
 
-    def save_snapshot(self, fpath):
+    # Encode a snapshot as json, along with a digest of each of its top level subtrees (and of each
+    # individual layer), so an unchanged snapshot can be told apart without comparing the whole thing.
+    # Each subtree is only encoded once, and the json is assembled from those pieces.
+    def encode_snapshot(self, snapshot):
+        encoder = JSONEncoder()
+        digests = OrderedDict()
+        parts = []
+        for key, value in snapshot.items():
+            if key == "layers":
+                encoded_layers = [encoder.encode(layer) for layer in value]
+                for index, encoded_layer in enumerate(encoded_layers):
+                    digests[f"layers/{index}"] = hashlib.blake2b(encoded_layer.encode(), digest_size=16).digest()
+                encoded = "[" + ", ".join(encoded_layers) + "]"
+            else:
+                encoded = encoder.encode(value)
+                digests[key] = hashlib.blake2b(encoded.encode(), digest_size=16).digest()
+            parts.append(f"{encoder.encode(str(key))}: {encoded}")
+        return "{" + ", ".join(parts) + "}", digests
+
+    def save_snapshot(self, fpath, force=False):
         if self.zynqtgui.isShuttingDown:
             logging.info("Not saving snapshot when shutting down")
             return
 
-        json = JSONEncoder().encode(self.generate_snapshot())
-        if json is None:
+        snapshot = self.generate_snapshot()
+        if snapshot is None:
             logging.error("Failed to generate snapshot, not saving")
             return False
-        else:
-            logging.info(f"Saving snapshot {fpath}")
-            # logging.debug(json)
+        json, digests = self.encode_snapshot(snapshot)
 
+        # Skip the write if nothing changed since the last time we wrote this same file (and it is still there, untouched)
+        previous = self.__snapshot_digests.get(fpath)
+        if not force and previous is not None and previous[0] == digests:
             try:
-                Path(fpath).parent.mkdir(parents=True, exist_ok=True)
-                with open(fpath,"w") as fh:
-                    fh.write(json)
-                    fh.flush()
-                    os.fsync(fh.fileno())
+                stat = os.stat(fpath)
+                if (stat.st_size, stat.st_mtime_ns) == previous[1]:
+                    self.snapshot_saves_skipped += 1
+                    logging.debug(f"Snapshot {fpath} is unchanged, not saving (written {self.snapshot_saves_written}, skipped {self.snapshot_saves_skipped})")
+                    self.last_snapshot_fpath = fpath
+                    return True
+            except OSError:
+                pass
 
-            except Exception as e:
-                logging.error("Can't save snapshot '%s': %s" % (fpath,e))
-                return False
+        logging.info(f"Saving snapshot {fpath}")
+        if previous is not None:
+            changed = [key for key in digests if previous[0].get(key) != digests[key]] + [key for key in previous[0] if key not in digests]
+            logging.debug(f"Changed snapshot subtrees: {', '.join(changed)}")
 
-            self.last_snapshot_fpath = fpath
-            return True
+        try:
+            Path(fpath).parent.mkdir(parents=True, exist_ok=True)
+            with open(fpath,"w") as fh:
+                fh.write(json)
+                fh.flush()
+                os.fsync(fh.fileno())
+            stat = os.stat(fpath)
+            self.__snapshot_digests[fpath] = (digests, (stat.st_size, stat.st_mtime_ns))
+        except Exception as e:
+            self.__snapshot_digests.pop(fpath, None)
+            logging.error("Can't save snapshot '%s': %s" % (fpath,e))
+            return False
 
+        self.snapshot_saves_written += 1
+        logging.debug(f"Snapshot saves written {self.snapshot_saves_written}, skipped {self.snapshot_saves_skipped}")
+        self.last_snapshot_fpath = fpath
+        return True
 
-    def load_snapshot(self, fpath, quiet=False):
+    # Counters of how many snapshot saves were written to disk, and how many were skipped because nothing had changed
+    def get_snapshot_save_stats(self):
+        return {"written": self.snapshot_saves_written, "skipped": self.snapshot_saves_skipped}
+
+
+    # Reads and decodes the snapshot at the given path. This only reads the file, so it can be done on a worker thread,
+    # and what it returns handed to load_snapshot. Returns None if the snapshot can't be read
+    @staticmethod
+    def read_snapshot(fpath):
         try:
             with open(fpath,"r") as fh:
                 json=fh.read()
-                logging.info(f"Loading snapshot {fpath}")
                 # logging.debug(json)
         except Exception as e:
             logging.error("Can't load snapshot '%s': %s" % (fpath,e))
-            return False
+            return None
 
         try:
-            snapshot=JSONDecoder().decode(json)
+            return JSONDecoder().decode(json)
+        except Exception as e:
+            logging.exception("Invalid snapshot: %s" % e)
+            return None
 
+    # If given, snapshot is what read_snapshot returned for fpath, and is loaded instead of reading the file again
+    def load_snapshot(self, fpath, quiet=False, snapshot=None):
+        if snapshot is None:
+            snapshot = zynthian_gui_layer.read_snapshot(fpath)
+            if snapshot is None:
+                return False
+        logging.info(f"Loading snapshot {fpath}")
+
+        try:
             #Clean all layers, but don't stop unused engines
             self.remove_all_layers(False)
 
@@ -1420,7 +1490,18 @@ class zynthian_gui_layer(zynthian_gui_selector):
             # so we stop Jalv engines!
             self.zynqtgui.screens['engine'].stop_unused_jalv_engines()
 
-            #Create new layers, starting engines when needed
+            # Launch all the engine processes up front without waiting for each of them to become ready,
+            # so they start up concurrently, and then wait for all of them before restoring any state
+            layer_engines = {}
+            for lss in snapshot['layers']:
+                if lss['engine_nick'] != "MX":
+                    layer_snapshot = self.zynqtgui.zynthbox_plugins_helper.update_layer_snapshot_plugin_id_to_name(lss)
+                    layer_engines[id(lss)] = self.zynqtgui.screens['engine'].start_engine(layer_snapshot['engine_nick'], taskMessagePrefix="Loading Snapshot : ", wait_for_start=False)
+            self.zynqtgui.currentTaskMessage = "Loading Snapshot : Waiting for engines to start"
+            for engine in layer_engines.values():
+                engine.wait_for_start()
+
+            #Create new layers
             i = 0
             for lss in snapshot['layers']:
                 if lss['engine_nick']=="MX":
@@ -1432,7 +1513,7 @@ class zynthian_gui_layer(zynthian_gui_selector):
                     track_index = layer_snapshot['track_index']
                     slot_index = layer_snapshot['slot_index']
                     midi_chan = layer_snapshot['midi_chan']
-                    engine=self.zynqtgui.screens['engine'].start_engine(layer_snapshot['engine_nick'], taskMessagePrefix="Loading Snapshot : ")
+                    engine = layer_engines[id(lss)]
                     if 'slot_type' in layer_snapshot:
                         slot_type = layer_snapshot['slot_type']
                     else:
@@ -1535,11 +1616,14 @@ class zynthian_gui_layer(zynthian_gui_selector):
                 i += 1
 
             # Restore layer state, step 2 => Restore Controllers Status
+            # Give all the engines which loaded a preset their settling time in one go, rather than once per layer
+            if any(layer.preset_loaded for layer in self.layers):
+                sleep(0.2)
             i = 0
             for lss in snapshot['layers']:
                 self.zynqtgui.currentTaskMessage = "Loading Snapshot : Restoring controller status"
                 layer_snapshot = self.zynqtgui.zynthbox_plugins_helper.update_layer_snapshot_plugin_id_to_name(lss)
-                self.layers[i].restore_snapshot_2(layer_snapshot)
+                self.layers[i].restore_snapshot_2(layer_snapshot, wait_for_preset=False)
                 # use partial to capture the variables that needs to be accessed by the lambda
                 zynautoconnect.callAfterMidiAutoconnect(partial(lambda layer: layer.send_ctrl_midi_cc(), self.layers[i]))
                 i += 1
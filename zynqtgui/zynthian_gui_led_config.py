@@ -111,15 +111,26 @@ if __name__ == "__main__":
 
 from . import zynthian_qt_gui_base
 from . import zynthian_gui_config
+from PySide2.QtCore import QTimer
 from PySide2.QtGui import QColor
 import Zynthbox
 
 class zynthian_gui_led_config(zynthian_qt_gui_base.zynqtgui):
+    # Upper limit for how often the leds get refreshed, regardless of how often their colors are changed
+    max_refresh_rate = 30
+
     def __init__(self, parent=None):
         super(zynthian_gui_led_config, self).__init__(parent)
         self.__blinkingButtons = {}
         # self.zynqtgui.ui_settings.ledBrightness ranges from 1-100. Normalize value to be in range 0.0-1.0
         self.__ledBrightness = self.zynqtgui.ui_settings.ledBrightness / 100
+        # The colors the leds should have, and the colors they were given when last refreshed (None until the first refresh)
+        self.__frame = [led_color_off] * num_leds
+        self.__shownFrame = None
+        self.__lastRefreshTime = 0
+        self.__refreshTimer = QTimer(self)
+        self.__refreshTimer.setSingleShot(True)
+        self.__refreshTimer.timeout.connect(self.refreshLeds)
         init_wsleds()
         Zynthbox.PlayGridManager.instance().metronomeBeat128thChanged.connect(self.metronomeBeatUpdate128thHandler)
         self.zynqtgui.ui_settings.ledBrightnessChanged.connect(self.updateLedBrightness)
@@ -137,6 +148,33 @@ class zynthian_gui_led_config(zynthian_qt_gui_base.zynqtgui):
     def updateLedBrightness(self):
         self.__ledBrightness = self.zynqtgui.ui_settings.ledBrightness / 100
 
+    def colorToLedValue(self, color):
+        return (int(color.red() * self.__ledBrightness), int(color.green() * self.__ledBrightness), int(color.blue() * self.__ledBrightness))
+
+    def setLed(self, buttonId, value):
+        if self.__frame[buttonId] != value:
+            self.__frame[buttonId] = value
+            self.scheduleRefresh()
+
+    # Refresh the leds as soon as allowed by max_refresh_rate
+    def scheduleRefresh(self):
+        if not self.__refreshTimer.isActive():
+            elapsed = time.monotonic() - self.__lastRefreshTime
+            self.__refreshTimer.start(max(0, int((1 / self.max_refresh_rate - elapsed) * 1000)))
+
+    @Slot()
+    def refreshLeds(self):
+        if not self.zynqtgui.isBootingComplete:
+            # Keep the frame until booting is complete, the next change after that will show it
+            return
+        if self.__shownFrame is None or self.__frame != self.__shownFrame:
+            for index, value in enumerate(self.__frame):
+                if self.__shownFrame is None or self.__shownFrame[index] != value:
+                    wsleds[index] = value
+            wsleds.show()
+            self.__shownFrame = list(self.__frame)
+            self.__lastRefreshTime = time.monotonic()
+
     """
     A method to set a button to blink with a base color..
     The button will blink on every beat when the metronome is running.
@@ -155,20 +193,21 @@ class zynthian_gui_led_config(zynthian_qt_gui_base.zynqtgui):
 
     @Slot()
     def metronomeBeatUpdate128thHandler(self, subBeat):
-        if self.zynqtgui.sketchpad.isMetronomeRunning:
+        # Only the on and off steps of the blink change anything, ignore all the other ticks
+        if (subBeat % 32) in (0, 4) and self.zynqtgui.sketchpad.isMetronomeRunning:
             if (subBeat % 32) == 0:
                 # Blinkon on every beat
                 for buttonId, _ in self.__blinkingButtons.items():
-                    wsleds[buttonId] = (255 * self.__ledBrightness, 255 * self.__ledBrightness, 255 * self.__ledBrightness)
-            elif (subBeat % 32) == 4:
+                    self.setLed(buttonId, (int(255 * self.__ledBrightness), int(255 * self.__ledBrightness), int(255 * self.__ledBrightness)))
+            else:
                 # Blink off after every 4 subBeats
                 for buttonId, color in self.__blinkingButtons.items():
-                    wsleds[buttonId] = (int(color.red() * self.__ledBrightness), int(color.green() * self.__ledBrightness), int(color.blue() * self.__ledBrightness))
-            wsleds.show()
+                    self.setLed(buttonId, self.colorToLedValue(color))
 
     """
     Slot to update led colors based on the provided ledColors map and brightness value.
     The ledColors map should have button IDs as keys and QColor objects as values.
+    Only leds whose color actually changed cause a refresh, and refreshes are capped to max_refresh_rate.
     """
     @Slot("QVariantMap")
     def updateLedColors(self, ledColors = {}):
@@ -176,7 +215,8 @@ class zynthian_gui_led_config(zynthian_qt_gui_base.zynqtgui):
             id = int(buttonId)
             if not self.zynqtgui.sketchpad.isMetronomeRunning or (self.zynqtgui.sketchpad.isMetronomeRunning and id not in self.__blinkingButtons):
                 # Blinking buttons will be managed by the metronomeBeatUpdate128thHandler when metronome is running. Do not override the blinking button colors
-                wsleds[id] = (int(color.red() * self.__ledBrightness), int(color.green() * self.__ledBrightness), int(color.blue() * self.__ledBrightness))
+                self.setLed(id, self.colorToLedValue(color))
 
-        if self.zynqtgui.isBootingComplete:
-            wsleds.show()
+        if self.zynqtgui.isBootingComplete and self.__shownFrame is None:
+            # Make sure the first frame after booting gets shown, even if nothing changed since it was set up
+            self.scheduleRefresh()
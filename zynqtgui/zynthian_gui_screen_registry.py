@@ -0,0 +1,130 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#******************************************************************************
+# ZYNTHIAN PROJECT: Zynthian GUI
+#
+# Zynthian GUI screen registry, constructing screens on first use
+#
+# Copyright (C) 2026 Zynthbox contributors
+#
+#******************************************************************************
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of
+# the License, or any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For a full copy of the GNU General Public License see the LICENSE.txt file.
+#
+#******************************************************************************
+
+import logging
+
+from collections import OrderedDict
+from threading import Lock, RLock
+from timeit import default_timer as timer
+
+from PySide2.QtCore import Qt, QObject, QMetaObject, QThread, Slot
+
+
+#------------------------------------------------------------------------------
+# Helper used to construct screens on the thread the gui lives on, when they
+# are first used from some other thread
+#------------------------------------------------------------------------------
+
+class zynthian_gui_screen_constructor(QObject):
+    def __init__(self, registry, parent=None):
+        super(zynthian_gui_screen_constructor, self).__init__(parent)
+        self.registry = registry
+        self.pending_name = None
+
+    @Slot()
+    def construct_pending(self):
+        self.registry.construct(self.pending_name)
+
+
+#------------------------------------------------------------------------------
+# Screen registry
+#
+# Works as a dictionary of screen id to screen object (so self.screens["foo"]
+# keeps working everywhere), but screens registered as lazy are only
+# constructed the first time they are looked up, be that through show_screen,
+# show_modal or any of the properties exposing them to qml. Aliases (the same
+# object under several screen ids) resolve through to their target screen.
+#------------------------------------------------------------------------------
+
+class zynthian_gui_screen_registry(dict):
+    def __init__(self, parent=None):
+        super(zynthian_gui_screen_registry, self).__init__()
+        self.factories = OrderedDict()
+        self.aliases = {}
+        # Construction time in seconds of each screen, in the order they were constructed
+        self.construction_times = OrderedDict()
+        self.lock = RLock()
+        # Serialises requests from other threads to construct a screen on the gui thread
+        self.invoke_lock = Lock()
+        self.constructor = zynthian_gui_screen_constructor(self, parent)
+
+    # Register a screen, constructing it immediately unless lazy is set
+    def register(self, name, factory, lazy=False):
+        self.factories[name] = factory
+        if lazy:
+            logging.debug(f"Registered screen {name} for construction on first use")
+        else:
+            self.construct(name)
+
+    # Make a screen available under another id as well
+    def alias(self, name, target):
+        if dict.__contains__(self, target):
+            dict.__setitem__(self, name, dict.__getitem__(self, target))
+        else:
+            self.aliases[name] = target
+
+    def construct(self, name):
+        with self.lock:
+            if dict.__contains__(self, name):
+                return dict.__getitem__(self, name)
+            start = timer()
+            screen = self.factories[name]()
+            self.construction_times[name] = timer() - start
+            dict.__setitem__(self, name, screen)
+            for alias, target in list(self.aliases.items()):
+                if target == name:
+                    dict.__setitem__(self, alias, screen)
+                    del self.aliases[alias]
+            return screen
+
+    def __missing__(self, name):
+        if name in self.aliases:
+            return self.__missing__(self.aliases[name])
+        if name not in self.factories:
+            raise KeyError(name)
+        if QThread.currentThread() == self.constructor.thread():
+            return self.construct(name)
+        # Screens are QObjects parented to the gui object, so they must be created on the gui thread
+        logging.debug(f"Screen {name} first used outside the gui thread, constructing it on the gui thread")
+        with self.invoke_lock:
+            self.constructor.pending_name = name
+            QMetaObject.invokeMethod(self.constructor, "construct_pending", Qt.BlockingQueuedConnection)
+        return dict.__getitem__(self, name)
+
+    def __contains__(self, name):
+        return dict.__contains__(self, name) or name in self.factories or name in self.aliases
+
+    def pending(self):
+        return [name for name in self.factories if not dict.__contains__(self, name)]
+
+    def log_construction_report(self):
+        total = sum(self.construction_times.values())
+        logging.info(f"Constructed {len(self.construction_times)} screens in {total:.3f}s, {len(self.pending())} deferred until first use")
+        for name, duration in sorted(self.construction_times.items(), key=lambda item: item[1], reverse=True):
+            logging.info(f"  {name}: {duration * 1000:.1f}ms")
+        if len(self.pending()) > 0:
+            logging.info(f"  Deferred: {', '.join(self.pending())}")
+
+#------------------------------------------------------------------------------
@@ -24,6 +24,7 @@
 #******************************************************************************
 import os
 import sys
+import difflib
 import logging
 from datetime import datetime
 
@@ -55,17 +56,75 @@ class selector_list_model(QAbstractListModel):
         super(selector_list_model, self).__init__(parent)
         self.entries = []
         self.metadata = []
+        # Hashable snapshots of the entries and metadata as they were last set, to diff the next set against
+        # (the lists passed to set_entries are sometimes changed in place, so the entries can't be relied on)
+        self.__entry_keys = []
 
+    # Updates the model to the given entries with the fewest row changes possible: entries which
+    # remain the same are left alone, and only rows which were actually inserted, removed or
+    # changed are reported to the views
     def set_entries(self, entries, metadata):
-        was_empty = len(self.entries) == 0
+        new_keys = [selector_list_model.entry_key(entry, metadata[i] if i < len(metadata) else None) for i, entry in enumerate(entries)]
+        old_keys = self.__entry_keys
+        old_entries = self.entries if self.entries is not entries else list(entries)
+        old_metadata = self.metadata if self.metadata is not metadata else list(metadata)
+
+        # Most updates only touch a few rows (a favorite toggled, an entry added at the end), so strip
+        # the common start and end before handing the rest to the (quadratic) sequence matcher
+        start = 0
+        while start < len(old_keys) and start < len(new_keys) and old_keys[start] == new_keys[start]:
+            start += 1
+        end_old, end_new = len(old_keys), len(new_keys)
+        while end_old > start and end_new > start and old_keys[end_old - 1] == new_keys[end_new - 1]:
+            end_old -= 1
+            end_new -= 1
+        opcodes = []
+        if end_old > start or end_new > start:
+            matcher = difflib.SequenceMatcher(None, old_keys[start:end_old], new_keys[start:end_new], autojunk=False)
+            opcodes = [(tag, i1 + start, i2 + start, j1 + start, j2 + start) for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
+
+        if len(opcodes) > 0 and sum(max(i2 - i1, j2 - j1) for _, i1, i2, j1, j2 in opcodes) > max(len(old_keys), len(new_keys)) // 2:
+            # Mostly different entries, so describing the change row by row would cost more than it saves
+            self.replace_entries(entries, metadata)
+        else:
+            # The rows which are not being changed already hold their new contents, and the views get told about
+            # the changes from the end of the list backwards, so the row numbers of the edits are always valid
+            self.entries = selector_list_model.fill_to_length(old_entries, entries, len(old_keys))
+            self.metadata = selector_list_model.fill_to_length(old_metadata, metadata, len(old_keys))
+            for tag, i1, i2, j1, j2 in reversed(opcodes):
+                changed = min(i2 - i1, j2 - j1)
+                if j2 - j1 > changed:
+                    self.beginInsertRows(QModelIndex(), i1 + changed, i1 + (j2 - j1) - 1)
+                    self.entries[i2:i2] = entries[j1 + changed:j2]
+                    self.metadata[i2:i2] = metadata[j1 + changed:j2]
+                    self.endInsertRows()
+                elif i2 - i1 > changed:
+                    self.beginRemoveRows(QModelIndex(), i1 + changed, i2 - 1)
+                    del self.entries[i1 + changed:i2]
+                    del self.metadata[i1 + changed:i2]
+                    self.endRemoveRows()
+                if changed > 0:
+                    self.entries[i1:i1 + changed] = entries[j1:j1 + changed]
+                    self.metadata[i1:i1 + changed] = metadata[j1:j1 + changed]
+                    self.dataChanged.emit(self.index(i1, 0), self.index(i1 + changed - 1, 0))
+            self.entries = entries
+            self.metadata = metadata
+
+        self.__entry_keys = new_keys
+        self.count_changed.emit()
 
-        if len(entries) > len(self.entries):
-            self.beginInsertRows(QModelIndex(), len(self.entries), len(entries)-1)
+    # Replaces all the entries, growing or shrinking the model at the end and reporting all remaining rows as changed
+    def replace_entries(self, entries, metadata):
+        # The row count the views know about (self.entries may be the very list which was changed in place)
+        old_count = len(self.__entry_keys)
+
+        if len(entries) > old_count:
+            self.beginInsertRows(QModelIndex(), old_count, len(entries)-1)
             self.entries = entries
             self.metadata = metadata
             self.endInsertRows()
-        elif len(entries) < len(self.entries):
-            self.beginRemoveRows(QModelIndex(), len(entries), len(self.entries)-1)
+        elif len(entries) < old_count:
+            self.beginRemoveRows(QModelIndex(), len(entries), old_count-1)
             self.entries = entries
             self.metadata = metadata
             self.endRemoveRows()
@@ -73,15 +132,40 @@ class selector_list_model(QAbstractListModel):
             self.entries = entries
             self.metadata = metadata
 
-        if not was_empty:
-            self.dataChanged.emit(self.index(0,0), self.index(min(len(entries), len(self.entries)) - 1, 0))
-
-        self.count_changed.emit()
+        if old_count > 0:
+            self.dataChanged.emit(self.index(0,0), self.index(min(len(entries), old_count) - 1, 0))
+
+    # Returns a copy of old_list of the given length, padded from new_list (or with None), for use while
+    # the rows are being edited (the padding rows are only there for the row count, and will be changed)
+    @staticmethod
+    def fill_to_length(old_list, new_list, length):
+        result = list(old_list[:length])
+        while len(result) < length:
+            result.append(new_list[len(result)] if len(result) < len(new_list) else None)
+        return result
+
+    @staticmethod
+    def entry_key(entry, metadata):
+        return (selector_list_model.freeze(entry), selector_list_model.freeze(metadata))
+
+    # Returns a hashable copy of the given value, for comparing entries
+    @staticmethod
+    def freeze(value):
+        if isinstance(value, (list, tuple)):
+            return tuple(selector_list_model.freeze(item) for item in value)
+        elif isinstance(value, dict):
+            return tuple((key, selector_list_model.freeze(item)) for key, item in value.items())
+        try:
+            hash(value)
+            return value
+        except TypeError:
+            return id(value)
 
     def reset_entries(self, entries, metadata):       
         self.beginResetModel()
         self.entries = entries
         self.metadata = metadata
+        self.__entry_keys = [selector_list_model.entry_key(entry, metadata[i] if i < len(metadata) else None) for i, entry in enumerate(entries)]
         self.endResetModel()
         self.count_changed.emit()
 
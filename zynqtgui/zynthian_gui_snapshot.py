@@ -242,16 +242,16 @@ class zynthian_gui_snapshot(zynthian_gui_selector):
         elif self.action=="SAVE":
             if fpath=='NEW_SNAPSHOT':
                 fpath=self.get_snapshot_fpath(self.get_new_snapshot())
-                self.zynqtgui.screens['layer'].save_snapshot(fpath)
+                self.zynqtgui.screens['layer'].save_snapshot(fpath, force=True)
             elif fpath:
                 if isfile(fpath):
                     self.zynqtgui.show_confirm("Do you really want to overwrite the snapshot %s?" % fname, self.cb_confirm_save_snapshot,[fpath])
                 else:
-                    self.zynqtgui.screens['layer'].save_snapshot(fpath)
+                    self.zynqtgui.screens['layer'].save_snapshot(fpath, force=True)
 
 
     def cb_confirm_save_snapshot(self, params):
-        self.zynqtgui.screens['layer'].save_snapshot(params[0])
+        self.zynqtgui.screens['layer'].save_snapshot(params[0], force=True)
 
     def save_default_snapshot(self):
         self.zynqtgui.screens['layer'].save_snapshot(self.default_snapshot_fpath)
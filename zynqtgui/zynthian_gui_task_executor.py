@@ -0,0 +1,214 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#******************************************************************************
+# ZYNTHIAN PROJECT: Zynthian GUI
+#
+# Runs long tasks on a worker thread, off the gui thread
+#
+# Copyright (C) 2026 Zynthbox contributors
+#
+#******************************************************************************
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of
+# the License, or any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For a full copy of the GNU General Public License see the LICENSE.txt file.
+#
+#******************************************************************************
+
+import os
+import queue
+import shutil
+import logging
+import threading
+
+from PySide2.QtCore import QObject, Qt, Signal, Slot
+
+#------------------------------------------------------------------------------
+# Long task executor
+#
+# Long tasks run as a function on the executor's worker thread, one task at a
+# time, in the order they were submitted, so the gui thread keeps rendering
+# while they run. The function is handed its task, with which it reports
+# progress, checks whether it was cancelled, and runs anything which touches
+# Qt objects (the song, channels, layers, models and so on) on the gui thread,
+# through run_on_ui_thread. Each of those calls is a step of its own, and the
+# gui gets to render between them, so a task should do its file and parsing
+# work on the worker thread, and split what it does on the gui thread into
+# steps where it can. Once the function returns, its result is handed to the
+# task's on_done callback on the gui thread.
+#------------------------------------------------------------------------------
+
+class zynthian_gui_task_cancelled(Exception):
+    pass
+
+
+class zynthian_gui_task(object):
+
+    def __init__(self, executor, work, cancellable=False, on_done=None, on_error=None):
+        self.executor = executor
+        self.work = work
+        self.cancellable = cancellable
+        self.on_done = on_done
+        self.on_error = on_error
+        self.progress = -1
+        self.__cancelled = threading.Event()
+
+    def cancel(self):
+        if self.cancellable:
+            self.__cancelled.set()
+
+    def is_cancelled(self):
+        return self.__cancelled.is_set()
+
+    # Call this between steps of the work, to stop the task (with zynthian_gui_task_cancelled) if it was cancelled
+    def check_cancelled(self):
+        if self.__cancelled.is_set():
+            raise zynthian_gui_task_cancelled()
+
+    # Report the progress of the task as a fraction between 0 and 1 (or -1 if unknown), and optionally a new task message
+    def set_progress(self, progress, message=None):
+        # Don't flood the gui thread with updates too small to show
+        if message is None and progress >= 0 and abs(progress - self.progress) < 0.01:
+            return
+        self.progress = progress
+        self.executor.progressChanged.emit(self, progress, message)
+
+    # Run the given function on the gui thread, wait for it to finish, and return what it returned (or raise what it raised)
+    def run_on_ui_thread(self, fn, *args, **kwargs):
+        return self.executor.run_on_ui_thread(fn, *args, **kwargs)
+
+
+class zynthian_gui_task_executor(QObject):
+
+    def __init__(self, parent=None):
+        super(zynthian_gui_task_executor, self).__init__(parent)
+        self.ui_thread_id = threading.get_ident()
+        self.tasks = queue.Queue()
+        self.current_task = None
+        self.pending_count = 0
+        self.lock = threading.Lock()
+        # Anything emitted from the worker thread gets queued, and run on the gui thread this object lives on
+        self.invokeRequested.connect(self.invoke, Qt.QueuedConnection)
+        self.worker = threading.Thread(target=self.run_tasks, name="long task executor", daemon=True)
+        self.worker.start()
+
+    def is_ui_thread(self):
+        return threading.get_ident() == self.ui_thread_id
+
+    # Whether any task is waiting or running
+    def is_busy(self):
+        with self.lock:
+            return self.pending_count > 0
+
+    # Queue the given work(task) function to run on the worker thread. Once it's done, on_done is called on the gui thread
+    # with what it returned, or if it raised, on_error with the exception (zynthian_gui_task_cancelled if it was cancelled)
+    def submit(self, work, cancellable=False, on_done=None, on_error=None):
+        task = zynthian_gui_task(self, work, cancellable, on_done, on_error)
+        with self.lock:
+            self.pending_count += 1
+        self.tasks.put(task)
+        return task
+
+    # Cancel the running task, if it can be cancelled
+    def cancel_current_task(self):
+        task = self.current_task
+        if task is not None:
+            task.cancel()
+
+    def run_tasks(self):
+        while True:
+            task = self.tasks.get()
+            self.current_task = task
+            try:
+                result = task.work(task)
+            except zynthian_gui_task_cancelled as e:
+                logging.info("Long task cancelled")
+                self.post_to_ui_thread(self.finish_task, task, None, e)
+            except Exception as e:
+                logging.exception(f"Long task failed: {e}")
+                self.post_to_ui_thread(self.finish_task, task, None, e)
+            else:
+                self.post_to_ui_thread(self.finish_task, task, result, None)
+            finally:
+                self.current_task = None
+
+    def finish_task(self, task, result, error):
+        with self.lock:
+            self.pending_count -= 1
+        try:
+            if error is None and task.on_done is not None:
+                try:
+                    task.on_done(result)
+                except Exception as e:
+                    # Finishing up failed, which the task's error handling still needs to hear about (to clean up after it)
+                    logging.exception(f"Finishing long task failed: {e}")
+                    error = e
+            if error is not None and task.on_error is not None:
+                task.on_error(error)
+        finally:
+            self.taskFinished.emit(task)
+
+    # Run the given function on the gui thread without waiting for it
+    def post_to_ui_thread(self, fn, *args, **kwargs):
+        self.invokeRequested.emit({"fn": fn, "args": args, "kwargs": kwargs, "done": None})
+
+    # Run the given function on the gui thread, wait for it to finish, and return what it returned (or raise what it raised)
+    def run_on_ui_thread(self, fn, *args, **kwargs):
+        if self.is_ui_thread():
+            return fn(*args, **kwargs)
+        call = {"fn": fn, "args": args, "kwargs": kwargs, "done": threading.Event(), "result": None, "error": None}
+        self.invokeRequested.emit(call)
+        call["done"].wait()
+        if call["error"] is not None:
+            raise call["error"]
+        return call["result"]
+
+    @Slot(object)
+    def invoke(self, call):
+        try:
+            call["result"] = call["fn"](*call["args"], **call["kwargs"])
+        except Exception as e:
+            if call["done"] is None:
+                logging.exception(f"Error while running {call['fn']} on the gui thread: {e}")
+            call["error"] = e
+        finally:
+            if call["done"] is not None:
+                call["done"].set()
+
+    invokeRequested = Signal(object)
+    # Emitted from the worker thread with the task, its progress and the new task message (or None)
+    progressChanged = Signal(object, float, object)
+    # Emitted on the gui thread once a task is done (whether it succeeded, failed, or was cancelled)
+    taskFinished = Signal(object)
+
+
+# Copy the directory tree at src to dst (like shutil.copytree), reporting progress by the number of files copied, and
+# stopping if the task is cancelled, in which case the partial copy is removed again
+def copy_tree(task, src, dst):
+    file_count = 0
+    for _, _, files in os.walk(src):
+        file_count += len(files)
+    copied_count = 0
+
+    def copy_file(src_file, dst_file):
+        nonlocal copied_count
+        task.check_cancelled()
+        shutil.copy2(src_file, dst_file)
+        copied_count += 1
+        task.set_progress(copied_count / file_count if file_count > 0 else 1)
+
+    try:
+        shutil.copytree(src, dst, copy_function=copy_file)
+    except zynthian_gui_task_cancelled:
+        shutil.rmtree(dst, ignore_errors=True)
+        raise
+
+#------------------------------------------------------------------------------
@@ -30,6 +30,7 @@ import sys
 import copy
 import alsaaudio
 import signal
+import select
 import math
 import logging
 import threading
@@ -71,17 +72,18 @@ import Zynthbox
 from zynqtgui.zynthian_gui_bluetooth_config import zynthian_gui_bluetooth_config
 from zynqtgui.zynthian_gui_song_manager import zynthian_gui_song_manager
 from zynqtgui.sound_categories.zynthian_gui_sound_categories import zynthian_gui_sound_categories
-from zynqtgui.utils import file_properties_helper
+from zynqtgui.utils import file_metadata_index, file_properties_helper, sample_store
 from zynqtgui.utils.zynthbox_plugins_helper import zynthbox_plugins_helper
 from zynqtgui.zynthian_gui_audio_settings import zynthian_gui_audio_settings
 from zynqtgui.zynthian_gui_led_config import zynthian_gui_led_config
 from zynqtgui.zynthian_gui_wifi_settings import zynthian_gui_wifi_settings
 from zynqtgui.zynthian_gui_midicontroller_settings import zynthian_gui_midicontroller_settings
 from zynqtgui.zynthian_gui_multi_controller import MultiController
+from zynqtgui.zynthian_gui_task_executor import zynthian_gui_task_executor
 from zyncoder import *
 from zyncoder.zyncoder import lib_zyncoder_init
-from zyngine import zynthian_controller, zynthian_zcmidi, zynthian_layer
-from zyngine import zynthian_midi_filter
+from zyngine import zynthian_controller, zynthian_zcmidi, zynthian_layer, zynthian_preset_catalogue
+from zyngine import zynthian_midi_filter, zynthian_midi_filter_state
 from zynqtgui import zynthian_gui_config, zynthian_gui_controller
 from zynqtgui.zynthian_gui_selector import zynthian_gui_selector
 from zynqtgui.zynthian_gui_info import zynthian_gui_info
@@ -129,6 +131,7 @@ from zynqtgui.zynthian_gui_ui_settings import zynthian_gui_ui_settings
 from zynqtgui.zynthian_gui_usb_settings import zynthian_gui_usb_settings
 from zynqtgui.zynthian_gui_test_knobs import zynthian_gui_test_knobs
 from zynqtgui.zynthian_osd import zynthian_osd
+from zynqtgui.zynthian_gui_screen_registry import zynthian_gui_screen_registry
 from zynqtgui.utils.webconf_fifo_handler import webconf_fifo_handler
 
 
@@ -448,7 +451,7 @@ class zynthian_gui(QObject):
         self.currentTaskMessage = f"Starting Zynthbox"
 
         self.zynmidi = None
-        self.screens = {}
+        self.screens = zynthian_gui_screen_registry(self)
         self.__home_screen = "sketchpad" #TODO: make this configurable, put same in static screens_sequence
         self.active_screen = None
         self.modal_screen = None
@@ -563,6 +566,8 @@ class zynthian_gui(QObject):
         self.loading = 0
         self.loading_thread = None
         self.zyncoder_thread = None
+        # Written to for waking up the zyncoder thread (e.g. when autoconnect has been requested)
+        self.input_wakeup_fd = None
         self.zynread_wait_flag = False
         self.zynswitch_defered_event = None
         self.exit_flag = False
@@ -581,6 +586,13 @@ class zynthian_gui(QObject):
         self.status_counter = 0
 
         self.__long_task_count__ = 0
+        self.__long_task_progress__ = -1
+        self.__long_task_cancellable__ = False
+        # The message of the long task running on the long task executor, without its progress
+        self.__long_task_message__ = ""
+        # Runs the work of long tasks off the gui thread (see do_long_task_in_thread)
+        self.task_executor = zynthian_gui_task_executor(self)
+        self.task_executor.progressChanged.connect(self.long_task_progress_changed_handler)
 
         self.zynautoconnect_audio_flag = False
         self.zynautoconnect_midi_flag = False
@@ -659,6 +671,8 @@ class zynthian_gui(QObject):
             # Init Zyncoder Library
             lib_zyncoder_init()
             lib_zyncoder = zyncoder.get_lib_zyncoder()
+            # Mirror the midi filter clone & note range state, so snapshots don't need to query all of it from the library
+            zynthian_midi_filter_state.instance().install(lib_zyncoder)
             self.zynmidi = zynthian_zcmidi()
         except Exception as e:
             logging.error(
@@ -1026,12 +1040,13 @@ class zynthian_gui(QObject):
             lib_zyncoder.set_midi_ctrl_automode(
                 zynthian_gui_config.midi_cc_automode
             )
-            # Setup MIDI filter rules
+            # Setup MIDI filter rules (only sending what changed, if there were rules set already)
             if self.midi_filter_script:
-                self.midi_filter_script.clean()
-            self.midi_filter_script = zynthian_midi_filter.MidiFilterScript(
-                zynthian_gui_config.midi_filter_rules
-            )
+                self.midi_filter_script.update(zynthian_gui_config.midi_filter_rules)
+            else:
+                self.midi_filter_script = zynthian_midi_filter.MidiFilterScript(
+                    zynthian_gui_config.midi_filter_rules
+                )
 
         except Exception as e:
             logging.error("ERROR initializing MIDI : %s" % e)
@@ -1170,33 +1185,33 @@ class zynthian_gui(QObject):
         # Instantiate Plugin helper before anything else as this will be used by some of the screens below
         self.__zynthbox_plugins_helper = zynthbox_plugins_helper(self)
 
-        self.screens["ui_settings"] = zynthian_gui_ui_settings(self)
-        self.screens["usb_settings"] = zynthian_gui_usb_settings(self)
-        self.screens["info"] = zynthian_gui_info(self)
-        self.screens["about"] = zynthian_gui_about(self)
-        self.screens["confirm"] = zynthian_gui_confirm(self)
-        self.screens["option"] = zynthian_gui_option(self)
-        self.screens["engine"] = zynthian_gui_engine(self)
-        self.screens["layer"] = zynthian_gui_layer(self)
-        self.screens["layer_options"] = zynthian_gui_layer_options(self)
-        self.screens["layer_effects"] = zynthian_gui_layer_effects(self)
-        self.screens["layer_midi_effects"] = zynthian_gui_layer_effects(self)
+        self.screens.register("ui_settings", lambda: zynthian_gui_ui_settings(self))
+        self.screens.register("usb_settings", lambda: zynthian_gui_usb_settings(self))
+        self.screens.register("info", lambda: zynthian_gui_info(self))
+        self.screens.register("about", lambda: zynthian_gui_about(self), lazy=True)
+        self.screens.register("confirm", lambda: zynthian_gui_confirm(self))
+        self.screens.register("option", lambda: zynthian_gui_option(self))
+        self.screens.register("engine", lambda: zynthian_gui_engine(self))
+        self.screens.register("layer", lambda: zynthian_gui_layer(self))
+        self.screens.register("layer_options", lambda: zynthian_gui_layer_options(self))
+        self.screens.register("layer_effects", lambda: zynthian_gui_layer_effects(self))
+        self.screens.register("layer_midi_effects", lambda: zynthian_gui_layer_effects(self))
         self.screens["layer_midi_effects"].midi_mode = True
-        self.screens["effect_types"] = zynthian_gui_effect_types(self)
-        self.screens["midi_effect_types"] = zynthian_gui_effect_types(self)
+        self.screens.register("effect_types", lambda: zynthian_gui_effect_types(self))
+        self.screens.register("midi_effect_types", lambda: zynthian_gui_effect_types(self))
         self.screens["midi_effect_types"].midi_mode = True
-        self.screens["layer_effect_chooser"] = zynthian_gui_layer_effect_chooser(self)
-        self.screens["layer_midi_effect_chooser"] = zynthian_gui_layer_effect_chooser(self)
+        self.screens.register("layer_effect_chooser", lambda: zynthian_gui_layer_effect_chooser(self))
+        self.screens.register("layer_midi_effect_chooser", lambda: zynthian_gui_layer_effect_chooser(self))
         self.screens["layer_midi_effect_chooser"].midi_mode = True
-        self.screens["snapshot"] = zynthian_gui_snapshot(self)
-        self.screens["midi_chan"] = zynthian_gui_midi_chan(self)
-        self.screens["midi_cc"] = zynthian_gui_midi_cc(self)
-        self.screens['midi_key_range'] = zynthian_gui_midi_key_range(self)
-        self.screens['audio_out'] = zynthian_gui_audio_out(self)
-        self.screens['audio_in'] = zynthian_gui_audio_in(self)
-        self.screens["bank"] = zynthian_gui_bank(self)
-        self.screens["preset"] = zynthian_gui_preset(self)
-        self.screens["sample_library"] = zynthian_gui_sample_library(self)
+        self.screens.register("snapshot", lambda: zynthian_gui_snapshot(self))
+        self.screens.register("midi_chan", lambda: zynthian_gui_midi_chan(self))
+        self.screens.register("midi_cc", lambda: zynthian_gui_midi_cc(self))
+        self.screens.register("midi_key_range", lambda: zynthian_gui_midi_key_range(self))
+        self.screens.register("audio_out", lambda: zynthian_gui_audio_out(self))
+        self.screens.register("audio_in", lambda: zynthian_gui_audio_in(self))
+        self.screens.register("bank", lambda: zynthian_gui_bank(self))
+        self.screens.register("preset", lambda: zynthian_gui_preset(self))
+        self.screens.register("sample_library", lambda: zynthian_gui_sample_library(self), lazy=True)
 
         # effect_preset is the same instance as preset screen
         # This is done to be able to differentiate if the preset page is open from SynthSetupPage or FXSetupPage
@@ -1208,26 +1223,26 @@ class zynthian_gui(QObject):
         # Since the same data is displayed in both the pages we need to be able to differentiate it so that PageManager can know which container page to open
         self.screens["sketch_effect_preset"] = self.screens["preset"]
 
-        self.screens["control"] = zynthian_gui_control(self)
-        self.screens["control_downloader"] = zynthian_gui_newstuff(self)
-        self.screens["fx_control_downloader"] = self.screens["control_downloader"]
-        self.screens["channel"] = zynthian_gui_channel(self)
-        self.screens["channel_external_setup"] = zynthian_gui_channel_external_setup(self)
-        self.screens["channel_wave_editor"] = zynthian_gui_channel_wave_editor(self)
-        self.screens["main"] = zynthian_gui_main(self)
-        self.screens["apps_downloader"] = zynthian_gui_newstuff(self)
-        self.screens["admin"] = zynthian_gui_admin(self)
-        self.screens["audio_settings"] = zynthian_gui_audio_settings(self)
-        self.screens["wifi_settings"] = zynthian_gui_wifi_settings(self)
-        self.screens["midicontroller_settings"] = zynthian_gui_midicontroller_settings(self)
-        self.screens["synth_behaviour"] = zynthian_gui_synth_behaviour(self)
-        self.screens["snapshots_menu"] = zynthian_gui_snapshots_menu(self)
-        self.screens["sound_categories"] = zynthian_gui_sound_categories(self)
-
-        self.screens["network"] = zynthian_gui_network(self)
-        self.screens["network_info"] = self.screens["network"]
-        self.screens["hardware"] = zynthian_gui_hardware(self)
-        self.screens["test_knobs"] = zynthian_gui_test_knobs(self)
+        self.screens.register("control", lambda: zynthian_gui_control(self))
+        self.screens.register("control_downloader", lambda: zynthian_gui_newstuff(self), lazy=True)
+        self.screens.alias("fx_control_downloader", "control_downloader")
+        self.screens.register("channel", lambda: zynthian_gui_channel(self))
+        self.screens.register("channel_external_setup", lambda: zynthian_gui_channel_external_setup(self))
+        self.screens.register("channel_wave_editor", lambda: zynthian_gui_channel_wave_editor(self))
+        self.screens.register("main", lambda: zynthian_gui_main(self))
+        self.screens.register("apps_downloader", lambda: zynthian_gui_newstuff(self), lazy=True)
+        self.screens.register("admin", lambda: zynthian_gui_admin(self))
+        self.screens.register("audio_settings", lambda: zynthian_gui_audio_settings(self))
+        self.screens.register("wifi_settings", lambda: zynthian_gui_wifi_settings(self))
+        self.screens.register("midicontroller_settings", lambda: zynthian_gui_midicontroller_settings(self), lazy=True)
+        self.screens.register("synth_behaviour", lambda: zynthian_gui_synth_behaviour(self))
+        self.screens.register("snapshots_menu", lambda: zynthian_gui_snapshots_menu(self))
+        self.screens.register("sound_categories", lambda: zynthian_gui_sound_categories(self))
+
+        self.screens.register("network", lambda: zynthian_gui_network(self), lazy=True)
+        self.screens.alias("network_info", "network")
+        self.screens.register("hardware", lambda: zynthian_gui_hardware(self), lazy=True)
+        self.screens.register("test_knobs", lambda: zynthian_gui_test_knobs(self), lazy=True)
         # self.screens['touchscreen_calibration'] = zynthian_gui_touchscreen_calibration(self)
 
         # Load keyboard binding map (needs to happen after ui_settings is loaded)
@@ -1240,36 +1255,36 @@ class zynthian_gui(QObject):
         self.currentTaskMessage = "Loading Application Page Backends"
 
         self.screens['alsa_mixer'] = self.screens['control']
-        self.screens["audio_recorder"] = zynthian_gui_audio_recorder(self)
-        self.screens["test_touchpoints"] = zynthian_gui_test_touchpoints(self)
-        self.screens["sketchpad"] = zynthian_gui_sketchpad(self)
+        self.screens.register("audio_recorder", lambda: zynthian_gui_audio_recorder(self))
+        self.screens.register("test_touchpoints", lambda: zynthian_gui_test_touchpoints(self), lazy=True)
+        self.screens.register("sketchpad", lambda: zynthian_gui_sketchpad(self))
 
         ###
         # Fixed layers depends on sketchpad screen and hence needs to be initialized
         # after those 2 pages
         ###
-        self.screens["layers_for_channel"] = zynthian_gui_layers_for_channel(self)
-        self.screens["fixed_layers"] = zynthian_gui_fixed_layers(self)
-        self.screens["main_layers_view"] = zynthian_gui_fixed_layers(self)
-
-        self.screens["effects_for_channel"] = zynthian_gui_effects_for_channel(self)
-        self.screens["sketch_effects_for_channel"] = zynthian_gui_sketch_effects_for_channel(self)
-
-        self.screens["theme_chooser"] = zynthian_gui_theme_chooser(self)
-        self.screens["theme_downloader"] = zynthian_gui_newstuff(self)
-        self.screens["sketch_downloader"] = zynthian_gui_newstuff(self)
-        self.screens["sound_downloader"] = zynthian_gui_newstuff(self)
-        self.screens["soundfont_downloader"] = zynthian_gui_newstuff(self)
-        self.screens["soundset_downloader"] = zynthian_gui_newstuff(self)
-        self.screens["sequence_downloader"] = zynthian_gui_newstuff(self)
-        self.screens["sketchpad_downloader"] = zynthian_gui_newstuff(self)
-
-        self.screens["playgrid"] = zynthian_gui_playgrid(self)
-        self.screens["playgrid_downloader"] = zynthian_gui_newstuff(self)
-        self.screens["miniplaygrid"] = zynthian_gui_playgrid(self)
-        self.screens["song_manager"] = zynthian_gui_song_manager(self)
-        self.screens["led_config"] = zynthian_gui_led_config(self)
-        self.screens["bluetooth_config"] = zynthian_gui_bluetooth_config(self)
+        self.screens.register("layers_for_channel", lambda: zynthian_gui_layers_for_channel(self))
+        self.screens.register("fixed_layers", lambda: zynthian_gui_fixed_layers(self))
+        self.screens.register("main_layers_view", lambda: zynthian_gui_fixed_layers(self))
+
+        self.screens.register("effects_for_channel", lambda: zynthian_gui_effects_for_channel(self))
+        self.screens.register("sketch_effects_for_channel", lambda: zynthian_gui_sketch_effects_for_channel(self))
+
+        self.screens.register("theme_chooser", lambda: zynthian_gui_theme_chooser(self))
+        self.screens.register("theme_downloader", lambda: zynthian_gui_newstuff(self), lazy=True)
+        self.screens.register("sketch_downloader", lambda: zynthian_gui_newstuff(self), lazy=True)
+        self.screens.register("sound_downloader", lambda: zynthian_gui_newstuff(self), lazy=True)
+        self.screens.register("soundfont_downloader", lambda: zynthian_gui_newstuff(self), lazy=True)
+        self.screens.register("soundset_downloader", lambda: zynthian_gui_newstuff(self), lazy=True)
+        self.screens.register("sequence_downloader", lambda: zynthian_gui_newstuff(self), lazy=True)
+        self.screens.register("sketchpad_downloader", lambda: zynthian_gui_newstuff(self), lazy=True)
+
+        self.screens.register("playgrid", lambda: zynthian_gui_playgrid(self))
+        self.screens.register("playgrid_downloader", lambda: zynthian_gui_newstuff(self), lazy=True)
+        self.screens.register("miniplaygrid", lambda: zynthian_gui_playgrid(self))
+        self.screens.register("song_manager", lambda: zynthian_gui_song_manager(self))
+        self.screens.register("led_config", lambda: zynthian_gui_led_config(self))
+        self.screens.register("bluetooth_config", lambda: zynthian_gui_bluetooth_config(self), lazy=True)
 
         # Add the OSD handler
         self.__osd = zynthian_osd(self)
@@ -1302,6 +1317,9 @@ class zynthian_gui(QObject):
         self.stop_polling()
         self.osc_end()
         zynautoconnect.stop()
+        self.screens["engine"].jalv_pool.stop()
+        file_metadata_index.instance().stop_scanner()
+        zynthian_preset_catalogue.instance().flush()
         self.screens["layer"].reset()
         # Turn off leds
         Popen(("python3", "zynqtgui/zynthian_gui_led_config.py", "off"))
@@ -1830,6 +1848,14 @@ class zynthian_gui(QObject):
             return
         # END Button ignore logic
 
+        # BEGIN Long task cancel logic
+        # NOTE If this is hit, we will return early from this function
+        # While a long task which can be cancelled is running, the back button cancels it
+        if cuia == "SWITCH_BACK_RELEASED" and self.__long_task_cancellable__:
+            self.cancelLongTask()
+            return
+        # END Long task cancel logic
+
         # BEGIN Button-press abort modifiers logic
         # NOTE If any of these are hit, we will return early from this function
         # If we press the back button when any of the modifier-capable
@@ -3239,6 +3265,7 @@ class zynthian_gui(QObject):
 
     def zynswitch_defered(self, t, i):
         self.zynswitch_defered_event = (t, i)
+        self.wake_zyncoder_thread()
 
     def zynswitch_defered_exec(self):
         if self.zynswitch_defered_event is not None:
@@ -3254,12 +3281,47 @@ class zynthian_gui(QObject):
 
     def start_zyncoder_thread(self):
         if lib_zyncoder:
+            if hasattr(os, "eventfd"):
+                self.input_wakeup_fd = os.eventfd(0, os.EFD_NONBLOCK)
+            else:
+                self.input_wakeup_fd, self.input_wakeup_write_fd = os.pipe()
+                os.set_blocking(self.input_wakeup_fd, False)
             self.zyncoder_thread = Thread(
                 target=self.zyncoder_thread_task, args=()
             )
             self.zyncoder_thread.daemon = True  # thread dies with the program
             self.zyncoder_thread.start()
 
+    def wake_zyncoder_thread(self):
+        try:
+            if hasattr(os, "eventfd"):
+                os.eventfd_write(self.input_wakeup_fd, 1)
+            else:
+                os.write(self.input_wakeup_write_fd, b"\0")
+        except Exception:
+            # Either not started yet, or already woken up and not yet drained
+            pass
+
+    # The file descriptors which become readable when there is input for the zyncoder thread to process
+    def get_input_fds(self):
+        fds = [self.input_wakeup_fd]
+        if self.osc_server is not None:
+            fds.append(self.osc_server.fileno())
+        return fds
+
+    def wait_for_input(self, timeout):
+        try:
+            readable, _, _ = select.select(self.get_input_fds(), [], [], timeout)
+        except Exception as e:
+            logging.error(f"Error waiting for input: {e}")
+            time.sleep(timeout)
+            return
+        if self.input_wakeup_fd in readable:
+            try:
+                os.read(self.input_wakeup_fd, 8 if hasattr(os, "eventfd") else 512)
+            except BlockingIOError:
+                pass
+
     def zyncoder_thread_task(self):
         while not self.exit_flag:
             # Do not read zyncoder values when booting is in progress
@@ -3268,9 +3330,11 @@ class zynthian_gui(QObject):
                 self.zynmidi_read()
                 self.osc_receive()
                 self.plot_zctrls()
-                time.sleep(0.04)
+                # lib_zyncoder has no way of telling us about encoder, switch or ui midi input, so those are still
+                # polled, but a wakeup or an OSC message is handled straight away
+                self.wait_for_input(0.04)
             else:
-                time.sleep(0.3)
+                self.wait_for_input(0.3)
             # if self.zynread_wait_flag:
             # time.sleep(0.3)
             # self.zynread_wait_flag=False
@@ -3561,7 +3625,7 @@ class zynthian_gui(QObject):
         self.currentTaskMessage = task_message
         self.bootsplashFifo.send("command:show")
         self.is_loading_changed.emit()
-        QGuiApplication.instance().processEvents()
+        self.process_events_if_blocked()
         # logging.debug("START LOADING %d" % self.loading)
 
     @Slot(str)
@@ -3578,7 +3642,7 @@ class zynthian_gui(QObject):
             if self.__long_task_count__ == 0:
                 self.bootsplashFifo.send("command:hide")
             self.is_loading_changed.emit()
-            QGuiApplication.instance().processEvents()
+            self.process_events_if_blocked()
         # logging.debug("STOP LOADING %d" % self.loading)
 
     def reset_loading(self):
@@ -3586,7 +3650,14 @@ class zynthian_gui(QObject):
             self.bootsplashFifo.send("command:hide")
         self.loading = 0
         self.is_loading_changed.emit()
-        QGuiApplication.instance().processEvents()
+        self.process_events_if_blocked()
+
+    # Let the gui render while something keeps the gui thread busy. While the long task executor is running a task, the
+    # gui thread gets to render between the steps of that task, and processing events in the middle of one of those steps
+    # would only run other queued work (and it must not be done from any other thread at all)
+    def process_events_if_blocked(self):
+        if self.task_executor.is_ui_thread() and not self.task_executor.is_busy():
+            QGuiApplication.instance().processEvents()
 
     def get_is_loading(self):
         return self.loading > 0
@@ -3636,6 +3707,7 @@ class zynthian_gui(QObject):
     def exit(self, code=0):
         self.exit_flag = True
         self.exit_code = code
+        self.wake_zyncoder_thread()
 
     @Slot(str, result=bool)
     def file_exists(self, file_path):
@@ -3898,18 +3970,21 @@ class zynthian_gui(QObject):
         else:
             self.zynautoconnect_midi_flag = True
             self.zynautoconnect_audio_flag = True
+            self.wake_zyncoder_thread()
 
     def zynautoconnect_midi(self, force=False):
         if force:
             zynautoconnect.midi_autoconnect(True)
         else:
             self.zynautoconnect_midi_flag = True
+            self.wake_zyncoder_thread()
 
     def zynautoconnect_audio(self, force=False):
         if force:
             zynautoconnect.audio_autoconnect(True)
         else:
             self.zynautoconnect_audio_flag = True
+            self.wake_zyncoder_thread()
 
     def zynautoconnect_do(self):
         if self.zynautoconnect_midi_flag:
@@ -4116,6 +4191,12 @@ class zynthian_gui(QObject):
         # Stop rainbow and initialize LED config and connect to required signals to be able to update LEDs on value change instead
         Popen(["systemctl", "stop", "rainbow-leds.service"])
         self.isBootingComplete = True
+        # Report what constructing the screens cost during boot, including those the qml pulled in while loading
+        self.screens.log_construction_report()
+        # Keep the metadata of the samples and sketches indexed in the background, so browsing them doesn't need to read them
+        file_metadata_index.instance().start_scanner()
+        # Clear out the samples which sketches and sounds no longer refer to
+        sample_store.instance().start_garbage_collection()
         self.bootsplashFifo.send("command:play-extro")
         # Display main window as soon as possible so it doesn't take time to load after splash stops
         self.displayMainWindow.emit()
@@ -4343,6 +4424,10 @@ class zynthian_gui(QObject):
 
     ### Alternative long task handling than show_loading
     def do_long_task(self, cb, message=None):
+        self.start_long_task(message)
+        QTimer.singleShot(1, cb)
+
+    def start_long_task(self, message=None):
         logging.debug("### Start long task")
         # Emit long task started if no other long task is already running
         if message is not None:
@@ -4354,7 +4439,24 @@ class zynthian_gui(QObject):
         if self.__long_task_count__ > 0:
             self.bootsplashFifo.send("command:show")
 
-        QTimer.singleShot(1, cb)
+    # Like do_long_task, but runs work(task) on the long task executor's worker thread, so the gui keeps rendering while it runs.
+    # work gets the zynthian_gui_task, through which it reports progress, checks for cancellation, and runs whatever touches
+    # Qt objects on the gui thread (see zynthian_gui_task_executor). Once it's done, on_done is called on the gui thread with
+    # what work returned, and like the callback of do_long_task, it is responsible for calling end_long_task. If work raises,
+    # or the task gets cancelled, the long task is ended here instead, after calling on_error with the exception if given
+    def do_long_task_in_thread(self, work, message=None, on_done=None, on_error=None, cancellable=False):
+        def task_failed(error):
+            try:
+                if on_error is not None:
+                    on_error(error)
+            finally:
+                self.end_long_task()
+
+        self.start_long_task(message)
+        self.__long_task_message__ = self.currentTaskMessage
+        self.set_long_task_cancellable(cancellable)
+        self.show_long_task_message()
+        self.task_executor.submit(work, cancellable, on_done if on_done is not None else lambda result: self.end_long_task(), task_failed)
 
     def end_long_task(self):
         logging.debug("### End long task")
@@ -4363,12 +4465,67 @@ class zynthian_gui(QObject):
         # Emit long task ended only if all task has ended
         if self.__long_task_count__ == 0:
             self.currentTaskMessage = ""
+            self.__long_task_message__ = ""
+            self.set_long_task_progress(-1)
+            self.set_long_task_cancellable(False)
             self.longTaskEnded.emit()
             if self.loading == 0:
                 self.bootsplashFifo.send("command:hide")
 
+    def long_task_progress_changed_handler(self, task, progress, message):
+        if message is not None:
+            self.__long_task_message__ = message
+        self.set_long_task_progress(progress)
+        self.show_long_task_message()
+
+    # Show the message of the long task running on the long task executor on the splash screen, along with its
+    # progress (if known), and how to cancel it (if it can be cancelled)
+    def show_long_task_message(self):
+        message = self.__long_task_message__
+        if self.__long_task_progress__ >= 0:
+            message = f"{message}: {math.floor(100 * self.__long_task_progress__)}%"
+        if self.__long_task_cancellable__:
+            message = f"{message} (press Back to cancel)"
+        self.currentTaskMessage = message
+
+    # Cancel the long task running on the long task executor, if it can be cancelled
+    @Slot(None)
+    def cancelLongTask(self):
+        if self.__long_task_cancellable__:
+            logging.info("Cancelling long task")
+            self.task_executor.cancel_current_task()
+            self.set_long_task_cancellable(False)
+            self.show_long_task_message()
+
     longTaskStarted = Signal()
     longTaskEnded = Signal()
+
+    ### BEGIN Property longTaskProgress
+    # The progress of the running long task, between 0 and 1, or -1 if it isn't known
+    def get_long_task_progress(self):
+        return self.__long_task_progress__
+
+    def set_long_task_progress(self, progress):
+        if self.__long_task_progress__ != progress:
+            self.__long_task_progress__ = progress
+            self.longTaskProgressChanged.emit()
+
+    longTaskProgressChanged = Signal()
+    longTaskProgress = Property(float, get_long_task_progress, notify=longTaskProgressChanged)
+    ### END Property longTaskProgress
+
+    ### BEGIN Property longTaskCancellable
+    def get_long_task_cancellable(self):
+        return self.__long_task_cancellable__
+
+    def set_long_task_cancellable(self, cancellable):
+        if self.__long_task_cancellable__ != cancellable:
+            self.__long_task_cancellable__ = cancellable
+            self.longTaskCancellableChanged.emit()
+
+    longTaskCancellableChanged = Signal()
+    longTaskCancellable = Property(bool, get_long_task_cancellable, notify=longTaskCancellableChanged)
+    ### END Property longTaskCancellable
     ### END Alternative long task handling
 
     ### BEGIN Property forceSongMode